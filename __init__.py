@@ -41,7 +41,7 @@ else:
     from .modules import quick_ops
 
 # This is also the correct order of registering
-reg_modules = [etc, variable_data, gui, ops, quick_ops, debug]
+reg_modules = [etc, func, variable_data, gui, ops, quick_ops, debug]
 
 """
 [!] Important notes
@@ -71,6 +71,7 @@ def register():
     else:
         try:
             etc.register()
+            func.register()
             variable_data.register()
             ops.register()
             gui.register()
@@ -13,6 +13,7 @@ Debug
 """
 
 import bpy
+import numpy as np
 from . import ops
 from . import func
 from . import static_data
@@ -181,12 +182,84 @@ class MAMENukePinnedObjectReferenceList(bpy.types.Operator):
     def poll(self, context):
         return True
 
+class MAMETestCornerSelection(bpy.types.Operator):
+    """
+    Compares face corner selection from selected edges with the reference implementation, on fixture edge selections of active mesh
+    """
+    bl_idname = "mame.test_corner_selection"
+    bl_label = "corner selection test"
+    bl_description = ""
+    bl_options = {'REGISTER', 'UNDO', 'INTERNAL'}
+
+    @staticmethod
+    def reference_corner_indexes(obj, b_sel_edges):
+        "Walks each corner of selected edges and counts selected edges of its face connected to the corner vertex"
+        result = []
+        for fc in [obj.data.loops[li] for li in range(0, len(obj.data.loops)) if b_sel_edges[obj.data.loops[li].edge_index]]:
+            for f in obj.data.polygons:
+                if fc.index in f.loop_indices:
+                    face = f
+                    break
+            
+            valid_edges = []
+            for i in face.loop_indices:
+                if b_sel_edges[obj.data.loops[i].edge_index]:
+                    if fc.vertex_index in obj.data.edges[obj.data.loops[i].edge_index].vertices:
+                        valid_edges.append(obj.data.loops[i].edge_index)
+            
+            if len(valid_edges) > 1:
+                result.append(fc.index)
+        return result
+
+    def execute(self, context):
+        obj = context.active_object
+        current_mode = obj.mode
+        bpy.ops.object.mode_set(mode='OBJECT')
+
+        edge_count = len(obj.data.edges)
+        original_selection = np.zeros(edge_count, dtype=bool)
+        obj.data.edges.foreach_get('select', original_selection)
+
+        # Fixtures: no edges, all edges, single edge, boundary of first face, random selections
+        fixtures = {'none': np.zeros(edge_count, dtype=bool),
+                    'all': np.ones(edge_count, dtype=bool),
+                    'single': np.arange(edge_count) == 0}
+        if len(obj.data.polygons):
+            fixtures['face boundary'] = np.isin(np.arange(edge_count), [obj.data.loops[li].edge_index for li in obj.data.polygons[0].loop_indices])
+        for seed in range(0, 3):
+            fixtures[f'random {seed}'] = np.random.default_rng(seed).random(edge_count) < 0.25
+        
+        failed = []
+        for name, b_sel_edges in fixtures.items():
+            obj.data.edges.foreach_set('select', b_sel_edges)
+            result = np.flatnonzero(func.get_corner_mask_bounded_by_selected_edges(obj)).tolist()
+            expected = self.reference_corner_indexes(obj, b_sel_edges)
+            
+            if result != expected:
+                print(f"[TESTS] Corner selection FAILED on {name}: got {result}, expected {expected}")
+                failed.append(name)
+            else:
+                print(f"[TESTS] Corner selection on {name}: {len(result)} corners, SUCCESS")
+
+        obj.data.edges.foreach_set('select', original_selection)
+        obj.data.update()
+        bpy.ops.object.mode_set(mode=current_mode)
+
+        if failed:
+            self.report({'ERROR'}, f"Corner selection differs from reference on: {', '.join(failed)}")
+        return {'FINISHED'}
+
+    @classmethod
+    def poll(self, context):
+        return context.active_object is not None and context.active_object.type == 'MESH'
+
 # Utility
 # ----------------------------
 
 classes = [MAMECreateAllAttributes,
            MAMECreatePointCloudObject,
            MAMETestAll,
+           MAMETestCornerSelection,
            MAMENukePinnedObjectReferenceList]
 
 def force_register():
@@ -15,7 +15,7 @@ The file must not create a circular import with anything
 
 """
 
-import bpy, time, _bpy, os#, logging
+import bpy, time, _bpy, os, json#, logging
 from datetime import datetime
 from bpy_extras.io_utils import ExportHelper
 from enum import Enum
@@ -88,6 +88,47 @@ def get_preferences_attrib(name:str):
     prefs = bpy.context.preferences.addons[__addon_package_name__].preferences
     return getattr(prefs, name) if hasattr(prefs, name) else None
 
+def get_set_algo_cost_model():
+    """Reads the measured costs of algorithms used to set attribute values, stored in addon preferences
+
+    Returns:
+        dict: {"DATA_TYPE|DOMAIN_COUNT_BUCKET": {"by_value_cost": float, "by_value_samples": int, "foreach_cost": float, "foreach_samples": int}}
+    """
+    try:
+        model = json.loads(get_preferences_attrib('set_algo_cost_model'))
+    except (TypeError, ValueError):
+        return {}
+    return model if isinstance(model, dict) else {}
+
+def save_set_algo_cost_model(model:dict):
+    """Stores the measured costs of algorithms used to set attribute values in addon preferences
+
+    Args:
+        model (dict): See get_set_algo_cost_model
+    """
+    bpy.context.preferences.addons[__addon_package_name__].preferences.set_algo_cost_model = json.dumps(model)
+
+def draw_set_algo_cost_model(layout):
+    """Draws the learned thresholds of set attribute values algorithm detection
+
+    Args:
+        layout (Reference): Layout to draw in
+    """
+    model = get_set_algo_cost_model()
+    col = layout.column(align=True)
+    r = col.row()
+    r.label(text=f"Learned thresholds: {len(model)}")
+    r.operator('window_manager.mame_reset_set_algo_cost_model', text="Reset")
+    for key in sorted(model.keys(), key=lambda k: (k.split('|')[0], int(k.split('|')[1]))):
+        entry = model[key]
+        data_type, bucket = key.split('|')
+        if entry['by_value_cost'] > 0.0:
+            threshold = f"{min(entry['foreach_cost'] / entry['by_value_cost'], 1.0):.1%}"
+        else:
+            threshold = "?"
+        col.label(text=f"{data_type}, {bucket}+ domains: foreach above {threshold} selected "\
+                  f"(samples: by value {entry['by_value_samples']}, foreach {entry['foreach_samples']})")
+
 def get_blender_support(minver = None, minver_unsupported = None):
     """Used to check if blender version is supported for any feature. Use this instead of creating an if
 
@@ -274,7 +315,7 @@ class AddonPreferences(bpy.types.AddonPreferences):
     attribute_assign_menu_curves: bpy.props.BoolProperty(name="Attribute Assign Menu (Curves)", description="Assign and clear buttons", default=True)
     attribute_assign_menu_pointcloud: bpy.props.BoolProperty(name="Attribute Assign Menu (Point Cloud)", description="Assign and clear buttons", default=True)
     set_attribute_raw_quaterion: bpy.props.BoolProperty(name="Set Raw Quaternions Value", description="If you want to use quaternion attributes as 4D vectors instead of quaternions, enable this", default=True)
-    select_attribute_precise_facecorners: bpy.props.BoolProperty(name="Precise Face Corner Select (Slow)", description="If you want to select individual edges that identify a face corner, this has to be enabled. Not requried for face painting", default=False)
+    select_attribute_precise_facecorners: bpy.props.BoolProperty(name="Precise Face Corner Select", description="If you want to select individual edges that identify a face corner, this has to be enabled. Not requried for face painting", default=True)
     show_docs_button: bpy.props.BoolProperty(name="Show \"Open Documentation\" Button", description="Shows \"Open Documentation\" button in operator menus", default=True)
 
     # Specials
@@ -309,7 +350,13 @@ class AddonPreferences(bpy.types.AddonPreferences):
     debug_operators: bpy.props.BoolProperty(name="Enable Debug Extras", description="Scary", default=False)
     pseudo_profiler: bpy.props.BoolProperty(name="Pseudo-profiler - disable only", description="Scary", default=False)
     disable_version_checks: bpy.props.BoolProperty(name="Disable Blender Version Checks", description="Scary", default=False)
-    set_algo_tweak: bpy.props.FloatProperty(name="Tweak Optimal Set Attribute Alghoritm Detection", description="set_attribute_values()", default=0.15)
+    set_algo_tweak: bpy.props.FloatProperty(name="Tweak Optimal Set Attribute Alghoritm Detection", description="set_attribute_values(). Used when the self-calibrating algorithm detection is disabled or not calibrated yet", default=0.15)
+    set_algo_adaptive: bpy.props.BoolProperty(name="Self-Calibrating Set Attribute Alghoritm Detection", description="Measure both algorithms on first use for each data type and domain count, and use the measured crossover point", default=True)
+    scratch_buffer_pool_size_mb: bpy.props.IntProperty(name="Scratch Buffer Pool Size (MB)", description="Memory kept for reuse by temporary buffers of foreach_get and foreach_set operations. 0 disables the pool", default=256, min=0)
+    attribute_read_cache_size_mb: bpy.props.IntProperty(name="Attribute Read Cache Size (MB)", description="Memory used to keep values of recently read attributes, until the mesh changes. 0 disables the cache", default=256, min=0)
+    edit_mode_bmesh_backend: bpy.props.BoolProperty(name="Edit Mode BMesh Backend", description="Read and write attribute values and selection directly in edit mode, without switching to object mode", default=True)
+    edit_mode_bmesh_max_elements: bpy.props.IntProperty(name="Edit Mode BMesh Backend Max Elements", description="Meshes with more vertices, edges and faces in total are switched to object mode instead, where values are read and written in bulk", default=100000, min=0)
+    set_algo_cost_model: bpy.props.StringProperty(name="Set Attribute Alghoritm Cost Model", description="Measured costs of algorithms used in set_attribute_values(), as JSON", default="{}")
     disable_bpy_set_attribute: bpy.props.BoolProperty(name="Force Disable bpy.ops.mesh.attribute_set", description="Uses add-on alghortitm only to set the values in edit mode", default=False)
     bakematerial_donotdelete: bpy.props.BoolProperty(name="Do not delete temporary bake material", description="Scary", default=False)
     pinned_mesh_refcount_max: bpy.props.IntProperty(name="Max Pinned Mesh References", description="Scary", default=8, min=2)
@@ -611,6 +658,13 @@ class AddonPreferences(bpy.types.AddonPreferences):
                 box.prop(self, 'disable_bpy_set_attribute')
                 box.prop(self, 'disable_version_checks')
                 box.prop(self, 'set_algo_tweak')
+                box.prop(self, 'set_algo_adaptive')
+                if self.set_algo_adaptive:
+                    draw_set_algo_cost_model(box)
+                box.prop(self, 'scratch_buffer_pool_size_mb')
+                box.prop(self, 'attribute_read_cache_size_mb')
+                box.prop(self, 'edit_mode_bmesh_backend')
+                box.prop(self, 'edit_mode_bmesh_max_elements', slider=False)
                 box.prop(self, 'pinned_mesh_refcount_max', slider=False)
         
                 # nothing critical will happen if this is invalid, but still it should be above the max
@@ -1080,6 +1134,19 @@ class ClearLog(bpy.types.Operator):
         log(ClearLog, "Log cleared", ELogLevel.INFO)
         return {'FINISHED'}
 
+class ResetSetAlgoCostModel(bpy.types.Operator):
+    """
+    Clears the measured costs of set attribute values algorithms, they will be measured again on next use
+    """
+    bl_idname = "window_manager.mame_reset_set_algo_cost_model"
+    bl_label = "Reset Learned Thresholds"
+    bl_options = {'REGISTER', 'INTERNAL'}
+
+    def execute(self, context):
+        save_set_algo_cost_model({})
+        log(ResetSetAlgoCostModel, "Set attribute values algorithm cost model cleared", ELogLevel.INFO)
+        return {'FINISHED'}
+
 # Catastrophic Error Handling
 # -----------------------------
 # Crash gracefully and tell the user what went wrong instead of cryptic python stuff
@@ -1385,6 +1452,7 @@ classes = [
     WINDOW_MANAGER_OT_mame_report_issue,
     ShowLog,
     ClearLog,
+    ResetSetAlgoCostModel,
     WM_OT_mame_queue_macro_report,
     WM_OT_mame_queue_macro_set_finished,
     OpenWiki,
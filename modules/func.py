@@ -24,7 +24,1459 @@ import random
 import colorsys
 import string 
 import csv
+import time
 from ast import literal_eval
+from collections import OrderedDict
+from contextlib import contextmanager
+
+# Smallest attribute that set_attribute_values() algorithm costs are measured on, smaller ones are too noisy
+SET_ALGO_CALIBRATION_MIN_DOMAINS = 4096
+
+# Number of domains set by value when measuring its cost
+SET_ALGO_CALIBRATION_PROBE_LENGTH = 512
+
+# Number of measurements averaged in the cost model, for each data type and domain count
+SET_ALGO_CALIBRATION_MAX_SAMPLES = 4
+
+# Number of meshes to keep the topology of in MESH_TOPOLOGY_CACHE
+MESH_TOPOLOGY_CACHE_MAX_MESHES = 8
+
+# Number of derived selections to keep in SELECTION_CACHE
+SELECTION_CACHE_MAX_ENTRIES = 16
+
+# Largest part of a string attribute domain that is compared to current values before writing, larger writes overwrite all
+STRING_WRITE_DIFF_MAX_FRACTION = 0.5
+
+# Maximum UV distance on each axis of face corners on both sides of an edge to treat them as the same UV island
+UV_ISLAND_CONNECT_LIMIT = 0.0001
+
+# Scratch buffers
+# ------------------------------------------
+
+# Free scratch buffers for foreach_get/foreach_set round trips, {(dtype, length): [np.ndarray]}. Least recently used first.
+SCRATCH_BUFFER_POOL = OrderedDict()
+
+# Total size of buffers in SCRATCH_BUFFER_POOL, in bytes
+SCRATCH_BUFFER_POOL_SIZE = 0
+
+def borrow_scratch_buffer(dtype, length:int):
+    """Gets a buffer from the scratch buffer pool or creates a new one. Contents are undefined.
+    Return it with return_scratch_buffer(), and never pass it outside of the function that borrowed it.
+
+    Args:
+        dtype (np.dtype or str): Data type of the buffer
+        length (int): Number of elements
+
+    Returns:
+        np.ndarray: Flat buffer
+    """
+    global SCRATCH_BUFFER_POOL_SIZE
+
+    key = (np.dtype(dtype).str, length)
+    free = SCRATCH_BUFFER_POOL.get(key, None)
+    if free:
+        buffer = free.pop()
+        SCRATCH_BUFFER_POOL_SIZE -= buffer.nbytes
+        if not free:
+            del SCRATCH_BUFFER_POOL[key]
+        return buffer
+    return np.empty(length, dtype=dtype)
+
+def return_scratch_buffer(buffer):
+    """Puts the buffer back to the scratch buffer pool. Least recently used buffers are dropped if the pool exceeds the size set in preferences.
+
+    Args:
+        buffer (np.ndarray): Buffer obtained with borrow_scratch_buffer()
+    """
+    global SCRATCH_BUFFER_POOL_SIZE
+
+    max_size = etc.get_preferences_attrib('scratch_buffer_pool_size_mb') * 1024 * 1024
+    if buffer.nbytes > max_size or not buffer.flags.owndata:
+        return
+    
+    key = (buffer.dtype.str, len(buffer))
+    SCRATCH_BUFFER_POOL.setdefault(key, []).append(buffer)
+    SCRATCH_BUFFER_POOL.move_to_end(key)
+    SCRATCH_BUFFER_POOL_SIZE += buffer.nbytes
+
+    while SCRATCH_BUFFER_POOL_SIZE > max_size:
+        oldest_key = next(iter(SCRATCH_BUFFER_POOL))
+        free = SCRATCH_BUFFER_POOL[oldest_key]
+        SCRATCH_BUFFER_POOL_SIZE -= free.pop(0).nbytes
+        if not free:
+            del SCRATCH_BUFFER_POOL[oldest_key]
+
+@contextmanager
+def scratch_buffer(dtype, length:int):
+    """Borrows a buffer from the scratch buffer pool for the duration of the with block. Contents are undefined.
+
+    Args:
+        dtype (np.dtype or str): Data type of the buffer
+        length (int): Number of elements
+
+    Yields:
+        np.ndarray: Flat buffer
+    """
+    buffer = borrow_scratch_buffer(dtype, length)
+    try:
+        yield buffer
+    finally:
+        return_scratch_buffer(buffer)
+
+def release_scratch_buffers():
+    """Frees all buffers held in the scratch buffer pool
+    """
+    global SCRATCH_BUFFER_POOL_SIZE
+
+    SCRATCH_BUFFER_POOL.clear()
+    SCRATCH_BUFFER_POOL_SIZE = 0
+
+# Attribute buffers
+# ------------------------------------------
+
+def get_attribute_buffer_layout(data_type:str):
+    """Gets the buffer layout definition of a data type from static_data.attribute_data_types
+
+    Args:
+        data_type (str): Attribute data type
+
+    Raises:
+        etc.MeshDataReadException: If the data type is not supported by the addon
+
+    Returns:
+        static_data.AttributeDataType: Data type definition with buffer_* fields
+    """
+    if data_type not in static_data.attribute_data_types:
+        raise etc.MeshDataReadException('get_attribute_buffer_layout', f"Data type {data_type} is unsupported.")
+    return static_data.attribute_data_types[data_type]
+
+def is_foreach_supported(data_type:str):
+    """Checks whether foreach_get and foreach_set can be used with this data type
+
+    Args:
+        data_type (str): Attribute data type
+
+    Returns:
+        bool: True if supported
+    """
+    return data_type in static_data.attribute_data_types and static_data.attribute_data_types[data_type].buffer_dtype is not None
+
+def allocate_attribute_buffer(data_type:str, domain_count:int):
+    """Creates a flat, zeroed buffer that fits values of specified data type for each domain
+
+    Args:
+        data_type (str): Attribute data type
+        domain_count (int): Number of domains
+
+    Raises:
+        etc.MeshDataReadException: If the data type does not support foreach_get/foreach_set
+
+    Returns:
+        np.ndarray: Flat array of domain_count * components length
+    """
+    layout = get_attribute_buffer_layout(data_type)
+    if layout.buffer_dtype is None:
+        raise etc.MeshDataReadException('allocate_attribute_buffer', f"Data type {data_type} does not support foreach buffers.")
+    return np.zeros(domain_count * layout.buffer_components, dtype=layout.buffer_dtype)
+
+def shape_attribute_buffer(buffer, data_type:str):
+    """Reshapes a flat buffer to (N,) for single values, (N, components) for vectors or (N, 4, 4) for matrices. Returns a view, not a copy.
+
+    Args:
+        buffer (np.ndarray): Flat or already shaped buffer
+        data_type (str): Attribute data type
+
+    Returns:
+        np.ndarray: Reshaped view of the buffer
+    """
+    return buffer.reshape((-1,) + get_attribute_buffer_layout(data_type).buffer_shape)
+
+def read_attribute_buffer(attribute, data_type:str = '', shaped = True, buffer = None):
+    """Reads all values of an attribute into a typed numpy buffer with a single foreach_get call.
+    Strings are read by value into an array of objects.
+
+    Args:
+        attribute (Reference): Attribute reference
+        data_type (str, optional): Data type override, for bug bypasses. Defaults to attribute.data_type.
+        shaped (bool, optional): Return (N,), (N, components) or (N, 4, 4) array instead of a flat one. Defaults to True.
+        buffer (np.ndarray, optional): Flat buffer of correct dtype and length to read into, eg. a scratch buffer. Defaults to new buffer.
+
+    Returns:
+        np.ndarray: Attribute values
+    """
+    if data_type == '':
+        data_type = attribute.data_type
+    layout = get_attribute_buffer_layout(data_type)
+
+    # Foreach set get does not support strings.
+    if layout.buffer_dtype is None:
+        return np.array([entry.value for entry in attribute.data], dtype=object)
+
+    if buffer is None:
+        buffer = allocate_attribute_buffer(data_type, len(attribute.data))
+    attribute.data.foreach_get(layout.buffer_foreach_prop, buffer)
+    return shape_attribute_buffer(buffer, data_type) if shaped else buffer
+
+def write_attribute_buffer(attribute, values, data_type:str = ''):
+    """Writes values of all domains of an attribute with a single foreach_set call.
+    Input is cast to the buffer data type and flattened if needed.
+
+    Args:
+        attribute (Reference): Attribute reference
+        values (np.ndarray or list): Values for each domain, either flat or in (N, components) or (N, 4, 4) shape
+        data_type (str, optional): Data type override, for bug bypasses. Defaults to attribute.data_type.
+
+    Raises:
+        etc.MeshDataWriteException: If the data type does not support foreach_set or the length of input is invalid
+    """
+    if data_type == '':
+        data_type = attribute.data_type
+    layout = get_attribute_buffer_layout(data_type)
+
+    if layout.buffer_dtype is None:
+        raise etc.MeshDataWriteException('write_attribute_buffer', f"Data type {data_type} does not support foreach buffers.")
+
+    buffer = np.ascontiguousarray(values, dtype=layout.buffer_dtype).reshape(-1)
+    if len(buffer) != len(attribute.data) * layout.buffer_components:
+        raise etc.MeshDataWriteException('write_attribute_buffer', f"Invalid input value data length. Input {len(buffer)}, expected {len(attribute.data) * layout.buffer_components}")
+
+    attribute.data.foreach_set(layout.buffer_foreach_prop, buffer)
+    invalidate_attribute_read_cache(attribute.id_data, attribute.name)
+
+# Attribute read cache
+# ------------------------------------------
+
+# Read-only snapshots of attribute values, {(mesh pointer, attribute name, data type, domain, length, data pointer): np.ndarray}. Least recently used first.
+ATTRIBUTE_READ_CACHE = OrderedDict()
+
+# Total size of arrays in ATTRIBUTE_READ_CACHE, in bytes
+ATTRIBUTE_READ_CACHE_SIZE = 0
+
+def get_attribute_values_cached(attribute):
+    """Reads all attribute values into a numpy array like get_attribute_values(as_numpy=True), but returns a cached
+    snapshot if the attribute was read before and the mesh did not change since. 
+    Snapshots are kept between operators. They are removed on depsgraph updates of the mesh, see attribute_read_cache_depsgraph_handler(),
+    and when this addon writes to the attribute, see invalidate_attribute_read_cache().
+    The returned array is read-only, copy it before modifying.
+
+    Args:
+        attribute (Reference): Attribute reference
+
+    Returns:
+        np.ndarray: Read-only attribute values, (N,) or (N, components)
+    """
+    global ATTRIBUTE_READ_CACHE_SIZE
+
+    # Mesh data is not synchronized in edit mode, read the BMesh instead. BMesh changes are not tracked, do not cache it.
+    if is_edit_mode_bmesh_supported(attribute.id_data, attribute.data_type, attribute.name, attribute.domain):
+        values = get_bmesh_attribute_values(attribute.id_data, attribute.name, attribute.domain, attribute.data_type)
+        values.flags.writeable = False
+        return values
+
+    # Address of the first element changes if the attribute was removed and created again, or reallocated
+    data_pointer = attribute.data[0].as_pointer() if len(attribute.data) else 0
+    key = (attribute.id_data.as_pointer(), attribute.name, attribute.data_type, attribute.domain, len(attribute.data), data_pointer)
+    if key in ATTRIBUTE_READ_CACHE:
+        ATTRIBUTE_READ_CACHE.move_to_end(key)
+        return ATTRIBUTE_READ_CACHE[key]
+    
+    values = read_attribute_buffer(attribute)
+    values.flags.writeable = False
+
+    max_size = etc.get_preferences_attrib('attribute_read_cache_size_mb') * 1024 * 1024
+    if values.nbytes > max_size:
+        return values
+
+    ATTRIBUTE_READ_CACHE[key] = values
+    ATTRIBUTE_READ_CACHE_SIZE += values.nbytes
+
+    while ATTRIBUTE_READ_CACHE_SIZE > max_size:
+        ATTRIBUTE_READ_CACHE_SIZE -= ATTRIBUTE_READ_CACHE.popitem(last=False)[1].nbytes
+    
+    return values
+
+def invalidate_attribute_read_cache(mesh = None, attribute_name:str = None):
+    """Removes cached attribute values
+
+    Args:
+        mesh (Reference, optional): Mesh (or other ID that stores attributes) to remove the values of. Defaults to None, removing all.
+        attribute_name (str, optional): Name of the attribute to remove the values of. Defaults to None, removing all of the mesh.
+    """
+    global ATTRIBUTE_READ_CACHE_SIZE
+
+    if mesh is None:
+        ATTRIBUTE_READ_CACHE.clear()
+        ATTRIBUTE_READ_CACHE_SIZE = 0
+        return
+    
+    pointer = mesh.as_pointer()
+    for key in [key for key in ATTRIBUTE_READ_CACHE.keys() if key[0] == pointer and (attribute_name is None or key[1] == attribute_name)]:
+        ATTRIBUTE_READ_CACHE_SIZE -= ATTRIBUTE_READ_CACHE.pop(key).nbytes
+
+@bpy.app.handlers.persistent
+def attribute_read_cache_depsgraph_handler(scene, depsgraph):
+    """Invalidates cached attribute values and topology of meshes that changed.
+    """
+    if not len(ATTRIBUTE_READ_CACHE) and not len(MESH_TOPOLOGY_CACHE):
+        return
+    
+    for update in depsgraph.updates:
+        id = update.id.original
+        if isinstance(id, bpy.types.Object):
+            if update.is_updated_geometry and id.data is not None:
+                invalidate_attribute_read_cache(id.data)
+                invalidate_mesh_topology(id.data)
+        elif hasattr(id, 'attributes'):
+            invalidate_attribute_read_cache(id)
+            if update.is_updated_geometry:
+                invalidate_mesh_topology(id)
+
+@bpy.app.handlers.persistent
+def attribute_read_cache_clear_handler(*args):
+    """Invalidates all cached attribute values, topology and selections on undo, redo and file load, as pointers are not valid anymore
+    """
+    invalidate_attribute_read_cache()
+    invalidate_mesh_topology()
+    invalidate_selection_cache()
+
+# String codec
+# ------------------------------------------
+
+def encode_strings(values):
+    """Dictionary-encodes strings into a table of unique strings and an index of table entry for each value.
+    Operations on strings can be then run on the table only and broadcast with the codes.
+
+    Args:
+        values (list or np.ndarray): Strings
+
+    Returns:
+        np.ndarray: Unique strings in order of first occurrence, array of objects
+        np.ndarray: int32 index in the table for each of the values
+    """
+    table = {}
+    codes = np.fromiter((table.setdefault(value, len(table)) for value in values), dtype=np.int32, count=len(values))
+    categories = np.empty(len(table), dtype=object)
+    categories[:] = list(table.keys())
+    return categories, codes
+
+def get_string_attribute_encoded(attribute):
+    """Reads a string attribute once and dictionary-encodes its values, see encode_strings()
+
+    Args:
+        attribute (Reference): String attribute reference
+
+    Returns:
+        np.ndarray: Unique strings, array of objects
+        np.ndarray: int32 index in the table for each domain
+    """
+    return encode_strings(get_attribute_values_cached(attribute))
+
+def get_string_condition_mask(categories, codes, condition:str, compare_value:str, case_sensitive = False):
+    """Checks the condition on each string in the table of dictionary-encoded strings, then broadcasts the result to each value
+
+    Args:
+        categories (np.ndarray): Unique strings
+        codes (np.ndarray): Index in categories for each value
+        condition (str): The condition to check, EQ, NEQ, CONTAINS, STARTS_WITH or ENDS_WITH
+        compare_value (str): The value to check the condition with
+        case_sensitive (bool, optional): Whether the strings should be compared with case sensitivity or not. Defaults to False.
+
+    Raises:
+        etc.GenericFunctionParameterError: On unsupported condition
+
+    Returns:
+        np.ndarray: Boolean mask, True for values that meet the condition
+    """
+    if not case_sensitive:
+        table = [string.upper() for string in categories]
+        compare_value = compare_value.upper()
+    else:
+        table = categories
+
+    if condition == "EQ":
+        table_mask = [string == compare_value for string in table]
+    elif condition == "NEQ":
+        table_mask = [string != compare_value for string in table]
+    elif condition == "CONTAINS":
+        table_mask = [compare_value in string for string in table]
+    elif condition == "STARTS_WITH":
+        table_mask = [string.startswith(compare_value) for string in table]
+    elif condition == "ENDS_WITH":
+        table_mask = [string.endswith(compare_value) for string in table]
+    else:
+        raise etc.GenericFunctionParameterError("get_string_condition_mask", f"Unsupported condition for strings: {condition}")
+    
+    return np.asarray(table_mask, dtype=bool).reshape(-1)[codes]
+
+def set_string_attribute_values(attribute, value, sel_domain_indexes = [], data_type:str = ''):
+    """Sets values of a string attribute. When writing to a small part of the domain, only the values that differ 
+    from current ones are written, see STRING_WRITE_DIFF_MAX_FRACTION.
+    Strings do not support foreach_set, so each write is a python call.
+    WARNING: OBJECT MODE REQUIRED
+
+    Args:
+        attribute (Reference): String attribute reference
+        value (list or str): The single value to set, or a list of values for each of sel_domain_indexes
+        sel_domain_indexes (list, optional): Indexes to set the value on. Defaults to [], all domains.
+        data_type (str, optional): Data type override, see bugbypass_data_type in set_attribute_values(). Defaults to '', the attribute data type.
+
+    Raises:
+        etc.MeshDataWriteException: If the input list is shorter than the index list, or the attribute is not a string attribute
+    """
+    if (attribute.data_type if data_type == '' else data_type) != 'STRING':
+        raise etc.MeshDataWriteException("set_string_attribute_values", f"{attribute.name} is not a string attribute")
+
+    domain_size = len(attribute.data)
+    if len(sel_domain_indexes):
+        indexes = np.asarray(sel_domain_indexes, dtype=np.int64)
+    else:
+        indexes = np.arange(domain_size)
+    
+    new_values = np.empty(len(indexes), dtype=object)
+    if type(value) in [list, np.ndarray]:
+        if len(value) < len(indexes):
+            raise etc.MeshDataWriteException("set_string_attribute_values", f"Value input list is shorter [{len(value)}] than index list that the values are supposed to be set on [{len(indexes)}]")
+        new_values[:] = [str(v) for v in value[:len(indexes)]]
+    else:
+        new_values[:] = value
+
+    # Reading current values costs as much as writing, compare only the targets of small writes. 
+    # Values are read from the attribute, as the read cache might not see changes made by other scripts yet.
+    if len(indexes) <= domain_size * STRING_WRITE_DIFF_MAX_FRACTION:
+        current = np.empty(len(indexes), dtype=object)
+        current[:] = [attribute.data[id].value for id in indexes.tolist()]
+        changed = new_values != current
+        indexes, new_values = indexes[changed], new_values[changed]
+    
+    etc.log(set_string_attribute_values, f"Setting {len(indexes)} strings in {attribute.name}", etc.ELogLevel.VERBOSE)
+
+    for id, string_value in zip(indexes.tolist(), new_values.tolist()):
+        attribute.data[id].value = string_value
+    
+    invalidate_attribute_read_cache(attribute.id_data, attribute.name)
+
+# Mesh topology
+# ------------------------------------------
+
+# Topology of recently used meshes, {mesh pointer: MeshTopology}. Least recently used first.
+MESH_TOPOLOGY_CACHE = OrderedDict()
+
+def build_csr(keys, values, key_count:int):
+    """Groups values by keys into compressed sparse rows: values of key i are indices[offsets[i]:offsets[i+1]]
+
+    Args:
+        keys (np.ndarray): Key of each value, in range 0 to key_count
+        values (np.ndarray): Values to group
+        key_count (int): Number of keys
+
+    Returns:
+        np.ndarray: Offsets, key_count + 1 long
+        np.ndarray: Values sorted by keys, stable
+    """
+    order = np.argsort(keys, kind='stable')
+    offsets = np.zeros(key_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=key_count), out=offsets[1:])
+    return offsets, values[order]
+
+class MeshTopology():
+    """
+    Connectivity of a mesh read with foreach_get, as flat arrays and compressed sparse rows (CSR).
+    Get it with get_mesh_topology() to use the cached one.
+
+    Per domain arrays:
+    * loop_vertex, loop_edge, loop_face     Vertex, edge and face of each face corner
+    * loop_previous                         The previous face corner in the same face
+    * face_loop_start, face_loop_total      First corner and corner count of each face, also offsets of face corners
+    * edge_vertices                         (E, 2) vertices of each edge
+
+    CSR, values of element i are *_indices[*_offsets[i]:*_offsets[i+1]]:
+    * vert_edges, vert_faces, vert_loops, edge_faces
+    """
+
+    def __init__(self, mesh):
+        self.vertex_count = len(mesh.vertices)
+        self.edge_count = len(mesh.edges)
+        self.face_count = len(mesh.polygons)
+        self.loop_count = len(mesh.loops)
+
+        self.loop_vertex = np.empty(self.loop_count, dtype=np.int32)
+        mesh.loops.foreach_get('vertex_index', self.loop_vertex)
+        self.loop_edge = np.empty(self.loop_count, dtype=np.int32)
+        mesh.loops.foreach_get('edge_index', self.loop_edge)
+        self.face_loop_start = np.empty(self.face_count, dtype=np.int32)
+        mesh.polygons.foreach_get('loop_start', self.face_loop_start)
+        self.face_loop_total = np.empty(self.face_count, dtype=np.int32)
+        mesh.polygons.foreach_get('loop_total', self.face_loop_total)
+        self.edge_vertices = np.empty(self.edge_count * 2, dtype=np.int32)
+        mesh.edges.foreach_get('vertices', self.edge_vertices)
+        self.edge_vertices = self.edge_vertices.reshape(-1, 2)
+
+        self.loop_face = np.repeat(np.arange(self.face_count, dtype=np.int32), self.face_loop_total)
+        
+        # Previous corner wraps around to the last one of the face
+        self.loop_previous = np.arange(self.loop_count, dtype=np.int32) - 1
+        self.loop_previous[self.face_loop_start] += self.face_loop_total
+
+        self.vert_edges_offsets, self.vert_edges_indices = build_csr(self.edge_vertices.reshape(-1), np.repeat(np.arange(self.edge_count, dtype=np.int32), 2), self.vertex_count)
+        self.vert_loops_offsets, self.vert_loops_indices = build_csr(self.loop_vertex, np.arange(self.loop_count, dtype=np.int32), self.vertex_count)
+        self.vert_faces_offsets, self.vert_faces_indices = self.vert_loops_offsets, self.loop_face[self.vert_loops_indices]
+        self.edge_faces_offsets, self.edge_faces_indices = build_csr(self.loop_edge, self.loop_face, self.edge_count)
+
+    def is_valid(self, mesh):
+        """Checks if the element counts of the mesh did not change since this was built.
+        Other topology changes are detected by attribute_read_cache_depsgraph_handler(), which removes the topology from the cache.
+
+        Args:
+            mesh (Reference): Mesh datablock
+
+        Returns:
+            bool: True if still valid
+        """
+        return (self.vertex_count, self.edge_count, self.face_count, self.loop_count) == (len(mesh.vertices), len(mesh.edges), len(mesh.polygons), len(mesh.loops))
+    
+    def reduce_faces(self, loop_values, ufunc = np.logical_and):
+        """Reduces a value of each face corner to a value for each face, eg. whether all vertices of each face are selected
+
+        Args:
+            loop_values (np.ndarray): Value for each face corner
+            ufunc (np.ufunc, optional): Reducing function. Defaults to np.logical_and.
+
+        Returns:
+            np.ndarray: Value for each face
+        """
+        if not self.face_count:
+            return np.zeros(0, dtype=loop_values.dtype)
+        return ufunc.reduceat(loop_values, self.face_loop_start)
+
+def get_mesh_topology(mesh):
+    """Gets the topology of the mesh, built once and cached until the mesh topology changes
+
+    Args:
+        mesh (Reference): Mesh datablock
+
+    Returns:
+        MeshTopology: Topology of the mesh
+    """
+    key = mesh.as_pointer()
+    topology = MESH_TOPOLOGY_CACHE.get(key, None)
+    if topology is not None and topology.is_valid(mesh):
+        MESH_TOPOLOGY_CACHE.move_to_end(key)
+        return topology
+    
+    etc.log(get_mesh_topology, f"Building topology of {mesh.name}", etc.ELogLevel.VERBOSE)
+    topology = MeshTopology(mesh)
+    MESH_TOPOLOGY_CACHE[key] = topology
+    MESH_TOPOLOGY_CACHE.move_to_end(key)
+    while len(MESH_TOPOLOGY_CACHE) > MESH_TOPOLOGY_CACHE_MAX_MESHES:
+        MESH_TOPOLOGY_CACHE.popitem(last=False)
+    return topology
+
+def invalidate_mesh_topology(mesh = None):
+    """Removes cached mesh topology
+
+    Args:
+        mesh (Reference, optional): Mesh to remove the topology of. Defaults to None, removing all.
+    """
+    if mesh is None:
+        MESH_TOPOLOGY_CACHE.clear()
+    else:
+        MESH_TOPOLOGY_CACHE.pop(mesh.as_pointer(), None)
+
+# Vertex groups
+# ------------------------------------------
+
+class VertexGroupWeights():
+    """
+    Weights of all vertex groups of an object, read in a single pass over the vertices.
+    Stored as a sparse vertex x group matrix in compressed sparse rows (CSR) and columns (CSC).
+
+    CSR, groups of vertex i are group_indices[offsets[i]:offsets[i+1]], with weights[offsets[i]:offsets[i+1]]
+    CSC, vertices of group i are group_vertices[group_offsets[i]:group_offsets[i+1]], with group_weights[group_offsets[i]:group_offsets[i+1]]
+    """
+
+    def __init__(self, obj):
+        vertices = obj.data.vertices
+        self.vertex_count = len(vertices)
+        self.group_count = len(obj.vertex_groups)
+
+        # Single pass over vertices, row offsets are the running length of the flat lists
+        groups = []
+        weights = []
+        offsets = [0]
+        for vert in vertices:
+            for element in vert.groups:
+                groups.append(element.group)
+                weights.append(element.weight)
+            offsets.append(len(groups))
+        
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.group_indices = np.array(groups, dtype=np.int32)
+        self.weights = np.array(weights, dtype=np.float32)
+        counts = np.diff(self.offsets)
+
+        # Skip references to groups that do not exist anymore
+        rows = np.repeat(np.arange(self.vertex_count, dtype=np.int32), counts)
+        valid = (self.group_indices >= 0) & (self.group_indices < self.group_count)
+        entry_indices = np.flatnonzero(valid)
+        self.group_offsets, entry_indices = build_csr(self.group_indices[valid], entry_indices, self.group_count)
+        self.group_vertices = rows[entry_indices]
+        self.group_weights = self.weights[entry_indices]
+
+    def get_group_weights(self, group_index:int):
+        """Gets the weight of each vertex in a vertex group, 0.0 for vertices outside of it
+
+        Args:
+            group_index (int): Vertex group index
+
+        Returns:
+            np.ndarray: Weight for each vertex
+        """
+        start, end = self.group_offsets[group_index], self.group_offsets[group_index + 1]
+        data = np.zeros(self.vertex_count, dtype=np.float32)
+        data[self.group_vertices[start:end]] = self.group_weights[start:end]
+        return data
+    
+    def get_group_membership(self, group_index:int):
+        """Gets whether each vertex is in a vertex group
+
+        Args:
+            group_index (int): Vertex group index
+
+        Returns:
+            np.ndarray: Boolean for each vertex
+        """
+        data = np.zeros(self.vertex_count, dtype=bool)
+        data[self.group_vertices[self.group_offsets[group_index]:self.group_offsets[group_index + 1]]] = True
+        return data
+
+# Shape keys
+# ------------------------------------------
+
+def get_shape_key_positions(obj, indexes = None):
+    """Reads vertex positions of shape keys with foreach_get into a single array
+
+    Args:
+        obj (Reference): 3D Object Reference
+        indexes (list, optional): Indexes of key blocks to read. Defaults to None, reading all.
+
+    Returns:
+        np.ndarray: (K, N, 3) positions of N vertices in each of K shape keys
+    """
+    key_blocks = obj.data.shape_keys.key_blocks
+    if indexes is None:
+        indexes = range(len(key_blocks))
+    
+    vertex_count = len(obj.data.vertices)
+    positions = np.empty((len(indexes), vertex_count, 3), dtype=np.float32)
+    for i, sk_index in enumerate(indexes):
+        key_blocks[int(sk_index)].data.foreach_get('co', positions[i].reshape(-1))
+    return positions
+
+# Materials
+# ------------------------------------------
+
+def get_material_slot_lookup(obj):
+    """Gets the index in bpy.data.materials of the material in each material slot
+
+    Args:
+        obj (Reference): 3D Object Reference
+
+    Returns:
+        np.ndarray: Material index for each material slot, -1 for empty slots
+    """
+    material_indexes = {mat.as_pointer(): i for i, mat in enumerate(bpy.data.materials)}
+    return np.array([material_indexes.get(slot.material.as_pointer(), -1) if slot.material is not None else -1 
+                     for slot in obj.material_slots], dtype=np.int32)
+
+def get_face_material_masks(obj, material_indexes):
+    """Gets whether each face has a material assigned, for multiple materials at once
+
+    Args:
+        obj (Reference): 3D Object Reference
+        material_indexes (list): Indexes of materials in bpy.data.materials
+
+    Returns:
+        np.ndarray: (K, F) boolean masks of faces for each of K materials
+    """
+    lookup = get_material_slot_lookup(obj)
+    material_indexes = np.asarray(material_indexes, dtype=np.int32)
+    if not len(lookup):
+        return np.zeros((len(material_indexes), len(obj.data.polygons)), dtype=bool)
+    
+    # Out of range material indexes use the last slot, like in rendering
+    face_slots = get_domain_attribute_values(obj, 'FACE', 'material_index')
+    face_materials = lookup[np.clip(face_slots, 0, len(lookup) - 1)]
+    return face_materials[np.newaxis, :] == material_indexes[:, np.newaxis]
+
+# UV maps
+# ------------------------------------------
+
+def get_uvmap_values(obj, uvmap_index):
+    """Reads UV coordinates of each face corner with foreach_get
+
+    Args:
+        obj (Reference): 3D Object Reference
+        uvmap_index (int): Index of the UV map
+
+    Returns:
+        np.ndarray: (N, 2) UV coordinates
+    """
+    uvs = np.empty(len(obj.data.loops) * 2, dtype=np.float32)
+    obj.data.uv_layers[int(uvmap_index)].data.foreach_get('uv', uvs)
+    return uvs.reshape(-1, 2)
+
+def set_uvmap_values(obj, uvmap_index, values):
+    """Writes UV coordinates of each face corner with foreach_set
+
+    Args:
+        obj (Reference): 3D Object Reference
+        uvmap_index (int): Index of the UV map
+        values (list or np.ndarray): 2D or 3D vector for each face corner, only X and Y are used
+
+    Raises:
+        etc.MeshDataWriteException: If the length of values does not match face corner count
+    """
+    values = np.asarray(values, dtype=np.float32)
+    if len(values) != len(obj.data.loops):
+        raise etc.MeshDataWriteException("set_uvmap_values", f"Invalid input value data length. Input {len(values)}, expected {len(obj.data.loops)}")
+    
+    uvs = np.ascontiguousarray(values.reshape(len(values), -1)[:, :2]).reshape(-1)
+    obj.data.uv_layers[int(uvmap_index)].data.foreach_set('uv', uvs)
+
+def get_uv_editor_flags(obj, prefix:str, uvmap_index):
+    """Reads UV editor selection or pin state of each face corner, stored in hidden boolean attributes like .vs.UVMap
+
+    Args:
+        obj (Reference): 3D Object Reference
+        prefix (str): Attribute name prefix: .vs. .es. or .pn.
+        uvmap_index (int): Index of the UV map
+
+    Returns:
+        np.ndarray: Boolean for each face corner, False if the attribute does not exist
+    """
+    attribute_name = f"{prefix}{obj.data.uv_layers[int(uvmap_index)].name}"
+    flags = np.zeros(len(obj.data.loops), dtype=bool)
+    if attribute_name in obj.data.attributes:
+        obj.data.attributes[attribute_name].data.foreach_get('value', flags)
+    return flags
+
+def set_uv_editor_flags(obj, prefix:str, uvmap_index, values):
+    """Writes UV editor selection or pin state of each face corner, stored in hidden boolean attributes like .vs.UVMap
+
+    Args:
+        obj (Reference): 3D Object Reference
+        prefix (str): Attribute name prefix: .vs. .es. or .pn.
+        uvmap_index (int): Index of the UV map
+        values (list or np.ndarray): Boolean for each face corner
+
+    Raises:
+        etc.MeshDataWriteException: If the length of values does not match face corner count
+    """
+    values = np.ascontiguousarray(values, dtype=bool).reshape(-1)
+    if len(values) != len(obj.data.loops):
+        raise etc.MeshDataWriteException("set_uv_editor_flags", f"Invalid input value data length. Input {len(values)}, expected {len(obj.data.loops)}")
+    
+    attribute_name = f"{prefix}{obj.data.uv_layers[int(uvmap_index)].name}"
+    if not attribute_name in obj.data.attributes:
+        obj.data.attributes.new(attribute_name, 'BOOLEAN', 'CORNER')
+    obj.data.attributes[attribute_name].data.foreach_set('value', values)
+
+# Curves topology
+# ------------------------------------------
+
+def get_curve_point_offsets(curves_data):
+    """Gets the index of first point of each curve, with the total point count at the end.
+    Points of curve i are offsets[i] to offsets[i+1].
+
+    Args:
+        curves_data (Reference): Curves datablock
+
+    Returns:
+        np.ndarray: Offsets, curve count + 1 long
+    """
+    offsets = np.empty(len(curves_data.curves) + 1, dtype=np.int32)
+    if hasattr(curves_data, 'curve_offset_data') and len(curves_data.curve_offset_data) == len(offsets):
+        curves_data.curve_offset_data.foreach_get('value', offsets)
+    else:
+        curves_data.curves.foreach_get('first_point_index', offsets[:-1])
+        offsets[-1] = len(curves_data.points)
+    return offsets
+
+def curve_mask_to_point_mask(curve_mask, offsets):
+    """Broadcasts a value of each curve to each of its points
+
+    Args:
+        curve_mask (np.ndarray): Boolean mask, for each curve
+        offsets (np.ndarray): See get_curve_point_offsets()
+
+    Returns:
+        np.ndarray: Boolean mask, for each point
+    """
+    return np.repeat(curve_mask, np.diff(offsets))
+
+def point_mask_to_curve_mask(point_mask, offsets):
+    """Reduces a mask of points to mask of curves, a curve is True if any of its points is
+
+    Args:
+        point_mask (np.ndarray): Boolean mask, for each point
+        offsets (np.ndarray): See get_curve_point_offsets()
+
+    Returns:
+        np.ndarray: Boolean mask, for each curve
+    """
+    if len(offsets) < 2:
+        return np.zeros(0, dtype=bool)
+    return np.add.reduceat(point_mask.astype(np.int32), offsets[:-1]) > 0
+
+def get_curves_selection_mask(curves_data, domain:str):
+    """Reads the edit mode selection of curves, and maps it to the domain if the selection is stored on the other one
+
+    Args:
+        curves_data (Reference): Curves datablock
+        domain (str): POINT or CURVE
+
+    Returns:
+        np.ndarray: Boolean mask of selected points or curves
+    """
+    selection = curves_data.attributes['.selection']
+    mask = np.zeros(len(selection.data), dtype=bool)
+    selection.data.foreach_get('value', mask)
+
+    if selection.domain == domain:
+        return mask
+    
+    offsets = get_curve_point_offsets(curves_data)
+    if domain == 'POINT':
+        return curve_mask_to_point_mask(mask, offsets)
+    else:
+        return point_mask_to_curve_mask(mask, offsets)
+
+# Mesh islands
+# ------------------------------------------
+
+def get_connected_component_ids(count:int, pairs_a, pairs_b):
+    """Labels connected components of a graph with a vectorized union-find: roots are hooked to the smallest connected root, 
+    then paths are compressed by pointer jumping, until no pair connects different roots.
+
+    Args:
+        count (int): Number of graph nodes
+        pairs_a (np.ndarray): First node of each connection
+        pairs_b (np.ndarray): Second node of each connection
+
+    Returns:
+        np.ndarray: Component index of each node, 0 to component count, in order of the smallest node index of the component
+    """
+    parents = np.arange(count, dtype=np.int64)
+    pairs_a = np.asarray(pairs_a, dtype=np.int64)
+    pairs_b = np.asarray(pairs_b, dtype=np.int64)
+
+    while len(pairs_a):
+        roots_a = parents[pairs_a]
+        roots_b = parents[pairs_b]
+        b_different = roots_a != roots_b
+        if not b_different.any():
+            break
+        
+        # Drop the pairs that are already in the same component
+        pairs_a, pairs_b = pairs_a[b_different], pairs_b[b_different]
+        roots_a, roots_b = roots_a[b_different], roots_b[b_different]
+        
+        lowest = np.minimum(roots_a, roots_b)
+        np.minimum.at(parents, roots_a, lowest)
+        np.minimum.at(parents, roots_b, lowest)
+
+        while True:
+            grandparents = parents[parents]
+            if np.array_equal(grandparents, parents):
+                break
+            parents = grandparents
+    
+    return np.unique(parents, return_inverse=True)[1].astype(np.int32)
+
+def get_face_adjacency_loop_pairs(topology):
+    """Gets pairs of face corners of different faces that share the same edge, the face corner edge.
+    Edges with more than two faces connect each face to the next one.
+
+    Args:
+        topology (MeshTopology): Mesh topology
+
+    Returns:
+        np.ndarray: First face corner of each pair
+        np.ndarray: Second face corner of each pair
+    """
+    offsets, edge_loops = build_csr(topology.loop_edge, np.arange(topology.loop_count, dtype=np.int32), topology.edge_count)
+    loop_edges = np.repeat(np.arange(topology.edge_count, dtype=np.int32), np.diff(offsets))
+    b_same_edge = loop_edges[:-1] == loop_edges[1:]
+    return edge_loops[:-1][b_same_edge], edge_loops[1:][b_same_edge]
+
+def get_uv_continuous_loop_pairs(topology, uvs, loops_a, loops_b, limit = UV_ISLAND_CONNECT_LIMIT):
+    """Checks if UVs on both sides of an edge shared by two face corners match, so the faces are in the same UV island.
+
+    Args:
+        topology (MeshTopology): Mesh topology
+        uvs (np.ndarray): (L, 2) UV of each face corner
+        loops_a (np.ndarray): First face corner of each pair, see get_face_adjacency_loop_pairs()
+        loops_b (np.ndarray): Second face corner of each pair
+        limit (float, optional): Maximum UV distance on each axis to treat UVs as connected. Defaults to UV_ISLAND_CONNECT_LIMIT.
+
+    Returns:
+        np.ndarray: Boolean mask, True for pairs with continuous UVs
+    """
+    loop_next = np.empty_like(topology.loop_previous)
+    loop_next[topology.loop_previous] = np.arange(topology.loop_count, dtype=loop_next.dtype)
+
+    # Faces with the same winding walk the shared edge in opposite directions
+    b_opposite = topology.loop_vertex[loops_a] != topology.loop_vertex[loops_b]
+    match_start = np.where(b_opposite, loop_next[loops_b], loops_b)
+    match_end = np.where(b_opposite, loops_b, loop_next[loops_b])
+    
+    return (np.all(np.abs(uvs[loops_a] - uvs[match_start]) <= limit, axis=1) 
+            & np.all(np.abs(uvs[loop_next[loops_a]] - uvs[match_end]) <= limit, axis=1))
+
+def get_mesh_island_ids(obj, island_type:str, domain:str, uvmap_index = None):
+    """Gets the island index of each domain element
+
+    Args:
+        obj (Reference): 3D Object Reference
+        island_type (str): VERTEX_ISLAND, FACE_ISLAND, SEAM_ISLAND, SHARP_ISLAND or UV_ISLAND. See static_data.object_data_sources
+        domain (str): Domain to get the island indexes on
+        uvmap_index (int, optional): Index of the UVMap, for UV_ISLAND. Defaults to None.
+
+    Raises:
+        etc.MeshDataReadException: If the island type is not available on the domain
+
+    Returns:
+        np.ndarray: Island index of each element
+    """
+    topology = get_mesh_topology(obj.data)
+
+    # Vertices connected by edges
+    if island_type == 'VERTEX_ISLAND':
+        vertex_ids = get_connected_component_ids(topology.vertex_count, topology.edge_vertices[:, 0], topology.edge_vertices[:, 1])
+        if domain == 'POINT':
+            return vertex_ids
+        elif domain == 'EDGE':
+            return vertex_ids[topology.edge_vertices[:, 0]]
+        elif domain == 'FACE':
+            return vertex_ids[topology.loop_vertex[topology.face_loop_start]]
+        elif domain == 'CORNER':
+            return vertex_ids[topology.loop_vertex]
+    
+    # Faces connected by edges, optionally delimited
+    elif island_type in ['FACE_ISLAND', 'SEAM_ISLAND', 'SHARP_ISLAND', 'UV_ISLAND'] and domain in ['FACE', 'CORNER']:
+        loops_a, loops_b = get_face_adjacency_loop_pairs(topology)
+
+        if island_type in ['SEAM_ISLAND', 'SHARP_ISLAND']:
+            with scratch_buffer(bool, topology.edge_count) as b_delimiter:
+                obj.data.edges.foreach_get('use_seam' if island_type == 'SEAM_ISLAND' else 'use_edge_sharp', b_delimiter)
+                b_connected = ~b_delimiter[topology.loop_edge[loops_a]]
+            loops_a, loops_b = loops_a[b_connected], loops_b[b_connected]
+
+        elif island_type == 'UV_ISLAND':
+            b_connected = get_uv_continuous_loop_pairs(topology, get_uvmap_values(obj, uvmap_index), loops_a, loops_b)
+            loops_a, loops_b = loops_a[b_connected], loops_b[b_connected]
+
+        face_ids = get_connected_component_ids(topology.face_count, topology.loop_face[loops_a], topology.loop_face[loops_b])
+        return face_ids if domain == 'FACE' else face_ids[topology.loop_face]
+    
+    raise etc.MeshDataReadException("get_mesh_island_ids", f"{island_type} is not available on {domain} domain")
+
+# Selection masks
+# ------------------------------------------
+
+class SelectionMask():
+    """
+    Boolean mask of selected elements of a domain, eg. vertices selected in edit mode.
+    Supports & | ^ ~ with masks of the same domain, conversion to other domains of the object and to indexes.
+    """
+
+    def __init__(self, mask, domain:str):
+        self.mask = np.asarray(mask, dtype=bool)
+        self.domain = domain
+    
+    @classmethod
+    def from_indexes(cls, indexes, length:int, domain:str):
+        """Creates the mask from indexes of selected elements
+
+        Args:
+            indexes (list or np.ndarray): Indexes of selected elements
+            length (int): Number of elements in the domain
+            domain (str): Domain of the elements
+
+        Returns:
+            SelectionMask: The mask
+        """
+        mask = np.zeros(length, dtype=bool)
+        mask[np.asarray(indexes, dtype=np.int64)] = True
+        return cls(mask, domain)
+
+    @classmethod
+    def from_selection(cls, selection, length:int, domain:str):
+        """Creates the mask from another mask, boolean array or indexes
+
+        Args:
+            selection (SelectionMask, np.ndarray or list): Selected elements
+            length (int): Number of elements in the domain
+            domain (str): Domain of the elements
+
+        Raises:
+            etc.MeshDataReadException: If a boolean array length does not match the domain length
+
+        Returns:
+            SelectionMask: The mask
+        """
+        if isinstance(selection, SelectionMask):
+            return selection
+        
+        selection = np.asarray(selection)
+        if selection.dtype == bool:
+            if len(selection) != length:
+                raise etc.MeshDataReadException("SelectionMask.from_selection", f"Invalid boolean mask length. Input {len(selection)}, expected {length}")
+            return cls(selection, domain)
+        return cls.from_indexes(selection, length, domain)
+    
+    @classmethod
+    def none(cls, length:int, domain:str):
+        "Creates a mask with nothing selected"
+        return cls(np.zeros(length, dtype=bool), domain)
+
+    @classmethod
+    def all(cls, length:int, domain:str):
+        "Creates a mask with everything selected"
+        return cls(np.ones(length, dtype=bool), domain)
+
+    def to_indexes(self):
+        """Gets the indexes of selected elements
+
+        Returns:
+            np.ndarray: Indexes, ascending
+        """
+        return np.flatnonzero(self.mask)
+    
+    def count(self):
+        "Gets the number of selected elements"
+        return int(np.count_nonzero(self.mask))
+
+    def any(self):
+        "Checks if anything is selected"
+        return bool(self.mask.any())
+
+    def __len__(self):
+        return len(self.mask)
+
+    def __array__(self, dtype = None, copy = None):
+        return self.mask if dtype is None else self.mask.astype(dtype)
+
+    def _check_domain(self, other):
+        if self.domain != other.domain or len(self) != len(other):
+            raise etc.GenericFunctionParameterError("SelectionMask", f"Cannot combine {self.domain} mask of length {len(self)} with {other.domain} mask of length {len(other)}")
+
+    def __and__(self, other):
+        self._check_domain(other)
+        return SelectionMask(self.mask & other.mask, self.domain)
+
+    def __or__(self, other):
+        self._check_domain(other)
+        return SelectionMask(self.mask | other.mask, self.domain)
+
+    def __xor__(self, other):
+        self._check_domain(other)
+        return SelectionMask(self.mask ^ other.mask, self.domain)
+    
+    def __invert__(self):
+        return SelectionMask(~self.mask, self.domain)
+
+    def to_domain(self, obj, domain:str):
+        """Converts the selection to other domain like edit mode does: edges and faces are selected if all of their vertices 
+        or edges are, vertices and edges of selected elements are selected. Corners of selected vertices are selected, and
+        corners bounded by two selected edges.
+
+        Args:
+            obj (Reference): 3D Object Reference the mask was created from
+            domain (str): Target domain
+
+        Raises:
+            etc.GenericFunctionParameterError: If the conversion is not supported
+
+        Returns:
+            SelectionMask: The mask on the target domain
+        """
+        if domain == self.domain:
+            return self
+        
+        if obj.type == 'CURVES':
+            offsets = get_curve_point_offsets(obj.data)
+            if self.domain == 'CURVE' and domain == 'POINT':
+                return SelectionMask(curve_mask_to_point_mask(self.mask, offsets), domain)
+            elif self.domain == 'POINT' and domain == 'CURVE':
+                return SelectionMask(point_mask_to_curve_mask(self.mask, offsets), domain)
+        
+        elif obj.type == 'MESH':
+            topology = get_mesh_topology(obj.data)
+            mask = self.mask
+
+            if self.domain == 'POINT':
+                if domain == 'EDGE':
+                    return SelectionMask(mask[topology.edge_vertices[:, 0]] & mask[topology.edge_vertices[:, 1]], domain)
+                elif domain == 'FACE':
+                    return SelectionMask(topology.reduce_faces(mask[topology.loop_vertex], np.logical_and), domain)
+                elif domain == 'CORNER':
+                    return SelectionMask(mask[topology.loop_vertex], domain)
+            
+            elif self.domain == 'EDGE':
+                if domain == 'POINT':
+                    return SelectionMask.from_indexes(topology.edge_vertices[mask].reshape(-1), topology.vertex_count, domain)
+                elif domain == 'FACE':
+                    return SelectionMask(topology.reduce_faces(mask[topology.loop_edge], np.logical_and), domain)
+                elif domain == 'CORNER':
+                    loop_edge_selected = mask[topology.loop_edge]
+                    return SelectionMask(loop_edge_selected & loop_edge_selected[topology.loop_previous], domain)
+
+            elif self.domain == 'FACE':
+                loop_mask = mask[topology.loop_face]
+                if domain == 'POINT':
+                    return SelectionMask.from_indexes(topology.loop_vertex[loop_mask], topology.vertex_count, domain)
+                elif domain == 'EDGE':
+                    return SelectionMask.from_indexes(topology.loop_edge[loop_mask], topology.edge_count, domain)
+                elif domain == 'CORNER':
+                    return SelectionMask(loop_mask, domain)
+            
+            elif self.domain == 'CORNER':
+                if domain == 'POINT':
+                    return SelectionMask.from_indexes(topology.loop_vertex[mask], topology.vertex_count, domain)
+                elif domain == 'EDGE':
+                    return SelectionMask.from_indexes(np.concatenate((topology.loop_edge[mask], topology.loop_edge[topology.loop_previous[mask]])), topology.edge_count, domain)
+                elif domain == 'FACE':
+                    return SelectionMask(topology.reduce_faces(mask, np.logical_and), domain)
+        
+        raise etc.GenericFunctionParameterError("SelectionMask.to_domain", f"Cannot convert {self.domain} selection to {domain} on {obj.type} object")
+
+# Selection cache
+# ------------------------------------------
+
+# Derived edit mode selections, {(mesh pointer, domain, spill, select mode): (fingerprint, SelectionMask)}. Least recently used first.
+SELECTION_CACHE = OrderedDict()
+
+def get_selection_cache_key(mesh, domain:str, spill = False):
+    """Gets the SELECTION_CACHE key of a derived selection
+
+    Args:
+        mesh (Reference): Mesh data reference
+        domain (str): Mesh domain
+        spill (bool, optional): Face corner spill. Defaults to False.
+
+    Returns:
+        tuple: The key
+    """
+    return (mesh.as_pointer(), domain, spill, tuple(bpy.context.scene.tool_settings.mesh_select_mode))
+
+def get_mesh_selection_fingerprint(mesh):
+    """Gets a fingerprint of vertex, edge and face select flags, to detect selection changes without deriving the selection again.
+    Flags are packed to bits before hashing, element counts are included.
+
+    Args:
+        mesh (Reference): Mesh data reference
+
+    Returns:
+        tuple: The fingerprint
+    """
+    fingerprint = []
+    if is_edit_mode_bmesh_supported(mesh):
+        bm = bmesh.from_edit_mesh(mesh)
+        for elements in [bm.verts, bm.edges, bm.faces]:
+            flags = np.fromiter((el.select for el in elements), dtype=bool, count=len(elements))
+            fingerprint.append((len(elements), hash(np.packbits(flags).tobytes())))
+    else:
+        for elements in [mesh.vertices, mesh.edges, mesh.polygons]:
+            with scratch_buffer(bool, len(elements)) as flags:
+                elements.foreach_get('select', flags)
+                fingerprint.append((len(elements), hash(np.packbits(flags).tobytes())))
+    return tuple(fingerprint)
+
+def get_mesh_selection_count(mesh, domain:str):
+    """Gets the number of selected vertices, edges or faces in edit mode, stored by blender. Does not read the selection.
+
+    Args:
+        mesh (Reference): Mesh data reference
+        domain (str): Mesh domain
+
+    Returns:
+        int or None: The count, None outside of edit mode and for face corners, which are derived from other domains
+    """
+    # Blender stores zeros outside of edit mode
+    if not mesh.is_editmode:
+        return None
+    elif domain == 'POINT':
+        return mesh.total_vert_sel
+    elif domain == 'EDGE':
+        return mesh.total_edge_sel
+    elif domain == 'FACE':
+        return mesh.total_face_sel
+    return None
+
+def invalidate_selection_cache(mesh = None):
+    """Removes cached selections
+
+    Args:
+        mesh (Reference, optional): Mesh to remove the selections of. Defaults to None, removing all.
+    """
+    if mesh is None:
+        SELECTION_CACHE.clear()
+        return
+    
+    pointer = mesh.as_pointer()
+    for key in [key for key in SELECTION_CACHE.keys() if key[0] == pointer]:
+        del SELECTION_CACHE[key]
+
+# Edit mode BMesh
+# ------------------------------------------
+
+def is_edit_mode_bmesh_supported(mesh, data_type:str = None, attribute_name:str = None, domain:str = None):
+    """Checks whether attribute values and selection of the mesh should be read and written on the edit mode BMesh,
+    without switching to object mode. Mesh data is not synchronized with the BMesh in edit mode.
+
+    Large meshes are not supported, as BMesh elements are accessed one by one, see edit_mode_bmesh_max_elements preference.
+
+    Args:
+        mesh (Reference): Mesh data reference
+        data_type (str, optional): Attribute data type to check. Defaults to None, to check selection only.
+        attribute_name (str, optional): Attribute name, required to check an attribute. Defaults to None.
+        domain (str, optional): Attribute domain, required to check an attribute. Defaults to None.
+
+    Returns:
+        bool: True if supported
+    """
+    if not isinstance(mesh, bpy.types.Mesh) or not mesh.is_editmode or not etc.get_preferences_attrib("edit_mode_bmesh_backend"):
+        return False
+    
+    bm = bmesh.from_edit_mesh(mesh)
+    if len(bm.verts) + len(bm.edges) + len(bm.faces) > etc.get_preferences_attrib("edit_mode_bmesh_max_elements"):
+        return False
+    elif data_type is None:
+        return True
+    
+    # Built-in attributes like position or material_index are stored on the BMesh elements, not in layers
+    return find_bmesh_attribute_layer(bm, attribute_name, domain, data_type) is not None
+
+def get_bmesh_domain_elements(bm, domain:str):
+    """Gets the BMesh elements of a domain, indexable in the same order as mesh domain indexes
+
+    Args:
+        bm (BMesh): BMesh
+        domain (str): Mesh domain
+
+    Raises:
+        etc.GenericFunctionParameterError: If the domain is unsupported
+
+    Returns:
+        BMElemSeq or list: Elements of the domain
+    """
+    if domain == 'POINT':
+        bm.verts.ensure_lookup_table()
+        return bm.verts
+    elif domain == 'EDGE':
+        bm.edges.ensure_lookup_table()
+        return bm.edges
+    elif domain == 'FACE':
+        bm.faces.ensure_lookup_table()
+        return bm.faces
+    elif domain == 'CORNER':
+        # Loops are not indexable in BMesh, corners of each face are in mesh order
+        return [loop for face in bm.faces for loop in face.loops]
+    raise etc.GenericFunctionParameterError("get_bmesh_domain_elements", f"Domain {domain} is not supported in edit mode")
+
+def get_bmesh_domain_size(mesh, domain:str):
+    """Gets the number of elements in a domain of the edit mode BMesh
+
+    Args:
+        mesh (Reference): Mesh data reference, in edit mode
+        domain (str): Mesh domain
+
+    Returns:
+        int: Number of elements
+    """
+    bm = bmesh.from_edit_mesh(mesh)
+    if domain == 'CORNER':
+        return sum(len(face.loops) for face in bm.faces)
+    return len(get_bmesh_domain_elements(bm, domain))
+
+def find_bmesh_attribute_layer(bm, attribute_name:str, domain:str, data_type:str):
+    """Finds the BMesh custom data layer storing an attribute
+
+    Args:
+        bm (BMesh): BMesh
+        attribute_name (str): Attribute name
+        domain (str): Attribute domain
+        data_type (str): Attribute data type
+
+    Returns:
+        BMLayerItem or None: The layer, None if it does not exist or the data type is not accessible in edit mode
+    """
+    sequences = {'POINT': bm.verts, 'EDGE': bm.edges, 'FACE': bm.faces, 'CORNER': bm.loops}
+    layer_type = static_data.attribute_data_types[data_type].bmesh_layer_type if data_type in static_data.attribute_data_types else None
+    if domain not in sequences or layer_type is None or attribute_name is None:
+        return None
+    
+    # Older blender versions might not have all layer types
+    layers = getattr(sequences[domain].layers, layer_type, None)
+    return layers.get(attribute_name) if layers is not None else None
+
+def get_bmesh_attribute_layer(bm, attribute_name:str, domain:str, data_type:str):
+    """Gets the BMesh custom data layer storing an attribute
+
+    Args:
+        bm (BMesh): BMesh
+        attribute_name (str): Attribute name
+        domain (str): Attribute domain
+        data_type (str): Attribute data type
+
+    Raises:
+        etc.MeshDataReadException: If the layer does not exist or the data type is not accessible in edit mode
+
+    Returns:
+        BMLayerItem: The layer
+    """
+    layer = find_bmesh_attribute_layer(bm, attribute_name, domain, data_type)
+    if layer is None:
+        raise etc.MeshDataReadException("get_bmesh_attribute_layer", f"No {attribute_name} {data_type} layer on {domain} domain in edit mode")
+    return layer
+
+def get_bmesh_attribute_values(mesh, attribute_name:str, domain:str, data_type:str):
+    """Reads all attribute values from the edit mode BMesh into a numpy array, same as read_attribute_buffer()
+
+    Args:
+        mesh (Reference): Mesh data reference, in edit mode
+        attribute_name (str): Attribute name
+        domain (str): Attribute domain
+        data_type (str): Attribute data type
+
+    Returns:
+        np.ndarray: Attribute values, (N,) or (N, components). Strings as array of objects.
+    """
+    bm = bmesh.from_edit_mesh(mesh)
+    layer = get_bmesh_attribute_layer(bm, attribute_name, domain, data_type)
+    elements = get_bmesh_domain_elements(bm, domain)
+    layout = get_attribute_buffer_layout(data_type)
+
+    etc.log(get_bmesh_attribute_values, f"Reading {attribute_name} from edit mode BMesh, {len(elements)} {domain}", etc.ELogLevel.VERBOSE)
+
+    if data_type == 'STRING':
+        values = np.empty(len(elements), dtype=object)
+        values[:] = [el[layer].decode('utf-8', errors='replace') for el in elements]
+        return values
+    elif layout.buffer_components == 1:
+        return np.fromiter((el[layer] for el in elements), dtype=layout.buffer_dtype, count=len(elements))
+    return np.array([el[layer][:] for el in elements], dtype=layout.buffer_dtype).reshape((-1,) + layout.buffer_shape)
+
+def set_bmesh_attribute_values(mesh, attribute_name:str, domain:str, data_type:str, value, indexes = None):
+    """Sets attribute values on the edit mode BMesh and updates the edit mesh. Accepts both lists and single values.
+
+    Args:
+        mesh (Reference): Mesh data reference, in edit mode
+        attribute_name (str): Attribute name
+        domain (str): Attribute domain
+        data_type (str): Attribute data type
+        value (list or value): The single value to set, or a list of values for each domain in indexes
+        indexes (list or np.ndarray, optional): Domain indexes to set the values on. Defaults to None, setting all.
+
+    Raises:
+        etc.MeshDataWriteException: On failure
+    """
+    bm = bmesh.from_edit_mesh(mesh)
+    layer = get_bmesh_attribute_layer(bm, attribute_name, domain, data_type)
+    elements = get_bmesh_domain_elements(bm, domain)
+    
+    indexes = np.asarray(indexes, dtype=np.int64).tolist() if indexes is not None else range(len(elements))
+
+    # Tuples are considered a single value, like in set_attribute_values()
+    b_list_of_values_input = type(value) in [list, np.ndarray]
+    if b_list_of_values_input and len(value) < len(indexes):
+        raise etc.MeshDataWriteException("set_bmesh_attribute_values", f"Value input list is shorter [{len(value)}] than the number of domains to set [{len(indexes)}]")
+
+    etc.log(set_bmesh_attribute_values, f"Setting {attribute_name} values on {len(indexes)} {domain} in edit mode BMesh", etc.ELogLevel.VERBOSE)
+
+    def to_layer_value(v):
+        if data_type == 'STRING':
+            return str(v).encode('utf-8')
+        return v.tolist() if isinstance(v, (np.ndarray, np.generic)) else v
+    
+    if b_list_of_values_input:
+        for i, index in enumerate(indexes):
+            elements[index][layer] = to_layer_value(value[i])
+    else:
+        value = to_layer_value(value)
+        for index in indexes:
+            elements[index][layer] = value
+    
+    bmesh.update_edit_mesh(mesh, loop_triangles=False, destructive=False)
+
+def get_bmesh_selection_mask(mesh, domain:str, spill = False):
+    """Gets the mask of selected domain entries from the edit mode BMesh, same as get_mesh_selection_mask()
+
+    Args:
+        mesh (Reference): Mesh data reference, in edit mode
+        domain (str): Mesh domain
+        spill (bool, optional): Enables selection spilling to nearby face corners from selected verts/faces/edges. Defaults to False.
+
+    Returns:
+        SelectionMask: Selected elements of the domain
+    """
+    bm = bmesh.from_edit_mesh(mesh)
+    elements = get_bmesh_domain_elements(bm, domain)
+
+    if domain != 'CORNER':
+        storage = np.fromiter((el.select for el in elements), dtype=bool, count=len(elements))
+    elif spill:
+        storage = np.fromiter((loop.vert.select for loop in elements), dtype=bool, count=len(elements))
+    elif bpy.context.scene.tool_settings.mesh_select_mode[2]:
+        storage = np.fromiter((loop.face.select for loop in elements), dtype=bool, count=len(elements))
+    else:
+        # Corners bounded by two selected edges, see get_corner_mask_bounded_by_selected_edges()
+        storage = np.fromiter((loop.edge.select and loop.link_loop_prev.edge.select for loop in elements), dtype=bool, count=len(elements))
+    return SelectionMask(storage, domain)
+
+def set_bmesh_selection_or_visibility(mesh, domain:str, selection_mask, state = True, selection = True):
+    """Sets the selection or visibility on the edit mode BMesh, see set_selection_or_visibility_of_mesh_domain().
+    Selection is flushed to connected elements with current select mode.
+
+    Args:
+        mesh (Reference): Mesh data reference, in edit mode
+        domain (str): Domain - POINT EDGE FACE CORNER
+        selection_mask (SelectionMask): Elements to set the state on
+        state (bool, optional): The state of visibility or selection. Defaults to True.
+        selection (bool, optional): Whether toggle selection or visibility. Defaults to True.
+    """
+    bm = bmesh.from_edit_mesh(mesh)
+    elements = get_bmesh_domain_elements(bm, domain)
+    indexes = selection_mask.to_indexes().tolist()
+
+    if domain == 'CORNER':
+        # Set on edges of the face that are connected to the corner, or on the edges/vertices of the corner
+        if etc.get_preferences_attrib("select_attribute_precise_facecorners"):
+            target_domain = 'EDGE'
+            targets = set(el for i in indexes for el in (elements[i].edge, elements[i].link_loop_prev.edge))
+        elif bpy.context.scene.tool_settings.mesh_select_mode[1] or bpy.context.scene.tool_settings.mesh_select_mode[2]:
+            target_domain = 'EDGE'
+            targets = set(elements[i].edge for i in indexes)
+        else:
+            target_domain = 'POINT'
+            targets = set(elements[i].vert for i in indexes)
+    else:
+        target_domain = domain
+        targets = [elements[i] for i in indexes]
+    
+    etc.log(set_bmesh_selection_or_visibility, f"Setting sel/vis {selection} to state {state} on {len(targets)} {target_domain} in edit mode BMesh", etc.ELogLevel.VERBOSE)
+
+    for el in targets:
+        if selection:
+            el.select_set(state)
+        else:
+            el.hide_set(state)
+    
+    if selection:
+        bm.select_flush_mode()
+    
+    bmesh.update_edit_mesh(mesh, loop_triangles=False, destructive=False)
 
 # Attribute related
 # ------------------------------------------
@@ -93,90 +1545,43 @@ def get_attribute_value_propname(attribute = None, data_type:str = ""):
     if data_type == '':
         data_type = attribute.data_type
 
-    if data_type in ["FLOAT_VECTOR", "FLOAT2"]:
-        return "vector"
-    elif data_type in ["FLOAT_COLOR", "BYTE_COLOR"]:
-        return "color"
-    else:
-        return "value"
+    if data_type in static_data.attribute_data_types:
+        return static_data.attribute_data_types[data_type].buffer_foreach_prop
+    return "value"
 
-def get_attribute_values(attribute, obj):
+def get_attribute_values(attribute, obj, as_numpy = False):
     """Reads all attribute values using foreach_get
 
     Args:
         attribute (Reference): Attribute reference variable
         obj (Reference): Reference to an 3D object that stores that attribute
+        as_numpy (bool, optional): Return a typed numpy array of (N,) shape for single values, (N, components) for vectors or (N, 4, 4) for matrices, instead of a list. Defaults to False.
 
     Raises:
         etc.MeshDataReadException: If source data type is not implemented
         
     Returns:
-        list: Attribute values, data type unchanged
+        list or np.ndarray: Attribute values, data type unchanged
     """
 
-    value_attrib_propname = get_attribute_value_propname(attribute)
     dt = attribute.data_type
+    if dt not in static_data.attribute_data_types:
+        raise etc.MeshDataReadException('get_attrib_values', f"Data type {dt} is unsupported.")
 
-    etc.log(get_attribute_values, f"Getting {attribute.name} values: data type = {dt} ({attribute.data_type}), prop name = {value_attrib_propname}, domain len = {len(attribute.data)}", etc.ELogLevel.VERBOSE)
+    etc.log(get_attribute_values, f"Getting {attribute.name} values: data type = {dt}, prop name = {get_attribute_value_propname(attribute)}, domain len = {len(attribute.data)}, numpy: {as_numpy}", etc.ELogLevel.VERBOSE)
     
-    if dt == "FLOAT":
-        a_vals = [0.0] * len(attribute.data)
-        attribute.data.foreach_get(value_attrib_propname, a_vals)
-        return a_vals
-    elif dt == "INT":
-        a_vals = [0] * len(attribute.data)
-        attribute.data.foreach_get(value_attrib_propname, a_vals)
-        return a_vals
-    elif dt == "FLOAT_VECTOR":
-        a_vals = [0.0] * (len(attribute.data) * 3) # why not Vector()? 
-        attribute.data.foreach_get(value_attrib_propname, a_vals)
-        return [(a_vals[i], a_vals[i+1], a_vals[i+2]) for i in range(0, len(a_vals), 3)]
-    elif dt == "FLOAT_COLOR":
-        a_vals = [0.0] * (len(attribute.data) * 4)
-        attribute.data.foreach_get(value_attrib_propname, a_vals)
-        return [(a_vals[i], a_vals[i+1], a_vals[i+2], a_vals[i+3]) for i in range(0, len(a_vals), 4)]
-    elif dt == "BYTE_COLOR":
-        a_vals = [0.0] * (len(attribute.data) * 4)
-        attribute.data.foreach_get(value_attrib_propname, a_vals)
-        return [(a_vals[i], a_vals[i+1], a_vals[i+2], a_vals[i+3]) for i in range(0, len(a_vals), 4)]
-    elif dt == "BOOLEAN":
-        a_vals = [False] * len(attribute.data)
-        attribute.data.foreach_get(value_attrib_propname, a_vals)
-        return a_vals
-    elif dt == "FLOAT2":
-        a_vals = [0.0] * (len(attribute.data) * 2)
-        attribute.data.foreach_get(value_attrib_propname, a_vals)
-        return [(a_vals[i], a_vals[i+1]) for i in range(0, len(a_vals), 2)]
-    elif dt == "INT32_2D":
-        a_vals = [0] * (len(attribute.data) * 2)
-        attribute.data.foreach_get(value_attrib_propname, a_vals)
-        return [(a_vals[i], a_vals[i+1]) for i in range(0, len(a_vals), 2)]
-    elif dt == "QUATERNION":
-        a_vals = [0.0] * (len(attribute.data) * 4)
-        attribute.data.foreach_get(value_attrib_propname, a_vals)
-        return [(a_vals[i], a_vals[i+1], a_vals[i+2], a_vals[i+3]) for i in range(0, len(a_vals), 4)]
-    elif dt == "FLOAT4X4":
-        a_vals = [0.0] * (len(attribute.data) * 16)
-        attribute.data.foreach_get(value_attrib_propname, a_vals)
-        a = []
-        for i in range(0, len(a_vals), 16):
-            v = []
-            for j in range(0, 16):
-                v.append(a_vals[i+j])
-            a.append(v)
-        return a
-    elif dt == "INT8":
-        a_vals = [0] * len(attribute.data)
-        attribute.data.foreach_get(value_attrib_propname, a_vals)
-        return a_vals
-    elif dt == "STRING":
-        # Foreach set get does not support strings.
-        a_vals = []
-        for entry in attribute.data:
-            a_vals.append(entry.value)
+    # Typed buffer, filled with single foreach_get and reshaped without creating python objects per element
+    a_vals = read_attribute_buffer(attribute)
+    if as_numpy:
         return a_vals
+
+    # Python containers: tuples for vectors, flat lists for matrices
+    if a_vals.ndim == 1:
+        return a_vals.tolist()
+    elif static_data.attribute_data_types[dt].large_capacity_vector:
+        return a_vals.reshape(len(a_vals), -1).tolist()
     else:
-        raise etc.MeshDataReadException('get_attrib_values', f"Data type {dt} is unsupported.")
+        return [tuple(v) for v in a_vals.tolist()]
 
 def get_attribute_default_value(attribute = None, datatype:str = None):
     """Returns the zero value for attribute data type. Does not return a list with the length of the attribute data!
@@ -236,7 +1641,7 @@ def get_random_attribute_of_data_type(context, data_type:str, count=1, no_list =
         data_type (str): Data type string
         count (int): count, set higher than 1 to get a list
         no_list (boolean): Force return a single value instead of a list
-        src_attribute (reference): If only a part of the vector has to be randomized the attribute has to be passed 
+        src_attribute (reference): If only a part of the vector has to be randomized the attribute or AttributeArray has to be passed 
         obj (reference): If only a part of the vector has to be randomized the object reference has to be passed 
         randomize_once (bool): For lists, returns a single random value repeated for whole length of the list
         no_numpy (bool): If the returned value cannot be of numpy type eg. numpy.int32
@@ -253,6 +1658,8 @@ def get_random_attribute_of_data_type(context, data_type:str, count=1, no_list =
         * color_randomize_type      str RGBA HSVA
         * b_vec_{id}                Whether to change the value at vector subelement, vector is usually 4D
         * original_vector           If no_list is true, input is a vector and only some subelements have to be randomized, pass original vector here
+        * src_indexes               Domain indexes the random values will be written to, to read only matching original vectors
+        * matrix_cell_toggles       List of 16 booleans, whether to randomize each matrix cell in row order. Defaults to all
 
     Returns:
         list or variable type: random value(s)
@@ -303,9 +1710,13 @@ def get_random_attribute_of_data_type(context, data_type:str, count=1, no_list =
         # If not read the original values or get the og vector from kwargs if this is a single random vec
         if not all(v_toggles) or use_hsv:
             if no_list:
-                og_vals = [kwargs['original_vector']]
+                og_vals = np.array([kwargs['original_vector']])
             else:
-                og_vals = get_attribute_values(src_attribute, obj)
+                og_vals = np.asarray(src_attribute) if isinstance(src_attribute, AttributeArray) else get_attribute_values_cached(src_attribute)
+                if 'src_indexes' in kwargs and kwargs['src_indexes'] is not None:
+                    og_vals = og_vals[kwargs['src_indexes']]
+                elif use_hsv:
+                    og_vals = og_vals.copy()
 
         # Convert them to HSV if applicable
         if use_hsv:
@@ -324,7 +1735,7 @@ def get_random_attribute_of_data_type(context, data_type:str, count=1, no_list =
 
                     stacks.append(value)
             else:
-                stacks.append([i[subelement] for i in og_vals])
+                stacks.append(og_vals[:, subelement])
         val = np.column_stack(stacks)
         
         if use_hsv:
@@ -339,6 +1750,39 @@ def get_random_attribute_of_data_type(context, data_type:str, count=1, no_list =
         else:
             return val.tolist() if no_numpy else val
 
+    # Matrices, randomized per cell and returned as (N, 4, 4) arrays
+    elif data_type == "FLOAT4X4":
+        
+        if no_list or randomize_once:
+            substack_len = 1
+        else:
+            substack_len = count
+        
+        buffer_shape = static_data.attribute_data_types[data_type].buffer_shape
+        cell_toggles = np.asarray(kwargs.get('matrix_cell_toggles', [True] * 16), dtype=bool)
+        range_min = np.asarray(kwargs['range_min'], dtype=np.float32)
+        range_max = np.asarray(kwargs['range_max'], dtype=np.float32)
+
+        val = np.random.uniform(low=range_min, high=range_max, size=(substack_len, 16)).astype(np.float32)
+        if randomize_once and not no_list:
+            val = np.repeat(val, count, axis=0)
+
+        # Keep original values in cells that are not randomized
+        if not cell_toggles.all():
+            if no_list:
+                og_vals = np.asarray(kwargs['original_vector'], dtype=np.float32).reshape(1, 16)
+            else:
+                og_vals = np.asarray(src_attribute) if isinstance(src_attribute, AttributeArray) else get_attribute_values_cached(src_attribute)
+                if 'src_indexes' in kwargs and kwargs['src_indexes'] is not None:
+                    og_vals = og_vals[kwargs['src_indexes']]
+                og_vals = og_vals.reshape(len(og_vals), 16)
+            val[:, ~cell_toggles] = og_vals[:, ~cell_toggles]
+
+        val = val.reshape((len(val),) + buffer_shape)
+        if no_list:
+            return val[0].reshape(-1).tolist() if no_numpy else val[0]
+        return val
+
     # String
     elif data_type == "STRING":
         min_len = kwargs['range_min']
@@ -392,6 +1836,81 @@ def get_random_attribute_of_data_type(context, data_type:str, count=1, no_list =
 
 # set
 
+def get_set_algo_cost_model_key(data_type:str, domain_count:int):
+    """Gets the key of cost model entry, for data type and power of 2 bucket of domain count
+
+    Args:
+        data_type (str): Attribute data type
+        domain_count (int): Number of domains in the attribute
+
+    Returns:
+        str: Key in etc.get_set_algo_cost_model()
+    """
+    return f"{data_type}|{2 ** int(math.log2(max(domain_count, 1)))}"
+
+def get_set_attribute_values_strategy(data_type:str, domain_count:int, selected_count:int):
+    """Selects the algorithm used to set values on selected domains in set_attribute_values()
+
+    Args:
+        data_type (str): Attribute data type
+        domain_count (int): Number of domains in the attribute
+        selected_count (int): Number of domains to set the value on
+
+    Returns:
+        str: 'FOREACH', 'BY_VALUE' or 'CALIBRATE' if costs of both have to be measured first
+    """
+
+    # Strings do not support foreach_set
+    if not is_foreach_supported(data_type):
+        return 'BY_VALUE'
+
+    # Forced by user
+    if etc.get_preferences_attrib('force_assign_on_selected_by_foreach_get_foreach_set'):
+        return 'FOREACH'
+    elif etc.get_preferences_attrib('force_assign_on_selected_by_value'):
+        return 'BY_VALUE'
+    
+    # Measured crossover point
+    if etc.get_preferences_attrib('set_algo_adaptive') and domain_count >= SET_ALGO_CALIBRATION_MIN_DOMAINS:
+        entry = etc.get_set_algo_cost_model().get(get_set_algo_cost_model_key(data_type, domain_count), None)
+        if entry is None or not entry['by_value_samples'] or not entry['foreach_samples']:
+            return 'CALIBRATE'
+        
+        # by value costs by_value_cost per selected domain, foreach costs foreach_cost per each domain
+        return 'FOREACH' if selected_count * entry['by_value_cost'] > domain_count * entry['foreach_cost'] else 'BY_VALUE'
+    
+    # Static threshold
+    return 'FOREACH' if selected_count > domain_count * etc.get_preferences_attrib('set_algo_tweak') else 'BY_VALUE'
+
+def record_set_attribute_values_costs(data_type:str, domain_count:int, by_value_cost:float, foreach_cost:float):
+    """Stores measured costs of set_attribute_values() algorithms in the cost model in addon preferences.
+    Samples are averaged up to SET_ALGO_CALIBRATION_MAX_SAMPLES.
+
+    Args:
+        data_type (str): Attribute data type
+        domain_count (int): Number of domains in the attribute
+        by_value_cost (float): Seconds per single domain set by value, or None if not measured
+        foreach_cost (float): Seconds per each domain in the attribute with foreach_get/foreach_set, or None if not measured
+    """
+    model = etc.get_set_algo_cost_model()
+    key = get_set_algo_cost_model_key(data_type, domain_count)
+    entry = model.setdefault(key, {'by_value_cost': 0.0, 'by_value_samples': 0, 'foreach_cost': 0.0, 'foreach_samples': 0})
+
+    b_changed = False
+    for name, cost in [('by_value', by_value_cost), ('foreach', foreach_cost)]:
+        if cost is None or entry[f'{name}_samples'] >= SET_ALGO_CALIBRATION_MAX_SAMPLES:
+            continue
+        n = entry[f'{name}_samples']
+        entry[f'{name}_cost'] = (entry[f'{name}_cost'] * n + cost) / (n + 1)
+        entry[f'{name}_samples'] = n + 1
+        b_changed = True
+    
+    if not b_changed:
+        return
+
+    etc.log(record_set_attribute_values_costs, f"{key}: {entry}", etc.ELogLevel.VERBOSE)
+    etc.save_set_algo_cost_model(model)
+
 def set_attribute_values(attribute, value, sel_domain_indexes = [], 
                          b_foreach_compatible_value_list = False, 
                          bugbypass_data_type = "", bugbypass_domain = ""):
@@ -401,7 +1920,7 @@ def set_attribute_values(attribute, value, sel_domain_indexes = [],
     Args:
         attribute (Reference): Reference to the attribute
         value (list or value): The single value to set to all domains, or a list of values to set to each domain (Length has to match object domains count). Tuples are considered a single value, for use with vector attributes.
-        on_indexes (list, optional): Indexes to set the value on. Defaults to []. Duplicates WILL NOT be checked, and rewritten, wasting resources
+        on_indexes (list or SelectionMask, optional): Indexes to set the value on. Defaults to []. Duplicates WILL NOT be checked, and rewritten, wasting resources
         flat_list (bool, optional): Only for setting ALL values. Used in case when the target accepts vector values (tuples), but the input list is single dimension eg. [3,3,3] instead of [(3,3,3)]. Defaults to False.
         bugbypass_data_type (str, optional): If the console returns "current value '0' matches no enum in 'ByteIntAttribute', '', 'data_type'" specify the string of the data type
         bugbypass_domain (str, optional): If the console returns "current value '0' matches no enum in 'ByteIntAttribute', '', 'data_type'" specify the string of the domain
@@ -427,11 +1946,19 @@ def set_attribute_values(attribute, value, sel_domain_indexes = [],
     all just foreach set
 
     setattr is noticeably slower
+
+    The crossover point is now measured on first use for each data type and domain count,
+    see get_set_attribute_values_strategy(). set_algo_tweak is used if that is disabled.
     """
 
     if value is None:
         raise etc.MeshDataWriteException("set_attribute_values", f"Input value is NONE")
 
+    # Masks have their own path
+    if isinstance(sel_domain_indexes, SelectionMask):
+        set_attribute_values_by_mask(attribute, value, sel_domain_indexes.mask, bugbypass_data_type)
+        return
+
     # Is it a single value or a list of values to set
     b_list_of_values_input = type(value) in [list, np.ndarray]
 
@@ -448,10 +1975,24 @@ def set_attribute_values(attribute, value, sel_domain_indexes = [],
     
     attribute_data_type = attribute.data_type if bugbypass_data_type == '' else bugbypass_data_type
     attribute_domain = attribute.domain if bugbypass_domain == '' else bugbypass_domain
+
+    # Mesh data is not synchronized in edit mode, set the values on BMesh instead
+    if is_edit_mode_bmesh_supported(attribute.id_data, attribute_data_type, attribute.name, attribute_domain):
+        if b_foreach_compatible_value_list:
+            value = np.asarray(value).reshape((-1,) + get_attribute_buffer_layout(attribute_data_type).buffer_shape)
+        set_bmesh_attribute_values(attribute.id_data, attribute.name, attribute_domain, attribute_data_type, value, sel_domain_indexes if len(sel_domain_indexes) else None)
+        return
+
+    # Strings do not support foreach_set, set only the changed ones by value
+    if attribute_data_type == 'STRING':
+        set_string_attribute_values(attribute, value, sel_domain_indexes, attribute_data_type)
+        return
+
+    invalidate_attribute_read_cache(attribute.id_data, attribute.name)
     
     # Case 1: overwrite all
     # Note: Strings do not support FOREACH_SET
-    if (len(sel_domain_indexes) == 0 or len(sel_domain_indexes) == len(attribute.data)) and attribute_data_type != 'STRING' :
+    if (len(sel_domain_indexes) == 0 or len(sel_domain_indexes) == len(attribute.data)) and is_foreach_supported(attribute_data_type):
     
         etc.log(set_attribute_values, f"Using foreach_set (overwrite all)", etc.ELogLevel.VERBOSE)
         try:
@@ -460,97 +2001,170 @@ def set_attribute_values(attribute, value, sel_domain_indexes = [],
             log_val_len = 1
         etc.log(set_attribute_values, f"Setting {attribute.name} attribute values for each domain. Expected data length {len(attribute.data)}, input data length {log_val_len}. Input value type {type(value)}", etc.ELogLevel.VERBOSE)
 
-        # Get property name to use with foreach_set 
-        prop_name = get_attribute_value_propname(data_type=attribute_data_type)
-
         # Create storage to use with foreach_set
         
         # Set the values directly
         if b_foreach_compatible_value_list:
             storage = value
 
-        # a: The values are vector values in a list-alike container, flatten it first
+        # a: The values are in a list-alike container, it will be flattened on write
         elif type(value) in [list, np.ndarray]:
             if len(value) != len(attribute.data):
                 raise etc.MeshDataWriteException("set_attribute_values", f"Invalid input value data length. Input {len(value)}, expected {len(attribute.data)}")
-            
-            # convert to single dimension list if of vector type
-            if attribute_data_type in ['FLOAT_VECTOR', 'FLOAT2', 'FLOAT_COLOR', 'BYTE_COLOR', 'INT32_2D', 'QUATERNION', 'FLOAT4X4']:
-                storage = np.array(value).flatten()
-            else:
-                storage = value
+            storage = value
             
         # b: This is a single value, duplicate it for each domain
         else:
-            storage = np.tile(value, len(attribute.data))
+            layout = get_attribute_buffer_layout(attribute_data_type)
+            with scratch_buffer(layout.buffer_dtype, len(attribute.data) * layout.buffer_components) as storage:
+                shaped_storage = shape_attribute_buffer(storage, attribute_data_type)
+                shaped_storage[:] = np.asarray(value, dtype=storage.dtype).reshape(shaped_storage.shape[1:])
+                write_attribute_buffer(attribute, storage, attribute_data_type)
+            return
         
         if etc.get_preferences_attrib("en_slow_logging_ops"):
             etc.log(set_attribute_values, f"Internal array ({len(storage)}): {storage}", etc.ELogLevel.SUPER_VERBOSE)
 
-        attribute.data.foreach_set(prop_name, storage)
-    
-    # Case 2: On selected indexes
-    else:
-        etc.log(set_attribute_values, f"Setting {attribute.name} attribute values for {len(sel_domain_indexes)} domains.", etc.ELogLevel.VERBOSE)
-        prop = get_attribute_value_propname(data_type=attribute_data_type)
-        
-        # Method 1: FOREACH_GET_FOREACH_SET (for > 25%)
-        # Slower for smaller selections, faster for larger selections
-        # Note: Strings do not support FOREACH_SET
-        use_foreach_get_threshold = etc.get_preferences_attrib('set_algo_tweak')
-        
-        if (# If the selection length is larger than a threshold in foreach_get_threshold (percent)
-            len(sel_domain_indexes) > len(attribute.data)*use_foreach_get_threshold 
-            # Data type is not string
-            and attribute_data_type != 'STRING' 
-            # Preferences do not force setting by value
-            and not etc.get_preferences_attrib('force_assign_on_selected_by_value')) or(
-            # Or preferences do force usage of this method
-            etc.get_preferences_attrib('force_assign_on_selected_by_foreach_get_foreach_set')
-            ):
+        write_attribute_buffer(attribute, storage, attribute_data_type)
+    
+    # Case 2: On selected indexes
+    else:
+        etc.log(set_attribute_values, f"Setting {attribute.name} attribute values for {len(sel_domain_indexes)} domains.", etc.ELogLevel.VERBOSE)
+        prop = get_attribute_value_propname(data_type=attribute_data_type)
+        
+        if b_list_of_values_input and len(value) < len(sel_domain_indexes):
+            raise etc.MeshDataWriteException("set_attribute_values", f"Value input list is shorter [{len(value)}] than index list that the values are supposed to be set on [{len(sel_domain_indexes)}]")
+
+        # Method 1: FOREACH_GET_FOREACH_SET
+        # Slower for smaller selections, faster for larger selections
+        # Note: Strings do not support FOREACH_SET
+        def set_by_foreach(indexes):
+            etc.log(set_attribute_values, f"Using foreach_set (on selected indexes)", etc.ELogLevel.VERBOSE)
+
+            # Scatter into (N,) or (N, components) view of the buffer
+            layout = get_attribute_buffer_layout(attribute_data_type)
+            with scratch_buffer(layout.buffer_dtype, len(attribute.data) * layout.buffer_components) as buffer:
+                storage = read_attribute_buffer(attribute, attribute_data_type, buffer=buffer)
+                indexes = np.asarray(indexes, dtype=np.int64)
+                if b_list_of_values_input:
+                    storage[indexes] = np.asarray(value[:len(indexes)], dtype=storage.dtype).reshape((len(indexes),) + storage.shape[1:])
+                else:
+                    storage[indexes] = np.asarray(value, dtype=storage.dtype).reshape(storage.shape[1:])
+                write_attribute_buffer(attribute, buffer, attribute_data_type)
+
+        # Method 2: For loop
+        # Slower for larger selections, faster for smaller selections
+        def set_by_value(indexes):
+            etc.log(set_attribute_values, "Using assign by value", etc.ELogLevel.VERBOSE)
+
+            single_value = value
+            values = value
+
+            # Matrices are assigned as nested rows, accept flat 16 value or (4,4) inputs
+            buffer_shape = static_data.attribute_data_types[attribute_data_type].buffer_shape
+            if len(buffer_shape) > 1:
+                if b_list_of_values_input:
+                    values = np.asarray(value[:len(indexes)], dtype=np.float64).reshape((len(indexes),) + buffer_shape).tolist()
+                else:
+                    single_value = np.asarray(value, dtype=np.float64).reshape(buffer_shape).tolist()
+            
+            # Assigning by value, to .value .vector or .color
+            for i, id in enumerate(indexes):
+                setattr(attribute.data[id], prop, values[i] if b_list_of_values_input else single_value)
+
+        strategy = get_set_attribute_values_strategy(attribute_data_type, len(attribute.data), len(sel_domain_indexes))
+        etc.log(set_attribute_values, f"Strategy: {strategy}", etc.ELogLevel.VERBOSE)
+
+        # Keep refining the cost model while it has less samples than needed
+        b_measure = (is_foreach_supported(attribute_data_type) 
+                     and etc.get_preferences_attrib('set_algo_adaptive') 
+                     and len(attribute.data) >= SET_ALGO_CALIBRATION_MIN_DOMAINS)
+        
+        if strategy == 'FOREACH':
+            t = time.perf_counter()
+            set_by_foreach(sel_domain_indexes)
+            if b_measure:
+                record_set_attribute_values_costs(attribute_data_type, len(attribute.data), None, (time.perf_counter() - t) / len(attribute.data))
+        elif strategy == 'BY_VALUE':
+            t = time.perf_counter()
+            set_by_value(sel_domain_indexes)
+            if b_measure:
+                record_set_attribute_values_costs(attribute_data_type, len(attribute.data), (time.perf_counter() - t) / len(sel_domain_indexes), None)
+        
+        # Not calibrated yet: measure by value on a small probe, then set all with foreach.
+        # The probe values are overwritten with the same values, so the result does not change.
+        else:
+            probe_len = min(len(sel_domain_indexes), SET_ALGO_CALIBRATION_PROBE_LENGTH)
+            t = time.perf_counter()
+            set_by_value(sel_domain_indexes[:probe_len])
+            by_value_cost = (time.perf_counter() - t) / probe_len
+
+            t = time.perf_counter()
+            set_by_foreach(sel_domain_indexes)
+            foreach_cost = (time.perf_counter() - t) / len(attribute.data)
+
+            record_set_attribute_values_costs(attribute_data_type, len(attribute.data), by_value_cost, foreach_cost)
+                          
+def set_attribute_values_by_mask(attribute, value, mask, bugbypass_data_type = ""):
+    """Sets attribute values on domains selected by a boolean mask. Accepts both lists and single values.
+    WARNING: OBJECT MODE REQUIRED
+
+    Args:
+        attribute (Reference): Reference to the attribute
+        value (list or value): The single value to set to all masked domains, or a list of values for each masked domain in ascending index order. A list with the length of the whole domain is also accepted, only masked entries are then used.
+        mask (np.ndarray): Boolean array of attribute domain length, True for domains to set the value on
+        bugbypass_data_type (str, optional): See set_attribute_values
+
+    Raises:
+        etc.MeshDataWriteException: On failure
+    """
 
-            etc.log(set_attribute_values, f"Using foreach_set (on selected indexes)", etc.ELogLevel.VERBOSE)
-            prop_name = get_attribute_value_propname(data_type=attribute_data_type)
-            
-            if b_list_of_values_input and len(value) < len(sel_domain_indexes):
-                raise etc.MeshDataWriteException("set_attribute_values", f"Value input list is shorter [{len(value)}] than index list that the values are supposed to be set on [{len(sel_domain_indexes)}]")
+    if value is None:
+        raise etc.MeshDataWriteException("set_attribute_values_by_mask", f"Input value is NONE")
 
-            example_attribute_domain_value = value[0] if b_list_of_values_input else value
-            storage = np.repeat(example_attribute_domain_value, len(attribute.data))
-            attribute.data.foreach_get(prop_name, storage)
-            
-            if type(example_attribute_domain_value) in [tuple, list, np.ndarray]:
-                for i, id in enumerate(sel_domain_indexes):
-                    for l in range(0, len(example_attribute_domain_value)):
-                        storage[id*len(example_attribute_domain_value)+l] = value[i][l] if b_list_of_values_input else value[l]
-            else:
-                for i, id in enumerate(sel_domain_indexes):
-                    storage[id] = value[i] if b_list_of_values_input else value
-            attribute.data.foreach_set(prop_name, storage)
+    mask = np.asarray(mask, dtype=bool)
+    attribute_data_type = attribute.data_type if bugbypass_data_type == '' else bugbypass_data_type
+    
+    # Mesh data is not synchronized in edit mode, set the values on BMesh instead
+    if is_edit_mode_bmesh_supported(attribute.id_data, attribute_data_type, attribute.name, attribute.domain):
+        count = np.count_nonzero(mask)
+        if type(value) in [list, np.ndarray] and len(value) == len(mask) and count != len(mask):
+            value = [v for v, m in zip(value, mask) if m]
+        set_bmesh_attribute_values(attribute.id_data, attribute.name, attribute.domain, attribute_data_type, value, np.flatnonzero(mask))
+        return
+
+    if len(mask) != len(attribute.data):
+        raise etc.MeshDataWriteException("set_attribute_values_by_mask", f"Invalid mask length. Input {len(mask)}, expected {len(attribute.data)}")
+    
+    b_list_of_values_input = type(value) in [list, np.ndarray]
+    count = np.count_nonzero(mask)
 
-        # Method 2: For loop for < 25% mesh selected
-        # Slower for larger selections, faster for smaller selections
+    etc.log(set_attribute_values_by_mask, f"Setting {attribute.name} attribute values for {count} masked domains.", etc.ELogLevel.VERBOSE)
+
+    if count == 0:
+        return
+    
+    # Whole domain length list, pick masked only
+    if b_list_of_values_input and len(value) == len(mask) and count != len(mask):
+        value = np.asarray(value)[mask] if attribute_data_type != 'STRING' else [v for v, m in zip(value, mask) if m]
+    
+    if b_list_of_values_input and len(value) < count:
+        raise etc.MeshDataWriteException("set_attribute_values_by_mask", f"Value input list is shorter [{len(value)}] than the number of masked domains [{count}]")
+    
+    # Strings do not support foreach_set, small masks are faster to set by value
+    if get_set_attribute_values_strategy(attribute_data_type, len(mask), count) != 'FOREACH':
+        set_attribute_values(attribute, value, np.flatnonzero(mask), bugbypass_data_type=bugbypass_data_type)
+        return
+
+    layout = get_attribute_buffer_layout(attribute_data_type)
+    with scratch_buffer(layout.buffer_dtype, len(attribute.data) * layout.buffer_components) as buffer:
+        storage = read_attribute_buffer(attribute, attribute_data_type, buffer=buffer)
+        if b_list_of_values_input:
+            storage[mask] = np.asarray(value[:count], dtype=storage.dtype).reshape((count,) + storage.shape[1:])
         else:
-            etc.log(set_attribute_values, "Using assign by value", etc.ELogLevel.VERBOSE)
+            storage[mask] = np.asarray(value, dtype=storage.dtype).reshape(storage.shape[1:])
+        write_attribute_buffer(attribute, buffer, attribute_data_type)
 
-            # If the attribute data type is FLOAT4X4, it needs to be adjusted
-            if attribute_data_type == 'FLOAT4X4':
-                fixed_value = []
-                for i in range(0,4):
-                    fixed_value.append((value[i*4], value[i*4+1], value[i*4+2], value[i*4+3]))
-                value = tuple(fixed_value)
-            
-            # Assigning by value
-            if prop == "vector":
-                for i, id in enumerate(sel_domain_indexes):
-                    attribute.data[id].vector = value[i] if b_list_of_values_input else value
-            elif prop == "color":
-                for i, id in enumerate(sel_domain_indexes):
-                    attribute.data[id].color = value[i] if b_list_of_values_input else value
-            else: # "value"
-                for i, id in enumerate(sel_domain_indexes):
-                    attribute.data[id].value = value[i] if b_list_of_values_input else value
-                          
 def set_attribute_value_on_selection(self, context, obj, attribute, value, face_corner_spill = False):
     """Assigns a single value to all selected domains in edit mode.
 
@@ -572,9 +2186,9 @@ def set_attribute_value_on_selection(self, context, obj, attribute, value, face_
     etc.log(set_attribute_value_on_selection, f"Working on {active_attrib_name} attribute, {obj.name}", etc.ELogLevel.VERBOSE)
 
     # Get selection in edit mode, on attribute domain
-    selected_el = get_mesh_selected_domain_indexes(obj, active_attrib.domain, face_corner_spill)
+    selected_el = get_mesh_selection_mask(obj, active_attrib.domain, face_corner_spill)
 
-    if not len(selected_el):
+    if not selected_el.any():
         self.report({'ERROR'}, "Invalid selection or no selection")
         return False
     
@@ -584,7 +2198,7 @@ def set_attribute_value_on_selection(self, context, obj, attribute, value, face_
     a_vals = get_attribute_values(attribute, obj) if etc.is_full_logging_enabled() else "*skipped*"
     
     etc.log(set_attribute_value_on_selection, f"Attribute data length: {len(active_attrib.data)}"\
-            f"Selected domains: [{len(selected_el)} total] - {selected_el}"\
+            f"Selected domains: [{selected_el.count()} total] - {selected_el.to_indexes()}"\
                 f"Setting value: {value}"\
                 f"Pre-set values:\n{str(a_vals)}", etc.ELogLevel.SUPER_VERBOSE)
 
@@ -637,6 +2251,208 @@ def convert_attribute(self, obj, attrib_name, mode, domain, data_type):
     else:
         raise etc.MeshDataWriteException('convert_attribute', f"{attrib_name} attribute is None?")
 
+class AttributeWriteTransaction():
+    """Queues attribute removals, creations and value writes, and applies them back-to-back with a single update() call per mesh.
+    Attributes are resolved by name on commit, as references get invalidated when other attributes are created or removed.
+    WARNING: OBJECT MODE REQUIRED
+
+    Usage:
+        with func.AttributeWriteTransaction() as transaction:
+            i = transaction.create(obj, "New", 'FLOAT', 'POINT', values)
+            transaction.write(obj, "Existing", values)
+        name = transaction.created_names[i]
+    """
+
+    def __init__(self):
+        self.removals = []          # (mesh, attribute name)
+        self.creations = []         # (mesh, attribute name, data type, domain)
+        self.writes = []            # (mesh, attribute name or None, creation index or None, value, selected indexes, data type, domain)
+        self.meshes = []            # Meshes to update on commit
+        self.created_names = []     # Names of created attributes, in creation order. Blender might rename them if the name is taken.
+        self.b_committed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Do not write anything if it failed while queueing
+        if exc_type is None:
+            self.commit()
+        return False
+
+    def _add_mesh(self, obj):
+        if obj.data not in self.meshes:
+            self.meshes.append(obj.data)
+        return obj.data
+
+    def remove(self, obj, name:str):
+        """Queues removal of an attribute. Removals are done first on commit.
+
+        Args:
+            obj (Reference): 3D Object Reference
+            name (str): Attribute name
+        """
+        self.removals.append((self._add_mesh(obj), name))
+
+    def create(self, obj, name:str, data_type:str, domain:str, value = None):
+        """Queues creation of an attribute, optionally with the values to write to it.
+
+        Args:
+            obj (Reference): 3D Object Reference
+            name (str): Attribute name
+            data_type (str): Attribute data type
+            domain (str): Attribute domain
+            value (list or value, optional): See set_attribute_values. Defaults to None, not writing anything.
+
+        Returns:
+            int: Index in created_names to read the name of the created attribute after commit
+        """
+        mesh = self._add_mesh(obj)
+        self.creations.append((mesh, name, data_type, domain))
+        if value is not None:
+            self.writes.append((mesh, None, len(self.creations) - 1, value, [], data_type, domain))
+        return len(self.creations) - 1
+    
+    def write(self, obj, name:str, value, sel_domain_indexes = []):
+        """Queues a write to existing attribute
+
+        Args:
+            obj (Reference): 3D Object Reference
+            name (str): Attribute name
+            value (list or value): See set_attribute_values
+            sel_domain_indexes (list, optional): See set_attribute_values. Defaults to [].
+        """
+        self.writes.append((self._add_mesh(obj), name, None, value, sel_domain_indexes, '', ''))
+
+    def commit(self):
+        """Applies all queued operations and updates each modified mesh once
+
+        Raises:
+            etc.MeshDataWriteException: If committed twice
+        """
+        if self.b_committed:
+            raise etc.MeshDataWriteException("AttributeWriteTransaction.commit", "Transaction already committed")
+        self.b_committed = True
+
+        etc.log(AttributeWriteTransaction, f"Committing {len(self.removals)} removals, {len(self.creations)} creations, {len(self.writes)} writes on {len(self.meshes)} meshes", etc.ELogLevel.VERBOSE)
+
+        for mesh, name in self.removals:
+            if name in mesh.attributes:
+                mesh.attributes.remove(mesh.attributes[name])
+        
+        for mesh, name, data_type, domain in self.creations:
+            self.created_names.append(mesh.attributes.new(name=name, type=data_type, domain=domain).name)
+        
+        # Blender might not update the data about domains and data types of new attributes fast enough 
+        # to be accessible via .data_type and .domain, so they are passed through manually
+        for mesh, name, creation_index, value, sel_domain_indexes, data_type, domain in self.writes:
+            if creation_index is not None:
+                name = self.created_names[creation_index]
+            set_attribute_values(mesh.attributes[name], value, sel_domain_indexes, bugbypass_data_type=data_type, bugbypass_domain=domain)
+
+        for mesh in self.meshes:
+            invalidate_attribute_read_cache(mesh)
+            mesh.update()
+
+class AttributeArray():
+    """Lazy numpy view of attribute values. Values are read with a single foreach_get on first access, 
+    modifications done with item assignment are tracked per domain and written back with a single foreach_set on commit().
+    Read-only access never copies the values, the cached snapshot is used until the first modification.
+    In edit mode the values are read from and written to the BMesh, if the data type is supported, see is_edit_mode_bmesh_supported().
+    Otherwise object mode is required.
+
+    Usage:
+        values = func.AttributeArray(attribute)
+        values[mask] = -values[mask]
+        values.commit()
+    """
+
+    def __init__(self, attribute, data_type:str = ''):
+        """
+        Args:
+            attribute (Reference): Attribute reference
+            data_type (str, optional): Data type override, for bug bypasses. Defaults to attribute.data_type.
+        """
+        # Store the name instead of the reference, the reference might get invalidated
+        self.mesh = attribute.id_data
+        self.name = attribute.name
+        self.data_type = attribute.data_type if data_type == '' else data_type
+        self.domain = attribute.domain
+        self.edit_mode_bmesh = is_edit_mode_bmesh_supported(self.mesh, self.data_type, self.name, self.domain)
+        self.length = get_bmesh_domain_size(self.mesh, self.domain) if self.edit_mode_bmesh else len(attribute.data)
+        self._values = None
+        self._dirty = None
+
+    @property
+    def attribute(self):
+        return self.mesh.attributes[self.name]
+
+    @property
+    def values(self):
+        """Attribute values as (N,) or (N, components) numpy array. Modifications of this array are not tracked, use item assignment or mark_dirty().
+        """
+        if self._values is None:
+            self._values = get_attribute_values_cached(self.attribute)
+            etc.log(AttributeArray, f"Read {self.name} values", etc.ELogLevel.VERBOSE)
+        if not self._values.flags.writeable:
+            self._values = self._values.copy()
+        return self._values
+
+    @property
+    def is_dirty(self):
+        return self._dirty is not None and bool(self._dirty.any())
+    
+    @property
+    def dirty_mask(self):
+        """Boolean array of domain length, True for modified domains
+        """
+        return self._dirty.copy() if self._dirty is not None else np.zeros(self.length, dtype=bool)
+
+    def __len__(self):
+        return self.length
+    
+    def __array__(self, dtype = None, copy = None):
+        if self._values is None:
+            self._values = get_attribute_values_cached(self.attribute)
+        return self._values if dtype is None else self._values.astype(dtype)
+
+    def __getitem__(self, key):
+        return np.asarray(self)[key]
+
+    def __setitem__(self, key, value):
+        self.values[key] = value
+        self.mark_dirty(key[0] if isinstance(key, tuple) else key)
+
+    def mark_dirty(self, key = slice(None)):
+        """Marks domains as modified, to be written on commit
+
+        Args:
+            key (slice, int, list, np.ndarray, optional): Domain index, slice, index list or boolean mask. Defaults to all.
+        """
+        if self._dirty is None:
+            self._dirty = np.zeros(self.length, dtype=bool)
+        self._dirty[key] = True
+
+    def commit(self):
+        """Writes modified values back to the attribute. Written with single foreach_set if it is faster,
+        otherwise only modified domains are set by value (eg. strings or small selections).
+        """
+        if not self.is_dirty:
+            return
+        
+        dirty_count = np.count_nonzero(self._dirty)
+        etc.log(AttributeArray, f"Writing {dirty_count} modified values of {self.name}", etc.ELogLevel.VERBOSE)
+
+        if self.edit_mode_bmesh:
+            set_bmesh_attribute_values(self.mesh, self.name, self.domain, self.data_type, self._values[self._dirty], np.flatnonzero(self._dirty))
+        
+        # All values are already read, so only foreach_set is needed, unlike in set_attribute_values 
+        elif is_foreach_supported(self.data_type) and get_set_attribute_values_strategy(self.data_type, self.length, dirty_count) != 'BY_VALUE':
+            write_attribute_buffer(self.attribute, self._values, self.data_type)
+        else:
+            set_attribute_values(self.attribute, self._values[self._dirty], np.flatnonzero(self._dirty), bugbypass_data_type=self.data_type)
+        self._dirty = None
+
 # Object related
 # ------------------------------------------
 
@@ -696,8 +2512,99 @@ def set_object_by_user_as_active_back(self, context):
 
 # get
 
+def get_domain_size(obj, domain:str):
+    """Gets the number of elements in a domain of an object, eg. vertex count for POINT domain of a mesh
+
+    Args:
+        obj (Reference): 3D Object Reference
+        domain (str): Attribute domain
+
+    Raises:
+        etc.MeshDataReadException: If the domain or object type is unsupported
+
+    Returns:
+        int: Number of elements
+    """
+    if obj.type == 'MESH':
+        if is_edit_mode_bmesh_supported(obj.data):
+            return get_bmesh_domain_size(obj.data, domain)
+        elif domain == 'POINT':
+            return len(obj.data.vertices)
+        elif domain == 'EDGE':
+            return len(obj.data.edges)
+        elif domain == 'FACE':
+            return len(obj.data.polygons)
+        elif domain == 'CORNER':
+            return len(obj.data.loops)
+    elif obj.type == 'CURVES':
+        if domain == 'POINT':
+            return len(obj.data.points)
+        elif domain == 'CURVE':
+            return len(obj.data.curves)
+    elif obj.type == 'POINTCLOUD':
+        if domain == 'POINT':
+            return len(obj.data.points)
+    
+    raise etc.MeshDataReadException('get_domain_size', f"Domain {domain} of {obj.type} object is not supported")
+
 def get_mesh_selected_domain_indexes(obj, domain, spill=False):
     """Gets the indexes of selected domain entries in edit mode. (Vertices, edges, faces or Face Corners)
+    See get_mesh_selection_mask()
+
+    Args:
+        obj (Reference): 3D Object Reference
+        domain (str): Mesh Domain
+        spill (bool, optional): Enables selection spilling to nearby face corners from selected verts/faces/edges. Defaults to False.
+
+    Raises:
+        etc.MeshDataReadException: If domain is unsupported
+
+    Returns:
+        np.ndarray: Indexes, ascending
+    """
+    return get_mesh_selection_mask(obj, domain, spill).to_indexes()
+
+def get_mesh_selection_mask(obj, domain, spill=False):
+    """Gets the mask of selected domain entries in edit mode. (Vertices, edges, faces or Face Corners)
+    Face corner selection of meshes is derived from selection of other domains, it is cached until the selection changes.
+    Returned mask is read-only.
+
+    Args:
+        obj (Reference): 3D Object Reference
+        domain (str): Mesh Domain
+        spill (bool, optional): Enables selection spilling to nearby face corners from selected verts/faces/edges. Defaults to False.
+
+    Raises:
+        etc.MeshDataReadException: If domain is unsupported
+
+    Returns:
+        SelectionMask: Selected elements of the domain
+    """
+
+    # Other domains are read directly, as fast as the fingerprint
+    if obj.type != 'MESH' or domain != 'CORNER':
+        return derive_mesh_selection_mask(obj, domain, spill)
+    
+    key = get_selection_cache_key(obj.data, domain, spill)
+    fingerprint = get_mesh_selection_fingerprint(obj.data)
+    entry = SELECTION_CACHE.get(key, None)
+    if entry is not None and entry[0] == fingerprint:
+        SELECTION_CACHE.move_to_end(key)
+        etc.log(get_mesh_selection_mask, f"Using cached {domain} selection of {obj.data.name}", etc.ELogLevel.VERBOSE)
+        return entry[1]
+    
+    selection = derive_mesh_selection_mask(obj, domain, spill)
+    selection.mask.flags.writeable = False
+
+    SELECTION_CACHE[key] = (fingerprint, selection)
+    SELECTION_CACHE.move_to_end(key)
+    while len(SELECTION_CACHE) > SELECTION_CACHE_MAX_ENTRIES:
+        SELECTION_CACHE.popitem(last=False)
+    return selection
+
+def derive_mesh_selection_mask(obj, domain, spill=False):
+    """Gets the mask of selected domain entries in edit mode. (Vertices, edges, faces or Face Corners), without the cache. 
+    See get_mesh_selection_mask()
 
     Args:
         obj (Reference): 3D Object Reference
@@ -708,176 +2615,112 @@ def get_mesh_selected_domain_indexes(obj, domain, spill=False):
         etc.MeshDataReadException: If domain is unsupported
 
     Returns:
-        list: List of indexes
+        SelectionMask: Selected elements of the domain
     """
 
+    # Mesh data is not synchronized in edit mode
+    if obj.type == 'MESH' and is_edit_mode_bmesh_supported(obj.data):
+        return get_bmesh_selection_mask(obj.data, domain, spill)
+
     if domain == 'POINT': 
         if obj.type == 'MESH':
-            storage = np.zeros(len(obj.data.vertices), dtype=bool)
+            storage = np.empty(len(obj.data.vertices), dtype=bool)
             obj.data.vertices.foreach_get('select', storage)
-            return np.arange(0, len(obj.data.vertices))[storage]
+            return SelectionMask(storage, domain)
         
         elif obj.type == 'CURVES':
             if '.selection' in obj.data.attributes:
-                
                 # Selection attribute can be in point domain or curve domain, depending on edit mode interaction mode
-                # Point to point
-                if obj.data.attributes['.selection'].domain == 'POINT':
-                    storage = np.zeros(len(obj.data.points), dtype=bool)
-                    obj.data.attributes['.selection'].data.foreach_get('value', storage)
-                    if etc.is_full_logging_enabled():
-                        etc.log(get_mesh_selected_domain_indexes, f"Selected curve point IDs: {np.arange(0, len(obj.data.points))[storage]}", etc.ELogLevel.SUPER_VERBOSE)
-                    return np.arange(0, len(obj.data.points))[storage]
-                
-                # Curve to point
-                else:
-                    selected_splines = get_mesh_selected_domain_indexes(obj, 'CURVE')
-                    point_ids = []
-                    for s_id in selected_splines:
-                        for point in obj.data.curves[s_id].points:
-                            point_ids.append(point.index)
-        
-                    return np.arange(0, len(obj.data.points))[point_ids]
+                selection = SelectionMask(get_curves_selection_mask(obj.data, 'POINT'), domain)
+                if etc.is_full_logging_enabled():
+                    etc.log(derive_mesh_selection_mask, f"Selected curve point IDs: {selection.to_indexes()}", etc.ELogLevel.SUPER_VERBOSE)
+                return selection
             
             else:
-                return []
+                return SelectionMask.none(len(obj.data.points), domain)
 
         
         else:
-            raise etc.MeshDataReadException('get_mesh_selected_domain_indexes', f'The {obj.type} object type is not supported')
+            raise etc.MeshDataReadException('get_mesh_selection_mask', f'The {obj.type} object type is not supported')
         
     elif domain == 'EDGE': 
-        storage = np.zeros(len(obj.data.edges), dtype=bool)
+        storage = np.empty(len(obj.data.edges), dtype=bool)
         obj.data.edges.foreach_get('select', storage)
-        return np.arange(0, len(obj.data.edges))[storage]
+        return SelectionMask(storage, domain)
     
     elif domain == 'FACE': 
-        storage = np.zeros(len(obj.data.polygons), dtype=bool)
+        storage = np.empty(len(obj.data.polygons), dtype=bool)
         obj.data.polygons.foreach_get('select', storage)
-        return np.arange(0, len(obj.data.polygons))[storage]
+        return SelectionMask(storage, domain)
     
     elif domain == 'CURVE': 
 
         # As of 4.2 alpha selection of curves is invisble, but possible
         if '.selection' in obj.data.attributes:
-
-            # If selection is on points, convert it to curves
-            if obj.data.attributes['.selection'].domain == 'POINT':
-                selected_points = get_mesh_selected_domain_indexes(obj, 'POINT')
-                selected_curve_ids = []
-                for curve in obj.data.curves:
-                    for point in curve.points:
-                        if point.index in selected_points:
-                            selected_curve_ids.append(curve.index)
-                            break
-                if etc.is_full_logging_enabled():
-                    etc.log(get_mesh_selected_domain_indexes, f"Selected curve IDs: {selected_curve_ids}", etc.ELogLevel.SUPER_VERBOSE)
-                return selected_curve_ids
-
-            # If seletion is on curves, just return it
-            else:
-                storage = np.zeros(len(obj.data.curves), dtype=bool)
-                obj.data.attributes['.selection'].data.foreach_get('value', storage)
-                return np.arange(0, len(obj.data.curves))[storage]
+            # If selection is on points, a curve is selected if any of its points is
+            selection = SelectionMask(get_curves_selection_mask(obj.data, 'CURVE'), domain)
+            if etc.is_full_logging_enabled():
+                etc.log(derive_mesh_selection_mask, f"Selected curve IDs: {selection.to_indexes()}", etc.ELogLevel.SUPER_VERBOSE)
+            return selection
                 
         else:
-            return []
+            return SelectionMask.none(len(obj.data.curves), domain)
 
 
     elif domain == 'CORNER': 
         # boneless chicken 
         if spill: 
-            # Get selected verts ids
-            storage = np.zeros(len(obj.data.vertices), dtype=bool)
-            obj.data.vertices.foreach_get('select', storage)
-            sel_verts = np.arange(0, len(obj.data.vertices))[storage]
-            
-            # Get loop assigned verts
-            storage = np.zeros(len(obj.data.loops), dtype=int)
-            obj.data.loops.foreach_get('vertex_index', storage)
-
             # Get the loops with the selected verts
-            return np.arange(0, len(obj.data.loops))[np.isin(storage, sel_verts)]
+            return get_mesh_selection_mask(obj, 'POINT').to_domain(obj, domain)
 
         else:
             mesh_selected_modes = bpy.context.scene.tool_settings.mesh_select_mode
-            result = [] # ???
             
             # Case: User wants to assign faces
             if mesh_selected_modes[2]: # faces
-
-                # Get selected faces
-                face_select = np.zeros(len(obj.data.polygons), dtype=bool)
-                obj.data.polygons.foreach_get('select', face_select)
-                
-                # Get face loop indexes
-                #face_loop_start_ids = np.zeros(len(obj.data.polygons), dtype=int)
-                #obj.data.polygons.foreach_get('loop_start', face_loop_indices) # why not?
-
-                face_loop_indices = []
-                for i in np.arange(0, len(obj.data.polygons))[face_select]:
-                    face_loop_indices += obj.data.polygons[i].loop_indices
-                return np.unique(face_loop_indices)#[face_select])
+                # Broadcast through face of each corner, np.repeat of face indexes by loop_total
+                return get_mesh_selection_mask(obj, 'FACE').to_domain(obj, domain)
             
             # Case User wants to select individual face corners by edge selection (detect same for vert selection)
             else:
-                
-                # get selected edges
-                b_sel_edges = np.zeros(len(obj.data.edges), dtype=bool)
-                obj.data.edges.foreach_get('select', b_sel_edges)
-                sel_edges = np.arange(0, len(obj.data.edges))[b_sel_edges]
-                
-                # go away if none selected
-                if not len(sel_edges):
-                    return []
-                
-                # get edge indexes for all loops
-                loops_edge_index = np.zeros(len(obj.data.loops), dtype=int)
-                obj.data.loops.foreach_get('edge_index', loops_edge_index)
+                return SelectionMask(get_corner_mask_bounded_by_selected_edges(obj), domain)
+    
+    else:
+        raise etc.MeshDataReadException('get_mesh_selection_mask', f'The {domain} domain is not supported')
 
-                # get loops that are connected to selected edges
-                loop_ids_of_selected_edges = np.arange(0, len(obj.data.loops))[np.isin(loops_edge_index, sel_edges)]
-                
-                if etc.is_full_logging_enabled():
-                    etc.log(get_mesh_selected_domain_indexes, f"The selection might be one of {loop_ids_of_selected_edges} fcs", etc.ELogLevel.SUPER_VERBOSE)
-                
-                for fc in [obj.data.loops[li] for li in loop_ids_of_selected_edges]:
-                    
-                    # Get face that has this loop
-                    for f in obj.data.polygons:
-                        if fc.index in f.loop_indices:
-                            face = f
-                            break
-                    
-                    if etc.is_full_logging_enabled():
-                        etc.log(get_mesh_selected_domain_indexes, f"Face {face.index} has fc {fc.index}"\
-                       f"Face {face.index} has vts {[v for v in face.vertices]}"\
-                       f"Looking for vert {fc.vertex_index}"\
-                       f"Looking in face {face.index}: {list(obj.data.polygons[face.index].loop_indices)}", etc.ELogLevel.SUPER_VERBOSE)
-
-                    valid_edges = []
-                    for i in obj.data.polygons[face.index].loop_indices:
-                        if b_sel_edges[obj.data.loops[i].edge_index]:
-                            edge = obj.data.edges[obj.data.loops[i].edge_index]
-                            #print(f"{face.index}: has edge with verts {edge.vertices}")
-                            edge_verts = [v for v in edge.vertices]
-
-                            if fc.vertex_index in edge_verts:
-                                valid_edges.append(edge.index)
-                                #print(f"{edge.index} contains the vert of fc")
-                    
-                    # check if at least two of those edges are selected
+def get_corner_mask_bounded_by_selected_edges(obj):
+    """Gets the face corners that have both edges of the face connected to the corner vertex selected.
+    Those are the edge of the corner and the edge of the previous corner in the same face.
 
-                    if len(valid_edges) > 1:
-                        result.append(fc.index)
-                
-                return result
+    Args:
+        obj (Reference): 3D Object Reference, mesh
+
+    Returns:
+        np.ndarray: Boolean mask of face corners
+    """
+    topology = get_mesh_topology(obj.data)
+    with scratch_buffer(bool, len(obj.data.edges)) as b_sel_edges:
+        obj.data.edges.foreach_get('select', b_sel_edges)
+        loop_edge_selected = b_sel_edges[topology.loop_edge]
     
-    else:
-        raise etc.MeshDataReadException('get_mesh_selected_domain_indexes', f'The {domain} domain is not supported')
+    return loop_edge_selected & loop_edge_selected[topology.loop_previous]
 
 def get_filtered_indexes_by_condition(source_data: list, condition:str, compare_value, case_sensitive_string = False, vector_convert_to_srgb= False):
-    """Gets indexes of the list that store values that meet selected condition
+    """Gets indexes of the list that store values that meet selected condition. See get_filtered_mask_by_condition()
+
+    Args:
+        source_data (list): The list with data
+        condition (str): The condition to check
+        compare_value (variable): The value to check the condition with
+        case_sensitive_string (bool, optional): Whether the strings should be compared with case sensitivity or not. Defaults to False.
+        convert_to_srgb (bool, optional): When working with BYTE_COLOR, setting the value might be converted to SRGB colorspace
+    Returns:
+        np.ndarray: Indexes of the list that meet the criteria
+    """
+    return np.flatnonzero(get_filtered_mask_by_condition(source_data, condition, compare_value, case_sensitive_string, vector_convert_to_srgb))
+
+def get_filtered_mask_by_condition(source_data: list, condition:str, compare_value, case_sensitive_string = False, vector_convert_to_srgb= False):
+    """Gets the mask of values in the list that meet selected condition
 
     Currently only one dimensional lists are supported.
 
@@ -888,94 +2731,87 @@ def get_filtered_indexes_by_condition(source_data: list, condition:str, compare_
         case_sensitive_string (bool, optional): Whether the strings should be compared with case sensitivity or not. Defaults to False.
         convert_to_srgb (bool, optional): When working with BYTE_COLOR, setting the value might be converted to SRGB colorspace
     Returns:
-        list: _Indexes of the list that meet the criteria
+        np.ndarray: Boolean mask, True for values that meet the criteria
     """
-        # todo flatten the list or handle vectors somehow
-        # there has to be an easier way, what the hell is this
 
     if vector_convert_to_srgb:
         compare_value = linear_to_srgb(compare_value, False)
 
-    indexes = []
-    etc.log(get_filtered_indexes_by_condition, f"""Get filtered indexes with settings:
+    etc.log(get_filtered_mask_by_condition, f"""Get filtered indexes with settings:
 {condition} to {compare_value}, 
 case sensitive {case_sensitive_string}
 convert compare value to srgb {vector_convert_to_srgb}""", etc.ELogLevel.VERBOSE)
     if etc.get_preferences_attrib("en_slow_logging_ops"):
         if vector_convert_to_srgb:
             srgbs = [linear_to_srgb(i, return_float=False) for i in source_data]
-            etc.log(get_filtered_indexes_by_condition, "on dataset (int) (len {len(source_data)}) {srgbs}", etc.ELogLevel.SUPER_VERBOSE)
+            etc.log(get_filtered_mask_by_condition, "on dataset (int) (len {len(source_data)}) {srgbs}", etc.ELogLevel.SUPER_VERBOSE)
         else:
-            etc.log(get_filtered_indexes_by_condition, f"on dataset (float) (len {len(source_data)}) {source_data}", etc.ELogLevel.SUPER_VERBOSE)
+            etc.log(get_filtered_mask_by_condition, f"on dataset (float) (len {len(source_data)}) {source_data}", etc.ELogLevel.SUPER_VERBOSE)
     else:
-        etc.log(get_filtered_indexes_by_condition, f"dataset *skipped*", etc.ELogLevel.SUPER_VERBOSE)
-
-    #booleans
-    if type(source_data[0]) is bool:
-        for i, data in enumerate(source_data):
-            if condition == "EQ" and data == compare_value:
-                indexes.append(i)
-
-            elif condition == "NEQ" and data != compare_value:
-                indexes.append(i)
-
-    # numeric values & floats invididual vals
-    elif type(source_data[0]) in [int, float, np.int32, np.float32, np.float64]:
-        for i, data in enumerate(source_data):
-            if vector_convert_to_srgb:
-                data = linear_to_srgb(data, False)
-            if condition == "EQ" and data == compare_value: #equal
-                indexes.append(i)
-
-            elif condition == "NEQ" and data != compare_value: # not equal
-                indexes.append(i)
-
-            elif condition == "EQORGR" and data >= compare_value: # >=
-                indexes.append(i)
-
-            elif condition == "EQORLS" and data <= compare_value: # <=
-                indexes.append(i)
-
-            elif condition == "GR" and data > compare_value: # >
-                indexes.append(i)
-
-            elif condition == "LS" and data < compare_value: # <
-                indexes.append(i)
+        etc.log(get_filtered_mask_by_condition, f"dataset *skipped*", etc.ELogLevel.SUPER_VERBOSE)
+
+    if not len(source_data):
+        return np.zeros(0, dtype=bool)
+
+    # Python lists of booleans and numbers are compared as numpy arrays too
+    if type(source_data) is not np.ndarray and type(source_data[0]) in [bool, int, float, np.int32, np.float32, np.float64]:
+        source_data = np.asarray(source_data)
+
+    # numpy arrays, compared in one pass without python objects per element
+    if type(source_data) is np.ndarray and source_data.dtype != object:
+        data = linear_to_srgb_array(source_data, False) if vector_convert_to_srgb else source_data
+
+        if condition == "EQ":
+            mask = data == compare_value
+        elif condition == "NEQ":
+            mask = data != compare_value
+        elif condition == "EQORGR":
+            mask = data >= compare_value
+        elif condition == "EQORLS":
+            mask = data <= compare_value
+        elif condition == "GR":
+            mask = data > compare_value
+        elif condition == "LS":
+            mask = data < compare_value
+        else:
+            raise etc.GenericFunctionParameterError("get_filtered_mask_by_condition", f"Unsupported condition for numeric data: {condition}")
     
-    # strings
+    # strings, compared on the table of unique strings only
     elif type(source_data[0]) == str:
-        for i, data in enumerate(source_data):
-        
-            # case sensitive toggle
-            if not case_sensitive_string:
-                value = data.upper()
-                cmp = compare_value.upper()
-            else:
-                value = data
-                cmp = compare_value
+        categories, codes = encode_strings(source_data)
+        mask = get_string_condition_mask(categories, codes, condition, compare_value, case_sensitive_string)
+    else:
+        raise etc.GenericFunctionParameterError("get_filtered_mask_by_condition", f"Unsupported input data type: {type(source_data[0])}")
 
-            if condition == "EQ" and value == cmp: #equal
-                indexes.append(i)
+    etc.log(get_filtered_mask_by_condition, f"Filtered count: {np.count_nonzero(mask)}", etc.ELogLevel.VERBOSE)
+    return mask
 
-            elif condition == "NEQ" and value != cmp: #not equal
-                indexes.append(i)
-            
-            elif condition == "CONTAINS" and cmp in value: # contains
-                indexes.append(i)
-            
-            elif condition == "STARTS_WITH" and value.startswith(cmp): #equal
-                indexes.append(i)
+def get_mesh_domain_elements(obj, domain):
+    """Gets the collection of mesh domain elements, eg. obj.data.vertices for POINT domain
 
-            elif condition == "ENDS_WITH" and value.endswitch(cmp): #endswith
-                indexes.append(i)
-    else:
-        raise etc.GenericFunctionParameterError("get_filtered_indexes_by_condition", f"Unsupported input data type: {type(source_data[0])}")
+    Args:
+        obj (Reference): 3D Object Reference
+        domain (str): Name of the domain: POINT EDGE FACE CORNER
+
+    Raises:
+        etc.MeshDataReadException: If the domain is unsupported
 
-    etc.log(get_filtered_indexes_by_condition, f"Filtered indexes: {indexes}", etc.ELogLevel.VERBOSE)
-    return indexes
+    Returns:
+        bpy_prop_collection: The elements
+    """
+    if domain == "POINT":
+        return obj.data.vertices
+    elif domain == "EDGE":
+        return obj.data.edges
+    elif domain == "FACE":
+        return obj.data.polygons
+    elif domain == "CORNER":
+        return obj.data.loops
+    raise etc.MeshDataReadException("get_mesh_domain_elements", f"Domain {domain} is not supported")
 
 def get_domain_attribute_values(obj, domain, attribute_name):
     """Gets values of attribute stored in domain like: edges[0].use_sharp 
+    Properties in static_data.mesh_domain_properties are read with single foreach_get call.
 
     Args:
         obj (Reference): 3D Object Reference
@@ -983,18 +2819,19 @@ def get_domain_attribute_values(obj, domain, attribute_name):
         attribute_name (str): Name of the attribute to set eg. use_sharp
 
     Returns:
-        list: A list of values in that attribute. The type of values in list is variable.
+        np.ndarray or list: Values of (N,) or (N, components) shape. Properties that are not foreach compatible are returned as a list.
     """
     try:
-        if domain== "POINT":
-            print(f"getting {attribute_name} 0: {getattr(obj.data.vertices[0], attribute_name)}")
-            return [getattr(v, attribute_name) for v in obj.data.vertices]
-        elif domain == "EDGE":
-            return  [getattr(v, attribute_name) for v in obj.data.edges]
-        elif domain == "FACE":
-            return [getattr(v, attribute_name) for v in obj.data.polygons]
-        elif domain == "CORNER":
-            return [getattr(v, attribute_name) for v in obj.data.loops]
+        elements = get_mesh_domain_elements(obj, domain)
+        prop = static_data.mesh_domain_properties[domain].get(attribute_name, None)
+        
+        if prop is None:
+            etc.log(get_domain_attribute_values, f"Reading {attribute_name} on {domain} by value", etc.ELogLevel.VERBOSE)
+            return [getattr(v, attribute_name) for v in elements]
+        
+        storage = np.empty(len(elements) * prop.buffer_components, dtype=prop.buffer_dtype)
+        elements.foreach_get(attribute_name, storage)
+        return storage if prop.buffer_components == 1 else storage.reshape(-1, prop.buffer_components)
     except Exception as e:
         raise etc.MeshDataReadException("get_domain_attribute_values", f"Failed to get {attribute_name} from {domain} \n {e}")
 
@@ -1014,6 +2851,7 @@ def get_mesh_data(obj, data_type, source_domain, **kwargs):
         * sel_mat               selected material
         * mat_index             material index
         * uvmap_index           uvmap index
+        * vg_weights            VertexGroupWeights to reuse when reading multiple vertex groups
 
     Raises:
         etc.MeshDataReadException: on failure if selected data type does not exist
@@ -1043,10 +2881,10 @@ def get_mesh_data(obj, data_type, source_domain, **kwargs):
         
     # VISIBILITY IN EDIT MODE
     elif data_type == "VISIBLE":
-        return [not val for val in get_domain_attribute_values(obj, source_domain, "hide")]
+        return np.logical_not(get_domain_attribute_values(obj, source_domain, "hide"))
 
     elif data_type == "HIDDEN":
-        return [val for val in get_domain_attribute_values(obj, source_domain, "hide")]
+        return get_domain_attribute_values(obj, source_domain, "hide")
 
     # SELECTED
     elif data_type == "SELECTED":
@@ -1054,7 +2892,7 @@ def get_mesh_data(obj, data_type, source_domain, **kwargs):
 
     # NOT SELECTED
     elif data_type == "NOT_SELECTED":
-        return [not val for val in get_domain_attribute_values(obj, source_domain, "select")]
+        return np.logical_not(get_domain_attribute_values(obj, source_domain, "select"))
  
     # POSITION
     elif data_type == "POSITION":
@@ -1063,16 +2901,11 @@ def get_mesh_data(obj, data_type, source_domain, **kwargs):
         
         elif source_domain == 'EDGE':
             pairs = get_domain_attribute_values(obj, source_domain, "vertices")
-            storage = []
-            for i, vert_pair in enumerate(pairs):
-                pos_0 = obj.data.vertices[vert_pair[0]].co
-                pos_1 = obj.data.vertices[vert_pair[1]].co
-                edge_pos = (pos_0 + pos_1)/2
-                storage.append(edge_pos)
-            return storage
+            positions = get_domain_attribute_values(obj, 'POINT', "co")
+            return (positions[pairs[:, 0]] + positions[pairs[:, 1]]) / 2
 
         elif source_domain == 'FACE':
-            return [val for val in get_domain_attribute_values(obj, source_domain, "center")]
+            return get_domain_attribute_values(obj, source_domain, "center")
 
     # NORMALS
     elif data_type == "NORMAL":
@@ -1129,50 +2962,26 @@ def get_mesh_data(obj, data_type, source_domain, **kwargs):
         
     # VERT_IS_IN_VERTEX_GROUP
     elif data_type == "VERT_IS_IN_VERTEX_GROUP":        
-        vg = obj.vertex_groups[int(kwargs['vg_index'])]
-        data = []
-
-        for vert in obj.data.vertices:
-            b_is_in_group = False
-            for group in vert.groups:
-                if group.group == int(kwargs['vg_index']):
-                    b_is_in_group = True
-                    break
-            data.append(b_is_in_group)
-        return data
+        vg_weights = kwargs.get('vg_weights', None)
+        if vg_weights is None:
+            vg_weights = VertexGroupWeights(obj)
+        return vg_weights.get_group_membership(int(kwargs['vg_index']))
     
     # VERTEX GROUP VALUE
     elif data_type == "VERT_FROM_VERTEX_GROUP" :        
-        vg = obj.vertex_groups[int(kwargs['vg_index'])]
-        data = []
-
-        for vert in obj.data.vertices:
-            weight = 0.0
-            
-            for group in vert.groups:
-                if group.group == int(kwargs['vg_index']):
-                    weight = group.weight
-                    break
-            data.append(weight)
-
-        return data
+        vg_weights = kwargs.get('vg_weights', None)
+        if vg_weights is None:
+            vg_weights = VertexGroupWeights(obj)
+        return vg_weights.get_group_weights(int(kwargs['vg_index']))
 
     # VERT_SHAPE_KEY_POSITION
     elif data_type == "VERT_SHAPE_KEY_POSITION":
-        sk = obj.data.shape_keys.key_blocks[int(kwargs['sk_index'])]
-        return [vert.co for vert in sk.data]
+        return get_shape_key_positions(obj, [kwargs['sk_index']])[0]
 
     # VERT SHAPE KEY OFFSET
     elif data_type == "VERT_SHAPE_KEY_POSITION_OFFSET":
-        sk = obj.data.shape_keys.key_blocks[int(kwargs['sk_index'])]
-        offset_from = [vert_shape.co for vert_shape in sk.data]
-
-        offset_sk = obj.data.shape_keys.key_blocks[int(kwargs['sk_offset_index'])]
-        offset_to = [vert_shape.co for vert_shape in offset_sk.data]
-        
-        for vert in obj.data.vertices:
-            offset_from[vert.index] = offset_to[vert.index] - offset_from[vert.index]
-        return offset_from
+        sk_positions = get_shape_key_positions(obj, [kwargs['sk_index'], kwargs['sk_offset_index']])
+        return sk_positions[1] - sk_positions[0]
 
 
     # EDGE MESH ATTRIBUTES START
@@ -1304,19 +3113,14 @@ def get_mesh_data(obj, data_type, source_domain, **kwargs):
 
     # FACE MATERIAL INDEX
     elif data_type == "FACE_IS_MATERIAL_ASSIGNED":
-        # print(bpy.data.materials[int(kwargs['sel_mat'])])
-        # print([obj.material_slots[f.material_index].material for f in obj.data.polygons])
-        if len(obj.material_slots):
-            return [obj.material_slots[f.material_index].material == bpy.data.materials[int(kwargs['sel_mat'])] for f in obj.data.polygons]
-        else:
-            return [False] * len(obj.data.polygons)
+        return get_face_material_masks(obj, [int(kwargs['sel_mat'])])[0]
 
     #"FACE_IS_MATERIAL_SLOT_ASSIGNED",
     elif data_type == "FACE_IS_MATERIAL_SLOT_ASSIGNED":
         if len(obj.material_slots):
-            return [f.material_index == int(kwargs['mat_index']) for f in obj.data.polygons]
+            return get_domain_attribute_values(obj, 'FACE', "material_index") == int(kwargs['mat_index'])
         else:
-            return [False] * len(obj.data.polygons)
+            return np.zeros(len(obj.data.polygons), dtype=bool)
 
     # FACE CORNER MESH ATTRIBUTES START
     # -----------------------------
@@ -1341,9 +3145,13 @@ def get_mesh_data(obj, data_type, source_domain, **kwargs):
     elif data_type == "CORNER_VERTEX_INDEX":
         return get_domain_attribute_values(obj, source_domain, "vertex_index") 
     
+    # ISLANDS
+    elif data_type in ["VERTEX_ISLAND", "FACE_ISLAND", "SEAM_ISLAND", "SHARP_ISLAND", "UV_ISLAND"]:
+        return get_mesh_island_ids(obj, data_type, source_domain, kwargs.get('uvmap_index', None))
+
     # UVMAP
     elif data_type == "UVMAP":
-        return [map.uv for map in obj.data.uv_layers[int(kwargs['uvmap_index'])].data]
+        return get_uvmap_values(obj, kwargs['uvmap_index'])
     
 
     # -----------------------------
@@ -1351,30 +3159,15 @@ def get_mesh_data(obj, data_type, source_domain, **kwargs):
 
     # SELECTED VERTS IN UV EDITOR
     elif data_type == "SELECTED_VERTICES_IN_UV_EDITOR":
-        uvmap_name = obj.data.uv_layers[int(kwargs['uvmap_index'])].name
-        attribute_name = f".vs.{uvmap_name}"
-        if attribute_name in obj.data.attributes:
-            return [es.value for es in obj.data.attributes[attribute_name].data]
-        else:
-            return [False] * len(obj.data.loops)
+        return get_uv_editor_flags(obj, ".vs.", kwargs['uvmap_index'])
     
     # SELECTED EDGES IN UV EDITOR
     elif data_type == "SELECTED_EDGES_IN_UV_EDITOR":
-        uvmap_name = obj.data.uv_layers[int(kwargs['uvmap_index'])].name
-        attribute_name = f".es.{uvmap_name}"
-        if attribute_name in obj.data.attributes:
-            return [es.value for es in obj.data.attributes[attribute_name].data]
-        else:
-            return [False] * len(obj.data.loops)
+        return get_uv_editor_flags(obj, ".es.", kwargs['uvmap_index'])
 
     # SELECTED EDGES IN UV EDITOR
     elif data_type == "PINNED_VERTICES_IN_UV_EDITOR":
-        uvmap_name = obj.data.uv_layers[int(kwargs['uvmap_index'])].name
-        attribute_name = f".pn.{uvmap_name}"
-        if attribute_name in obj.data.attributes:
-            return [es.value for es in obj.data.attributes[attribute_name].data]
-        else:
-            return [False] * len(obj.data.loops)
+        return get_uv_editor_flags(obj, ".pn.", kwargs['uvmap_index'])
     
     else:
         raise etc.MeshDataReadException("get_mesh_data", f"Invalid domain data type ({data_type}) or this data is not available on this domain ({source_domain})")
@@ -1383,186 +3176,135 @@ def get_mesh_data(obj, data_type, source_domain, **kwargs):
 
 def set_domain_attribute_values(obj, attribute_name:str, domain:str, values: list):
     """Sets values of attribute stored in domain like: edges[0].use_sharp 
+    Properties in static_data.mesh_domain_properties are written with single foreach_set call.
 
     Args:
         obj (Reference): 3D Object Reference
         attribute_name (str): Name of the attribute
         domain (str): Attribute Domain
-        values (list): Values to set 
+        values (list or np.ndarray): Values to set, for each domain
+
+    Raises:
+        etc.MeshDataWriteException: If the length of values does not match the domain
     """
 
-    if domain == 'POINT':
-        for i, vert in enumerate(obj.data.vertices):
-            setattr(vert, attribute_name, values[i])
-    elif domain == 'EDGE':
-        for i, edge in enumerate(obj.data.edges):
-            setattr(edge, attribute_name, values[i])
-    elif domain == 'FACE':
-        for i, face in enumerate(obj.data.polygons):
-            setattr(face, attribute_name, values[i])
-    elif domain == 'CORNER':
-        for i, loop in enumerate(obj.data.loops):
-            setattr(loop, attribute_name, values[i])
+    # Mesh data stored as attributes might change
+    invalidate_attribute_read_cache(obj.data)
+
+    elements = get_mesh_domain_elements(obj, domain)
+    prop = static_data.mesh_domain_properties[domain].get(attribute_name, None)
+
+    if len(values) != len(elements):
+        raise etc.MeshDataWriteException("set_domain_attribute_values", f"Invalid input value data length. Input {len(values)}, expected {len(elements)}")
+
+    if prop is None:
+        etc.log(set_domain_attribute_values, f"Setting {attribute_name} on {domain} by value", etc.ELogLevel.VERBOSE)
+        for i, element in enumerate(elements):
+            setattr(element, attribute_name, values[i])
+        return
+    
+    storage = np.ascontiguousarray(values, dtype=prop.buffer_dtype).reshape(-1)
+    elements.foreach_set(attribute_name, storage)
 
 def set_selection_or_visibility_of_mesh_domain(obj, domain, indexes, state = True, selection = True):
     """Sets the selection or visibility in edit mode.
     Those require setting the state of faces, edges and vertices separately, hence the separate function.
+    The state is flushed to connected elements: selecting or unhiding an edge or face requires all of its vertices,
+    deselecting or hiding any of them is enough.
+    WARNING: OBJECT MODE REQUIRED
 
     Args:
         obj (Reference ): 3D Object Reference
         domain (str): Domain - POINT EDGE FACE CORNER
-        indexes (list): Domain indexes to set the state
+        indexes (SelectionMask or list): Mask or domain indexes to set the state
         state (bool, optional): The state of visibility or selection. Defaults to True.
         selection (bool, optional): Whether toggle selection or visibility. Defaults to True.
-
-    Raises:
-        Exception: On failure, re-raises the exception and clears bmesh
     """
+
+    # Mesh data stored as attributes might change
+    invalidate_attribute_read_cache(obj.data)
+    invalidate_selection_cache(obj.data)
     etc.log(get_mesh_data, f"Setting sel/vis {selection} to state  {state} on {domain}, \ndataset {indexes}", etc.ELogLevel.SUPER_VERBOSE)
 
-    bm = bmesh.new()
-    bm.from_mesh(obj.data)
-    bm.verts.ensure_lookup_table()
-    bm.edges.ensure_lookup_table()
-    bm.faces.ensure_lookup_table()
-    if domain != 'CORNER':
-        try:
-            if domain == 'POINT':
-                for vertindex in indexes:
-                    if selection:
-                        bm.verts[vertindex].select = state
-                    else:
-                        bm.verts[vertindex].hide = state
-
-                    for edge in bm.verts[vertindex].link_edges:
-                        if state == selection:
-                            if all(vert.index in indexes for vert in edge.verts):
-                                if selection:
-                                    edge.select = state
-                                else:
-                                    edge.hide = state
-                        else:
-                            if any(vert.index in indexes for vert in edge.verts):
-                                if selection:
-                                    edge.select = state
-                                else:
-                                    edge.hide = state
-
-                    for face in bm.verts[vertindex].link_faces:
-                        if state == selection:
-                            if all(vert.index in indexes for vert in face.verts):
-                                if selection:
-                                    face.select = state
-                                else:
-                                    face.hide = state
-                        else:
-                            if any(vert.index in indexes for vert in face.verts):
-                                if selection:
-                                    face.select = state
-                                else:
-                                    face.hide = state
-
-            elif domain == 'EDGE':
-                for edgeindex in indexes:
-                    if selection:
-                        bm.edges[edgeindex].select = state
-                    else:
-                        bm.edges[edgeindex].hide = state
+    target = SelectionMask.from_selection(indexes, get_domain_size(obj, domain), domain)
 
-                    for vert in bm.edges[edgeindex].verts:
-                        if selection:
-                            vert.select = state
-                        else:
-                            vert.hide = state
-                
-                    for face in bm.edges[edgeindex].link_faces:
-                        if state == selection:
-                            if all(edge.index in indexes for edge in face.edges):
-                                if selection:
-                                    face.select = state
-                                else:
-                                    face.hide = state
-                        else:
-                            if any(edge.index in indexes for edge in face.edges):
-                                if selection:
-                                    face.select = state
-                                else:
-                                    face.hide = state
-                    
-            elif domain == 'FACE':
-                for faceindex in indexes:
-                    if selection:
-                        bm.faces[faceindex].select = state
-                    else:
-                        bm.faces[faceindex].hide = state
+    # Mesh data is not synchronized in edit mode
+    if is_edit_mode_bmesh_supported(obj.data):
+        set_bmesh_selection_or_visibility(obj.data, domain, target, state, selection)
+        return
+    
+    topology = get_mesh_topology(obj.data)
 
-                    for vert in bm.faces[faceindex].verts:
-                        if selection:
-                            vert.select = state
-                        else:
-                            vert.hide = state
-                    
-                    for edge in bm.faces[faceindex].edges:
-                        if selection:
-                            edge.select = state
-                        else:
-                            edge.hide = state
-            
-            bm.to_mesh(obj.data)
-            bm.free()
-        except Exception as e:
-            # clear bmesh on exception to avoid extra problems
-            bm.to_mesh(obj.data)
-            bm.free()
-            raise Exception(e)
+    if domain != 'CORNER':
+        # Selecting or unhiding needs all of the elements of connected edges/faces, deselecting or hiding any of them
+        reduce_func = np.logical_and if state == selection else np.logical_or
+
+        if domain == 'POINT':
+            vert_mask = target.mask
+            edge_mask = reduce_func(vert_mask[topology.edge_vertices[:, 0]], vert_mask[topology.edge_vertices[:, 1]])
+            face_mask = topology.reduce_faces(vert_mask[topology.loop_vertex], reduce_func)
+
+        elif domain == 'EDGE':
+            edge_mask = target.mask
+            vert_mask = SelectionMask(edge_mask, domain).to_domain(obj, 'POINT').mask
+            face_mask = topology.reduce_faces(edge_mask[topology.loop_edge], reduce_func)
+                
+        elif domain == 'FACE':
+            face_mask = target.mask
+            selection_mask = SelectionMask(face_mask, domain)
+            vert_mask = selection_mask.to_domain(obj, 'POINT').mask
+            edge_mask = selection_mask.to_domain(obj, 'EDGE').mask
+        
+        write_mesh_element_flags(obj.data, 'select' if selection else 'hide', state, vert_mask, edge_mask, face_mask)
 
     else:
         if etc.get_preferences_attrib("select_attribute_precise_facecorners"):
-            edge_indexes_to_select = [] 
-            
-            for cornerindex in indexes:
-                loop = obj.data.loops[cornerindex]
-
-                # get the face index that has this corner
-                faceindex = -1
-                for face in bm.faces:
-                    if cornerindex in [loop.index for loop in face.loops]:
-                        faceindex = face.index
-                
-                # get edges that are connected to vertex assinged to this corner
-                edges = bm.verts[loop.vertex_index].link_edges
-                if etc.get_preferences_attrib("en_slow_logging_ops"):
-                    etc.log(set_selection_or_visibility_of_mesh_domain, f"loop {cornerindex} has edges {[edge.index for edge in edges]}", etc.ELogLevel.SUPER_VERBOSE)
-                    etc.log(set_selection_or_visibility_of_mesh_domain, f"loop {cornerindex} has a face {faceindex}, with edges {[edge.index for edge in bm.faces[faceindex].edges]}", etc.ELogLevel.SUPER_VERBOSE)
-                
-                # get edges that are in face index of this corner
-                for edge in edges:
-                    if edge in bm.faces[faceindex].edges:
-                        edge_indexes_to_select.append(edge.index)
             
-            bm.free()
+            # The edges of the face that are connected to vertex assigned to the corner:
+            # edge of the corner and edge of previous corner in the face
+            edges_to_select = target.to_domain(obj, 'EDGE')
             if etc.get_preferences_attrib("en_slow_logging_ops"):
-                etc.log(set_selection_or_visibility_of_mesh_domain, f"Filtered edges of the corner are {edge_indexes_to_select}", etc.ELogLevel.SUPER_VERBOSE)
-            set_selection_or_visibility_of_mesh_domain(obj, 'EDGE', edge_indexes_to_select, state, selection)
+                corners = target.to_indexes()
+                etc.log(set_selection_or_visibility_of_mesh_domain, f"Corners {corners} have faces {topology.loop_face[corners]}", etc.ELogLevel.SUPER_VERBOSE)
+                etc.log(set_selection_or_visibility_of_mesh_domain, f"Filtered edges of the corner are {edges_to_select.to_indexes()}", etc.ELogLevel.SUPER_VERBOSE)
+            set_selection_or_visibility_of_mesh_domain(obj, 'EDGE', edges_to_select, state, selection)
         
         # The fast method
-        elif len(indexes):
+        elif target.any():
             mesh_selected_modes = bpy.context.scene.tool_settings.mesh_select_mode
 
-            storage = np.zeros(len(obj.data.loops), dtype=int)
-
             # User is in edit mode with edge or face selection mode
             if mesh_selected_modes[1] or mesh_selected_modes[2]:
-                obj.data.loops.foreach_get('edge_index', storage)
-                storage = np.take(storage, indexes)
+                storage = topology.loop_edge[target.mask]
                 set_selection_or_visibility_of_mesh_domain(obj, 'EDGE', storage, state, selection)
 
             # Any other mode 
             else:
-                obj.data.loops.foreach_get('vertex_index', storage)
-                storage = np.take(storage, indexes)
+                storage = topology.loop_vertex[target.mask]
                 set_selection_or_visibility_of_mesh_domain(obj, 'POINT', storage, state, selection)
-                
+
+def write_mesh_element_flags(mesh, prop:str, state:bool, vert_mask, edge_mask, face_mask):
+    """Sets select or hide flag of vertices, edges and faces in masks to the state. Other elements keep their flags.
+    WARNING: OBJECT MODE REQUIRED
+
+    Args:
+        mesh (Reference): Mesh data reference
+        prop (str): 'select' or 'hide'
+        state (bool): The state to set
+        vert_mask (np.ndarray): Boolean mask of vertices to set the flag on
+        edge_mask (np.ndarray): Boolean mask of edges to set the flag on
+        face_mask (np.ndarray): Boolean mask of faces to set the flag on
+    """
+
+    for elements, mask in [(mesh.vertices, vert_mask), (mesh.edges, edge_mask), (mesh.polygons, face_mask)]:
+        if not len(elements):
+            continue
+        
+        with scratch_buffer(bool, len(elements)) as flags:
+            elements.foreach_get(prop, flags)
+            flags[mask] = state
+            elements.foreach_set(prop, flags)
+
 def set_mesh_data(obj, data_target:str , src_attrib, new_data_name = "", overwrite = False, **kwargs):
     """Sets mesh data from selected attribute
 
@@ -1592,6 +3334,9 @@ def set_mesh_data(obj, data_target:str , src_attrib, new_data_name = "", overwri
     Returns:
         Nothing
     """
+
+    # Mesh data stored as attributes might change
+    invalidate_attribute_read_cache(obj.data)
     
     def foreach_get_mesh_data_value(data, prop):
         sample = getattr(data[0], prop)
@@ -1622,23 +3367,19 @@ def set_mesh_data(obj, data_target:str , src_attrib, new_data_name = "", overwri
 
     # TO VISIBLE
     if data_target == "TO_VISIBLE":
-        vis_indexes = [index for index, value in enumerate(a_vals) if value]
-        set_selection_or_visibility_of_mesh_domain(obj, src_attrib.domain, vis_indexes, False, selection=False)
+        set_selection_or_visibility_of_mesh_domain(obj, src_attrib.domain, SelectionMask(np.asarray(a_vals, dtype=bool), src_attrib.domain), False, selection=False)
 
     # TO HIDDEN
     elif data_target == "TO_HIDDEN":
-        hid_indexes = [index for index, value in enumerate(a_vals) if value]
-        set_selection_or_visibility_of_mesh_domain(obj, src_attrib.domain, hid_indexes, True, selection=False)
+        set_selection_or_visibility_of_mesh_domain(obj, src_attrib.domain, SelectionMask(np.asarray(a_vals, dtype=bool), src_attrib.domain), True, selection=False)
 
     # TO SELECTED
     elif data_target == "TO_SELECTED":
-        sel_indexes = [index for index, value in enumerate(a_vals) if value]
-        set_selection_or_visibility_of_mesh_domain(obj, src_attrib.domain, sel_indexes, True)
+        set_selection_or_visibility_of_mesh_domain(obj, src_attrib.domain, SelectionMask(np.asarray(a_vals, dtype=bool), src_attrib.domain), True)
 
     # TO NOT SELECTED
     elif data_target == "TO_NOT_SELECTED":
-         nsel_indexes = [index for index, value in enumerate(a_vals) if value]
-         set_selection_or_visibility_of_mesh_domain(obj, src_attrib.domain, nsel_indexes, False)
+         set_selection_or_visibility_of_mesh_domain(obj, src_attrib.domain, SelectionMask(np.asarray(a_vals, dtype=bool), src_attrib.domain), False)
 
 
     # VERTEX MESH DATA
@@ -1891,44 +3632,22 @@ def set_mesh_data(obj, data_target:str , src_attrib, new_data_name = "", overwri
         if not (new_data_name in obj.data.uv_layers and overwrite):
             obj.data.uv_layers.new(name=new_data_name)
 
-        for i, val in enumerate(a_vals):
-            obj.data.uv_layers[int(kwargs['uvmap_index'])].data[i].uv = (val[0], val[1])
+        set_uvmap_values(obj, kwargs['uvmap_index'], a_vals)
 
     # UV EDITOR SPECIALS
     # -----------------------------
 
     # TO SELECTED VERTICES IN UV EDITOR
     elif data_target == "TO_SELECTED_VERTICES_IN_UV_EDITOR":
-        uvmap_name = obj.data.uv_layers[int(kwargs['uvmap_index'])].name
-        attribute_name = f'.vs.{uvmap_name}'
-
-        if not attribute_name in obj.data.attributes:
-            obj.data.attributes.new(attribute_name, 'BOOLEAN', 'CORNER')
-
-        for i, val in enumerate(a_vals):
-            obj.data.attributes[attribute_name].data[i].value = val
+        set_uv_editor_flags(obj, ".vs.", kwargs['uvmap_index'], a_vals)
 
     # TO SELECTED EDGES IN UV EDITOR
     elif data_target == "TO_SELECTED_EDGES_IN_UV_EDITOR":
-        uvmap_name = obj.data.uv_layers[int(kwargs['uvmap_index'])].name
-        attribute_name = f'.es.{uvmap_name}'
-
-        if not attribute_name in obj.data.attributes:
-            obj.data.attributes.new(attribute_name, 'BOOLEAN', 'CORNER')
-
-        for i, val in enumerate(a_vals):
-            obj.data.attributes[attribute_name].data[i].value = val
+        set_uv_editor_flags(obj, ".es.", kwargs['uvmap_index'], a_vals)
 
     # TO PINNED VERTICES IN UV EDITOR
     elif data_target == "TO_PINNED_VERTICES_IN_UV_EDITOR":
-        uvmap_name = obj.data.uv_layers[int(kwargs['uvmap_index'])].name
-        attribute_name = f'.pn.{uvmap_name}'
-
-        if not attribute_name in obj.data.attributes:
-            obj.data.attributes.new(attribute_name, 'BOOLEAN', 'CORNER')
-
-        for i, val in enumerate(a_vals):
-            obj.data.attributes[attribute_name].data[i].value = val
+        set_uv_editor_flags(obj, ".pn.", kwargs['uvmap_index'], a_vals)
 
     # NONE OF ABOVE
     # -----------------------------
@@ -1964,10 +3683,10 @@ def get_all_mesh_data_indexes_of_type(obj,data_type):
         return [i for i, mat_slot in enumerate(obj.material_slots)]
 
     elif data_type in ["FACE_IS_MATERIAL_ASSIGNED"]:
-        mats = list(set([mat_slot.material for mat_slot in obj.material_slots if mat_slot.material is not None]))
-        return [list(bpy.data.materials).index(mat) for mat in mats]
+        lookup = get_material_slot_lookup(obj)
+        return np.unique(lookup[lookup >= 0]).tolist()
     
-    elif data_type in ["SELECTED_VERTICES_IN_UV_EDITOR", "SELECTED_EDGES_IN_UV_EDITOR", "PINNED_VERTICES_IN_UV_EDITOR", 'UVMAP']:
+    elif data_type in ["SELECTED_VERTICES_IN_UV_EDITOR", "SELECTED_EDGES_IN_UV_EDITOR", "PINNED_VERTICES_IN_UV_EDITOR", 'UVMAP', 'UV_ISLAND']:
         return [i for i, uv in enumerate(obj.data.uv_layers)]
     
     else:
@@ -3042,6 +4761,22 @@ def linear_to_srgb(color_value: float, return_float=True):
     else:
         v = int((1.055 * color_value ** (1 / 2.4) - 0.055) * 255.99)
         return max(min(1.0, v/255),0.0) if return_float else v 
+
+def linear_to_srgb_array(color_values, return_float=True):
+    """Same as linear_to_srgb, for whole numpy arrays at once
+
+    Args:
+        color_values (np.ndarray): Linear color values
+        return_float (bool, optional): Return 0.0-1.0 floats instead of 0-255 integers. Defaults to True.
+
+    Returns:
+        np.ndarray: sRGB color values, same shape as input
+    """
+    color_values = np.asarray(color_values, dtype=np.float64)
+    v = np.where(color_values <= 0.0031308, 
+                 12.92 * color_values * 255.99,
+                 (1.055 * np.power(np.maximum(color_values, 0.0), 1 / 2.4) - 0.055) * 255.99).astype(int)
+    return np.clip(v/255, 0.0, 1.0) if return_float else v
     
 
 # Other
@@ -3700,7 +5435,11 @@ def write_csv_attributes_file(filepath:str, obj, attributes: list, add_domain_an
             else:
                 rownames.append(attribute.name)
             datalengths.append(len(attribute.data))
-            values.append(get_attribute_values(attribute, obj))
+            a_vals = get_attribute_values(attribute, obj, as_numpy=True)
+            # Matrices are stored as flat 16 value cells
+            if a_vals.ndim > 2:
+                a_vals = a_vals.reshape(len(a_vals), -1)
+            values.append(a_vals)
 
         max_data_len = max(datalengths)
 
@@ -3713,7 +5452,13 @@ def write_csv_attributes_file(filepath:str, obj, attributes: list, add_domain_an
             for j, attribute in enumerate(attributes):
                 rownames[j].replace(',', "")
                 if i < datalengths[j]:
-                    row[rownames[j]] = values[j][i]
+                    # numpy values to python types, vectors as tuples
+                    value = values[j][i]
+                    if hasattr(value, 'tolist'):
+                        value = value.tolist()
+                        if type(value) is list:
+                            value = tuple(value)
+                    row[rownames[j]] = value
                 else:
                     row[rownames[j]] = ""
 
@@ -3751,6 +5496,7 @@ def csv_to_attributes(filepath:str, obj, excluded_attribute_names: list, remove_
         attribute_sets = []
         valid_columns = []
         data_columns = []
+        new_attributes = {}
 
         line = 0
         for row in reader:
@@ -3816,42 +5562,43 @@ def csv_to_attributes(filepath:str, obj, excluded_attribute_names: list, remove_
                     column = column.replace('(', "")
                     column = column.replace(')', "")
 
-                    if column in obj.data.attributes:
-                        attribute = obj.data.attributes[column]
-                        if attribute.data_type != attrib_dt:
+                    if column in excluded_attribute_names:
+                        etc.log(csv_to_attributes, f"Attribute on exclude list: {col_id} {column}", etc.ELogLevel.VERBOSE)
+                        continue
+
+                    # Attributes are created after reading the file, check the ones from previous columns too
+                    if column in obj.data.attributes or column in new_attributes:
+                        if column in obj.data.attributes:
+                            existing_dt, existing_domain = obj.data.attributes[column].data_type, obj.data.attributes[column].domain
+                        else:
+                            existing_dt, existing_domain = new_attributes[column]
+
+                        if existing_dt != attrib_dt:
                             errors.append(f"This attribute exists, but the data type is different: column {col_id}: {column}")
                             continue
-                        elif attribute.domain != attrib_domain:
+                        elif existing_domain != attrib_domain:
                             errors.append(f"This attribute exists, but the domain is different: column {col_id}: {column}")
                             continue
+                        b_new = False
                     else:
                         if column == "":
                             errors.append(f"Cannot create an attribute with empty name, column {col_id}")
                             continue
                         
-                        attribute = obj.data.attributes.new(name=column, type=attrib_dt, domain=attrib_domain)
-
-                    if attribute in excluded_attribute_names:
-                        etc.log(csv_to_attributes, f"Attribute on exclude list: {col_id} {column}", etc.ELogLevel.VERBOSE)
-                        continue
-
-                    # Because this script can create many attributes quickly, blender might not update the data about
-                    # domains and data types fast enough to be accessible via .data_type and .domain
-                    # so this has to be passed through manually
+                        new_attributes[column] = (attrib_dt, attrib_domain)
+                        b_new = True
 
                     aset = {
-                        "attribute": attribute,
                         "name": column, 
                         "data_type": attrib_dt,
-                        "domain": attrib_domain
+                        "domain": attrib_domain,
+                        "new": b_new
                     }
                     attribute_sets.append(aset)
                     valid_columns.append(col_id)
                     data_columns.append([])
                     
                     etc.log(csv_to_attributes, f'Identified column {col_id} as {column}, domain {attrib_domain}, data type {attrib_dt}', etc.ELogLevel.VERBOSE)
-                
-                obj.data.update()
             
             else:
                 if not len(valid_columns):
@@ -3873,28 +5620,36 @@ def csv_to_attributes(filepath:str, obj, excluded_attribute_names: list, remove_
                         if cast_type is not tuple:
                             data_columns[i].append(cast_type(data))
                         else:
-                            if type(literal_eval(data)) != cast_type:
+                            value = literal_eval(data)
+                            if type(value) != cast_type:
                                 raise ValueError
-                            data_columns[i].append(literal_eval(data))
+                            
+                            # Matrices are written as flat 16 values, nested rows are accepted too
+                            if static_data.attribute_data_types[attribute_set['data_type']].large_capacity_vector:
+                                value = np.asarray(value, dtype=np.float32).reshape(-1)
+                                if len(value) != static_data.attribute_data_types[attribute_set['data_type']].large_capacity_vector_size:
+                                    raise ValueError
+                                value = tuple(value.tolist())
+                            data_columns[i].append(value)
                     except ValueError:
                         errors.append(f"Cannot convert {data} from column {col_id}, row {line-1} to {cast_type}, using default value for this data type.")
-                        data_columns[i].append(get_attribute_default_value(attribute))
-
-
-
-        for i, attribute_set in enumerate(attribute_sets):
-            attribute = attribute_set['attribute']
-            input_data_len = len(data_columns[i])
-            storage_len = len(attribute.data)
-            if input_data_len < storage_len:
-                data_columns[i] += [get_attribute_default_value(attribute)] * (storage_len-input_data_len)
-            elif input_data_len > storage_len:
-                data_columns[i] = data_columns[i][:storage_len]
-
-            set_attribute_values(attribute, data_columns[i], bugbypass_data_type=attribute_set['data_type'], bugbypass_domain=attribute_set['domain'])
+                        data_columns[i].append(get_attribute_default_value(datatype=attribute_set['data_type']))
 
 
+        # Create and write all attributes at once
+        with AttributeWriteTransaction() as transaction:
+            for i, attribute_set in enumerate(attribute_sets):
+                input_data_len = len(data_columns[i])
+                storage_len = get_domain_size(obj, attribute_set['domain'])
+                if input_data_len < storage_len:
+                    data_columns[i] += [get_attribute_default_value(datatype=attribute_set['data_type'])] * (storage_len-input_data_len)
+                elif input_data_len > storage_len:
+                    data_columns[i] = data_columns[i][:storage_len]
 
+                if attribute_set['new']:
+                    transaction.create(obj, attribute_set['name'], attribute_set['data_type'], attribute_set['domain'], data_columns[i])
+                else:
+                    transaction.write(obj, attribute_set['name'], data_columns[i])
 
     return True, errors, len(attribute_sets)
 
@@ -3958,4 +5713,27 @@ def get_alpha_channel_enabled_texture_bake_op(self):
     # Used in AttributesToImage operqtor, can't put it in the operator.
     # Checks if alpha channel is enabled to bake it
     img_ref = bpy.context.window_manager.mame_image_ref
-    return((self.image_source_enum == 'NEW' and self.b_new_image_alpha) or (self.image_source_enum == 'EXISTING' and img_ref is not None and img_ref.alpha_mode != 'NONE'))
\ No newline at end of file
+    return((self.image_source_enum == 'NEW' and self.b_new_image_alpha) or (self.image_source_enum == 'EXISTING' and img_ref is not None and img_ref.alpha_mode != 'NONE'))
+
+
+# Register
+# ------------------------------------------
+
+def register():
+    "Register handlers. Exception handing in init"
+    bpy.app.handlers.depsgraph_update_post.append(attribute_read_cache_depsgraph_handler)
+    for handlers in [bpy.app.handlers.undo_post, bpy.app.handlers.redo_post, bpy.app.handlers.load_post]:
+        handlers.append(attribute_read_cache_clear_handler)
+
+def unregister():
+    "Unregister handlers and free module level caches. Exception handing in init"
+    for handlers, handler in [(bpy.app.handlers.depsgraph_update_post, attribute_read_cache_depsgraph_handler),
+                              (bpy.app.handlers.undo_post, attribute_read_cache_clear_handler),
+                              (bpy.app.handlers.redo_post, attribute_read_cache_clear_handler),
+                              (bpy.app.handlers.load_post, attribute_read_cache_clear_handler)]:
+        if handler in handlers:
+            handlers.remove(handler)
+    invalidate_attribute_read_cache()
+    invalidate_mesh_topology()
+    invalidate_selection_cache()
+    release_scratch_buffers()
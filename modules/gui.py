@@ -171,6 +171,13 @@ def attribute_assign_panel(self, context):
                         sub.ui_units_x = 1
                         sub.prop(prop_group, "val_select_non_zero_toggle", text=f"NZ" if prop_group.val_select_non_zero_toggle else 'V', toggle=True)
 
+                        # Selected element count, not shown for face corners as deriving them is a full scan of the mesh
+                        if ob_type == 'MESH':
+                            sel_count = func.get_mesh_selection_count(ob_data, ob_data.attributes.active.domain)
+                            if sel_count is not None:
+                                col = assign_buttons.row()
+                                col.label(text=f"Selected {func.get_friendly_domain_name(ob_data.attributes.active.domain, plural=True)}: {sel_count}")
+
                         # Slow operation warning with a toggle
                         if len(obj_size_source) > etc.LARGE_MESH_VERTICES_COUNT:
                             box = layout.box()
@@ -306,6 +313,7 @@ def uiel_debug_menu(self, context, layout, gui_prop_group, pin_ref):
         dbgrow.operator("mame.tester", text="run tests")
         dbgrow.operator("mame.create_all_attribs", text="attrib test")
         dbgrow.operator("mame.create_point_cloud")
+        dbgrow.operator("mame.test_corner_selection")
         
         dbgrow = dbgbox.row()
         dbgrow.label(text=f"Pinned: {context.space_data.use_pin_id}")
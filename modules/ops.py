@@ -154,8 +154,9 @@ class AssignActiveAttribValueToSelection(bpy.types.Operator):
                 if etc.get_blender_support((4,1,0)) and dt in ["INT32_2D", "QUATERNION", "FLOAT4X4"]:
                     etc.log(AssignActiveAttribValueToSelection, f"Using ops.mesh_attribute_set() failed due to a blender bug, using pre 3.5 method", etc.ELogLevel.WARNING)
 
-            # Use custom method
-            bpy.ops.object.mode_set(mode='OBJECT')
+            # Use custom method, on the BMesh if possible to avoid switching to object mode
+            if not func.is_edit_mode_bmesh_supported(obj_data, dt, active_attrib_name, obj_data.attributes[active_attrib_name].domain):
+                bpy.ops.object.mode_set(mode='OBJECT')
             attribute = obj_data.attributes[active_attrib_name] #!important
 
             # Get value from GUI
@@ -392,7 +393,7 @@ class CreateAttribFromData(bpy.types.Operator):
                 return False
 
         # UVMaps
-        if self.domain_data_type_enum in ["SELECTED_VERTICES_IN_UV_EDITOR", "SELECTED_EDGES_IN_UV_EDITOR", "PINNED_VERTICES_IN_UV_EDITOR", 'UVMAP']: 
+        if self.domain_data_type_enum in ["SELECTED_VERTICES_IN_UV_EDITOR", "SELECTED_EDGES_IN_UV_EDITOR", "PINNED_VERTICES_IN_UV_EDITOR", 'UVMAP', 'UV_ISLAND']: 
             if self.enum_uvmaps == 'NULL':
                 if not self.b_batch_convert_enabled:
                     self.report({'ERROR'}, f"No UVMap selected. Nothing done")
@@ -516,11 +517,38 @@ class CreateAttribFromData(bpy.types.Operator):
         # "SELECTED_EDGES_IN_UV_EDITOR", 
         # "PINNED_VERTICES_IN_UV_EDITOR", 
         # 'UVMAP'
+        # 'UV_ISLAND'
         else:
             if func.is_verbose_mode_enabled():
                 print(f"Batch converting {self.domain_data_type_enum}, "\
                         f"element count: {func.get_all_mesh_data_indexes_of_type(obj, self.domain_data_type_enum)}")
 
+            # Attributes are created and written at once, then converted (optional)
+            transaction = func.AttributeWriteTransaction()
+            creation_indexes = []
+
+            # Weights of all vertex groups are read once and sliced for each group
+            vg_weights = None
+            if self.domain_data_type_enum in ['VERT_IS_IN_VERTEX_GROUP', "VERT_FROM_VERTEX_GROUP"]:
+                vg_weights = func.VertexGroupWeights(obj)
+
+            # Data of all elements read at once, {element: values}
+            batch_data = None
+
+            # Positions of all shape keys are read once, offsets of all of them are computed at once
+            if self.domain_data_type_enum in ["VERT_SHAPE_KEY_POSITION", "VERT_SHAPE_KEY_POSITION_OFFSET"]:
+                batch_data = func.get_shape_key_positions(obj)
+                if self.domain_data_type_enum == "VERT_SHAPE_KEY_POSITION_OFFSET":
+                    if self.b_offset_from_offset_to_toggle:
+                        batch_data = batch_data[int(self.enum_shape_keys_offset_target)] - batch_data
+                    else:
+                        batch_data = batch_data - batch_data[int(self.enum_shape_keys)]
+            
+            # Material indexes are read once and compared to each material
+            elif self.domain_data_type_enum == "FACE_IS_MATERIAL_ASSIGNED":
+                material_indexes = func.get_all_mesh_data_indexes_of_type(obj, self.domain_data_type_enum)
+                batch_data = dict(zip(material_indexes, func.get_face_material_masks(obj, material_indexes)))
+
             for element_index, element in enumerate(func.get_all_mesh_data_indexes_of_type(obj, self.domain_data_type_enum)):
                 
                 if func.is_verbose_mode_enabled():
@@ -597,7 +625,7 @@ class CreateAttribFromData(bpy.types.Operator):
                     face_map = func.get_face_maps_enum(self, context)[element][1]
                     fm_index = element
 
-                elif self.domain_data_type_enum in ["SELECTED_VERTICES_IN_UV_EDITOR", "SELECTED_EDGES_IN_UV_EDITOR", "PINNED_VERTICES_IN_UV_EDITOR", 'UVMAP']:
+                elif self.domain_data_type_enum in ["SELECTED_VERTICES_IN_UV_EDITOR", "SELECTED_EDGES_IN_UV_EDITOR", "PINNED_VERTICES_IN_UV_EDITOR", 'UVMAP', 'UV_ISLAND']:
                     uvmap = func.get_uvmaps_enum(self, context)[element][1]
                     uvmap_index = element
 
@@ -631,10 +659,7 @@ class CreateAttribFromData(bpy.types.Operator):
 
                 # Remove current attribute if overwrite is enabled
                 if self.b_overwrite and xname in obj.data.attributes:
-                    obj.data.attributes.remove(obj.data.attributes[xname])
-                
-                # Create new attribute
-                attrib = obj.data.attributes.new(name=xname, type=data_type, domain=self.target_attrib_domain_enum)
+                    transaction.remove(obj, xname)
 
                 # Fetch data
                 args = {'vg_index': vg_index,
@@ -643,19 +668,26 @@ class CreateAttribFromData(bpy.types.Operator):
                         'fm_index': fm_index,
                         'sel_mat': sel_mat, 
                         'mat_index': mat_index,
-                        'uvmap_index': uvmap_index
+                        'uvmap_index': uvmap_index,
+                        'vg_weights': vg_weights
                         }
-                obj_data = func.get_mesh_data(obj, 
-                                        self.domain_data_type_enum, 
-                                        self.target_attrib_domain_enum, 
-                                        **args)
+                if batch_data is not None:
+                    obj_data = batch_data[element]
+                else:
+                    obj_data = func.get_mesh_data(obj, 
+                                            self.domain_data_type_enum, 
+                                            self.target_attrib_domain_enum, 
+                                            **args)
                 
-                # Store data in attribute
-                func.set_attribute_values(attrib, obj_data)
+                # Create new attribute and store data in it
+                creation_indexes.append(transaction.create(obj, xname, data_type, self.target_attrib_domain_enum, obj_data))
+
+            transaction.commit()
 
-                # Convert to different type (optional)
-                if self.b_auto_convert:
-                    func.convert_attribute(self, obj, attrib.name, mode=self.enum_attrib_converter_mode, 
+            # Convert to different type (optional)
+            if self.b_auto_convert:
+                for creation_index in creation_indexes:
+                    func.convert_attribute(self, obj, transaction.created_names[creation_index], mode=self.enum_attrib_converter_mode, 
                                                domain=self.enum_attrib_converter_domain, 
                                                data_type=self.enum_attrib_converter_datatype)
 
@@ -736,7 +768,7 @@ class CreateAttribFromData(bpy.types.Operator):
             row.prop(self, "enum_vertex_groups", text="Vertex Group")
         
         # UVMap domain selection
-        elif (self.domain_data_type_enum in ["SELECTED_VERTICES_IN_UV_EDITOR", "SELECTED_EDGES_IN_UV_EDITOR", "PINNED_VERTICES_IN_UV_EDITOR", 'UVMAP'] and
+        elif (self.domain_data_type_enum in ["SELECTED_VERTICES_IN_UV_EDITOR", "SELECTED_EDGES_IN_UV_EDITOR", "PINNED_VERTICES_IN_UV_EDITOR", 'UVMAP', 'UV_ISLAND'] and
                 not self.b_batch_convert_enabled):
                 row.prop(self, "enum_uvmaps", text="UV Map")
         else:
@@ -802,7 +834,7 @@ class DuplicateAttribute(bpy.types.Operator):
 
         new_attrib = obj.data.attributes.new(name=src_attrib.name, type=src_attrib.data_type, domain=src_attrib.domain)
 
-        func.set_attribute_values(new_attrib, func.get_attribute_values(src_attrib, obj))
+        func.set_attribute_values(new_attrib, func.get_attribute_values(src_attrib, obj, as_numpy=True))
         
         bpy.ops.object.mode_set(mode=current_mode)
         return {'FINISHED'}
@@ -864,6 +896,10 @@ class InvertAttribute(bpy.types.Operator):
         elif context.active_object.data.attributes.active is None:
             self.poll_message_set("No active attribute")
             return False
+        elif (context.active_object.data.attributes.active.data_type in static_data.attribute_data_types 
+              and not len(static_data.attribute_data_types[context.active_object.data.attributes.active.data_type].supported_attribute_invert_modes)):
+            self.poll_message_set("Attributes of this data type cannot be inverted")
+            return False
         elif not func.pinned_mesh_poll(self, context, False):
             return False
         return True
@@ -878,65 +914,55 @@ class InvertAttribute(bpy.types.Operator):
             self.report({'ERROR'}, "Attribute data type or domain unsupported! Addon needs an update.")
             return {'CANCELLED'}
 
-
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # Attribute values and selection are edited on the BMesh in edit mode, no need to switch to object mode
+        if not func.is_edit_mode_bmesh_supported(obj.data, obj.data.attributes[src_attrib_name].data_type, src_attrib_name, obj.data.attributes[src_attrib_name].domain):
+            bpy.ops.object.mode_set(mode='OBJECT')
 
         src_attrib = obj.data.attributes[src_attrib_name] # !important
         
         # get selected domain indexes
-        selected = func.get_mesh_selected_domain_indexes(obj, src_attrib.domain, self.b_face_corner_spill)
+        selected = func.get_mesh_selection_mask(obj, src_attrib.domain, self.b_face_corner_spill)
         if func.is_verbose_mode_enabled():
-            print(f"Selected domain indexes: {selected}")
+            print(f"Selected domain indexes: {selected.to_indexes()}")
         
         # No selection and selection mode is enabled?
-        if not len(selected) and self.b_edit_mode_selected_only:
+        if not selected.any() and self.b_edit_mode_selected_only:
             self.report({'ERROR'}, f"No selection to perform the operations onto")
             bpy.ops.object.mode_set(mode=current_mode)
             return {'CANCELLED'}
         
-        # # numbers:
-        # else:
-        prop_name = func.get_attribute_value_propname(src_attrib)
-        
-        storage = func.get_attribute_values(src_attrib, obj)
-        
-        # int just get and multiply by -1
-        if src_attrib.data_type in ['INT','INT8']:
-            src_attrib.data.foreach_get(prop_name, storage)
-            storage = [-v if not self.b_edit_mode_selected_only or i in selected else v for i, v in enumerate(storage) ]
-        
-        # strings reverse them
-        elif src_attrib.data_type in ['STRING']:
-            storage = [string[::-1] if not self.b_edit_mode_selected_only or i in selected else string for i, string in enumerate(storage) ]
+        values = func.AttributeArray(src_attrib)
 
-        # for floats just get it as there is multiple modes
-        elif src_attrib.data_type in ['FLOAT']:
-            src_attrib.data.foreach_get(prop_name, storage)
+        # Mask of the domains to invert
+        if self.b_edit_mode_selected_only:
+            mask = selected.mask
+        else:
+            mask = np.ones(len(values), dtype=bool)
         
+        # Invert modes available for this data type, color attributes have their own dropdown menu
+        layout = func.get_attribute_buffer_layout(src_attrib.data_type)
+        invert_mode = self.color_invert_mode_enum if layout.buffer_foreach_prop == 'color' else self.invert_mode_enum
+        if invert_mode not in layout.supported_attribute_invert_modes:
+            invert_mode = layout.supported_attribute_invert_modes[0]
+
         # booleans just not them
-        elif src_attrib.data_type =='BOOLEAN':
-            src_attrib.data.foreach_get(prop_name, storage)
-            storage = [not v if not self.b_edit_mode_selected_only or i in selected else v for i, v in enumerate(storage)]
+        if invert_mode == "NOT":
+            values[mask] = np.logical_not(values[mask])
         
-        # vectors get them as a single list
-        elif src_attrib.data_type in ['FLOAT_VECTOR', 'FLOAT2', 'FLOAT_COLOR', 'BYTE_COLOR', 'QUATERNION', 'INT32_2D']:
-            storage = [val for vec in storage for val in vec]
-            src_attrib.data.foreach_get(prop_name, storage)
-
-        # invert modes for vectors and float
-        if src_attrib.data_type in ['FLOAT', 'FLOAT_VECTOR', 'FLOAT2', 'FLOAT_COLOR', 'BYTE_COLOR', 'QUATERNION', 'INT32_2D']:
-            invert_mode = self.color_invert_mode_enum if src_attrib.data_type in ['FLOAT_COLOR', 'BYTE_COLOR'] else self.invert_mode_enum
-
-            #ah vectors, yes
-            skip = len(func.get_attribute_default_value(src_attrib)) if not src_attrib.data_type == 'FLOAT' else 1
-            if invert_mode == "MULTIPLY_MINUS_ONE":
-                storage = [v * -1 if not self.b_edit_mode_selected_only or int(i/skip) in selected else v for i, v in enumerate(storage)]
-            elif invert_mode == "SUBTRACT_FROM_ONE":
-                storage = [1-v if not self.b_edit_mode_selected_only or int(i/skip) in selected else v for i, v in enumerate(storage)] 
-            elif invert_mode == "ADD_TO_MINUS_ONE":
-                storage = [-1+v if not self.b_edit_mode_selected_only or int(i/skip) in selected else v for i, v in enumerate(storage)] 
+        # strings reverse them
+        elif invert_mode == "REVERSE_ORDER":
+            values[mask] = [string[::-1] for string in values[mask]]
+        
+        # numeric values, the buffer dtype is kept
+        elif invert_mode == "MULTIPLY_MINUS_ONE":
+            values[mask] = -values[mask]
+        elif invert_mode == "SUBTRACT_FROM_ONE":
+            values[mask] = 1 - values[mask]
+        elif invert_mode == "ADD_TO_MINUS_ONE":
+            values[mask] = -1 + values[mask]
         
-        func.set_attribute_values(src_attrib, storage, flat_list=True)
+        # Strings are set only on inverted domains
+        values.commit()
         
         obj.data.update()
 
@@ -952,7 +978,7 @@ class InvertAttribute(bpy.types.Operator):
         obj = context.active_object
 
         # Show the drop-down menu for invert mode types
-        prop = "invert_mode_enum" if context.active_object.data.attributes.active.data_type not in ['FLOAT_COLOR', 'BYTE_COLOR'] else "color_invert_mode_enum"
+        prop = "invert_mode_enum" if func.get_attribute_value_propname(context.active_object.data.attributes.active) != 'color' else "color_invert_mode_enum"
         sub_box = row.row()
         sub_box.enabled = len(func.get_attribute_invert_modes(self, context)) != 1
         sub_box.prop(self, prop, text="Invert Mode")
@@ -1859,101 +1885,92 @@ class CopyAttributeToSelected(bpy.types.Operator):
         bpy.ops.object.mode_set(mode='OBJECT')
 
         for sel_obj in [sel_obj for sel_obj in bpy.context.selected_objects if sel_obj.type =='MESH' and sel_obj is not src_obj]:
-            for src_attrib_name in attribute_names_to_copy:
-                src_attrib = src_obj.data.attributes[src_attrib_name] # !important
-                a_vals = func.get_attribute_values(src_attrib, src_obj)
+            # Create and write all attributes of this object at once
+            with func.AttributeWriteTransaction() as transaction:
+                for src_attrib_name in attribute_names_to_copy:
+                    src_attrib = src_obj.data.attributes[src_attrib_name] # !important
+                    a_vals = func.get_attribute_values(src_attrib, src_obj, as_numpy=True)
 
-                # get size of the source attribute domain
-                source_size = self.get_attribute_data_length(src_obj, src_attrib)
+                    # get size of the source attribute domain
+                    source_size = self.get_attribute_data_length(src_obj, src_attrib)
 
-                sel_obj_attr = None
+                    b_create = True
             
-                # check if present in target mesh
-                if src_attrib_name in [a.name for a in sel_obj.data.attributes]:
-                    etc.log(CopyAttributeToSelected, f"Attribute {src_attrib.name} exists on target", etc.ELogLevel.VERBOSE)
+                    # check if present in target mesh
+                    if src_attrib_name in sel_obj.data.attributes:
+                        etc.log(CopyAttributeToSelected, f"Attribute {src_attrib.name} exists on target", etc.ELogLevel.VERBOSE)
 
-                    sel_obj_attr = sel_obj.data.attributes[src_attrib_name]
+                        sel_obj_attr = sel_obj.data.attributes[src_attrib_name]
 
-                    # overwrite if present?
-                    if not self.b_overwrite:
-                        continue
+                        # overwrite if present?
+                        if not self.b_overwrite:
+                            continue
                     
-                    #overwrite different type?
-                    not_same_type = sel_obj_attr.domain != src_attrib.domain or sel_obj_attr.data_type != src_attrib.data_type
-                    if not_same_type and not self.b_overwrite_different_type:
+                        #overwrite different type?
+                        not_same_type = sel_obj_attr.domain != src_attrib.domain or sel_obj_attr.data_type != src_attrib.data_type
+                        if not_same_type and not self.b_overwrite_different_type:
 
-                        etc.log(CopyAttributeToSelected, f"Attribute {src_attrib.name} is not the same type as {sel_obj_attr.name}, {sel_obj_attr.domain}!={src_attrib.domain} or {sel_obj_attr.data_type}!={src_attrib.data_type}", etc.ELogLevel.VERBOSE)
+                            etc.log(CopyAttributeToSelected, f"Attribute {src_attrib.name} is not the same type as {sel_obj_attr.name}, {sel_obj_attr.domain}!={src_attrib.domain} or {sel_obj_attr.data_type}!={src_attrib.data_type}", etc.ELogLevel.VERBOSE)
 
-                        continue
+                            continue
                     
-                    # remove current if overwriting
-                    elif not_same_type:
-                        sel_obj.data.attributes.remove(sel_obj_attr)
-
-                else:
-                    sel_obj_attr = sel_obj.data.attributes.new(name=src_attrib_name, type=src_attrib.data_type, domain=src_attrib.domain)
+                        # remove current if overwriting
+                        elif not_same_type:
+                            transaction.remove(sel_obj, src_attrib_name)
+                        
+                        # write to current if same type
+                        else:
+                            b_create = False
                     
-                # size check
+                    # size check
 
-                # check if the target mesh has different amount of faces/verts/etc.
-                target_size = self.get_attribute_data_length(sel_obj, sel_obj_attr)
-
-                if sel_obj_attr.domain == 'POINT':
-                    target_size = len(sel_obj.data.vertices)
-                elif sel_obj_attr.domain == 'EDGE':
-                    target_size = len(sel_obj.data.edges)
-                elif sel_obj_attr.domain == 'FACE':
-                    target_size = len(sel_obj.data.polygons)
-                else:
-                    target_size = len(sel_obj.data.loops)
+                    # check if the target mesh has different amount of faces/verts/etc.
+                    # the target attribute is of the same domain as source
+                    target_size = self.get_attribute_data_length(sel_obj, src_attrib)
                 
-                # case: target is larger
-                if target_size > source_size:
+                    # case: target is larger
+                    if target_size > source_size:
                     
-                    # Fill extra with single value
-                    if self.extend_mode_enum not in ["REPEAT", "PING_PONG"]: 
+                        # Fill extra with single value, empty source has no values to repeat
+                        if self.extend_mode_enum not in ["REPEAT", "PING_PONG"] or source_size == 0: 
                         
-                        # With value on last index
-                        if self.extend_mode_enum =='LAST_VAL':
-                            fill_value = [a_vals[-1]]
+                            # With value on last index
+                            if self.extend_mode_enum =='LAST_VAL' and source_size > 0:
+                                fill_value = a_vals[-1:]
 
-                        # With 'zero' value
-                        elif self.extend_mode_enum =='ZERO':
-                            fill_value = func.get_attribute_default_value(src_attrib)
-                            fill_value = [fill_value]
+                            # With 'zero' value
+                            else:
+                                fill_value = func.get_attribute_default_value(src_attrib)
+                                fill_value = np.array([fill_value], dtype=a_vals.dtype).reshape((1,) + a_vals.shape[1:])
 
-                        target_a_vals = a_vals + (fill_value * (target_size-source_size))
+                            target_a_vals = np.concatenate((a_vals, np.repeat(fill_value, target_size-source_size, axis=0)))
                     
-                    # Fill extra with non-single value
-                    else:
-                        times = target_size - source_size
+                        # Fill extra with non-single value
+                        else:
+                            times = int(np.ceil(target_size / source_size))
 
-                        # Repeat from start
-                        if self.extend_mode_enum =="REPEAT":
-                            target_a_vals = a_vals * times
+                            # Repeat from start
+                            if self.extend_mode_enum =="REPEAT":
+                                target_a_vals = np.concatenate([a_vals] * times)
                         
-                        # Repeat but from end to start then from start to end
-                        elif self.extend_mode_enum == "PING_PONG":
-                            target_a_vals = []
-                            for t in range(0, times):
-                                if t%2:
-                                    target_a_vals += a_vals[::-1]
-                                else:
-                                    target_a_vals += a_vals
-
-                        target_a_vals = target_a_vals[:target_size]
-
-                # case: target is smaller
-                elif target_size < source_size:
-                    target_a_vals = a_vals[:target_size]
-                
-                # case: target is same size
-                else:
-                    target_a_vals = a_vals
+                            # Repeat but from end to start then from start to end
+                            elif self.extend_mode_enum == "PING_PONG":
+                                target_a_vals = np.concatenate([a_vals[::-1] if t%2 else a_vals for t in range(0, times)])
+
+                            target_a_vals = target_a_vals[:target_size]
 
-                func.set_attribute_values(sel_obj_attr, target_a_vals)
+                    # case: target is smaller
+                    elif target_size < source_size:
+                        target_a_vals = a_vals[:target_size]
+                
+                    # case: target is same size
+                    else:
+                        target_a_vals = a_vals
 
-                sel_obj.data.update()
+                    if b_create:
+                        transaction.create(sel_obj, src_attrib_name, src_attrib.data_type, src_attrib.domain, target_a_vals)
+                    else:
+                        transaction.write(sel_obj, src_attrib_name, target_a_vals)
 
         bpy.ops.object.mode_set(mode=current_mode)
 
@@ -2065,6 +2082,11 @@ class ConditionalSelection(bpy.types.Operator):
         val_int32_2d: bpy.props.IntVectorProperty(name="2D Integer Vector Value", size=2, default=(0,0))
     if etc.get_blender_support(static_data.attribute_data_types['QUATERNION'].min_blender_ver, static_data.attribute_data_types['QUATERNION'].unsupported_from_blender_ver):
         val_quaternion: bpy.props.FloatVectorProperty(name="Quaternion Value", size=4, default=(1.0,0.0,0.0,0.0))
+    if etc.get_blender_support(static_data.attribute_data_types['FLOAT4X4'].min_blender_ver, static_data.attribute_data_types['FLOAT4X4'].unsupported_from_blender_ver):
+        val_float4x4: bpy.props.FloatVectorProperty(name="Matrix Value", size=16, default=static_data.attribute_data_types['FLOAT4X4'].default_value)
+
+    # Toggles for enabling comparing the individual matrix cells, in row order
+    val_matrix_cell_toggles: bpy.props.BoolVectorProperty(name="Matrix Cells", size=16, default=[True] * 16)
 
     # Toggles for enabling comparing the individual vector/color values
 
@@ -2108,14 +2130,15 @@ class ConditionalSelection(bpy.types.Operator):
         current_mode = obj.mode
         
         attribute_name = obj.data.attributes.active.name
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # Attribute values and selection are edited on the BMesh in edit mode, no need to switch to object mode
+        if not func.is_edit_mode_bmesh_supported(obj.data, obj.data.attributes[attribute_name].data_type, attribute_name, obj.data.attributes[attribute_name].domain):
+            bpy.ops.object.mode_set(mode='OBJECT')
         attrib = obj.data.attributes[attribute_name]
 
         condition = self.attribute_comparison_condition_enum
         comparison_value = None
         attrib_data_type = attrib.data_type
         case_sensitive_comp = False
-        filtered_indexes = []
         
         def debug_print():
             print(f"""ConditionalSelectionTrigger
@@ -2124,28 +2147,23 @@ CompVal: {comparison_value}
 CmpType: {self.vector_value_cmp_type_enum}
 DataType: {attrib_data_type}
 CaseSensitive: {self.b_string_case_sensitive}
-FiltIndex: {filtered_indexes}
+FiltCount: {filtered.count()}
 VecSingleVal: {self.b_single_value_vector}
 VecSingleCondition: {self.b_single_condition_vector}""")
 
         
 
-        def compare_each_vector_dimension_indexes(vals_list, mode='AND'):
+        def combine_dimension_masks(masks, mode='AND'):
             """
-            Compares each dimension of vals_list input if all of them contain that index (AND), or any of them (OR)
+            Combines the masks of each dimension, selecting domains that meet all of the conditions (AND), or any of them (OR)
             """
-            if mode == 'AND':
-                common = np.array(vals_list[0], dtype=int)
-                # check 2nd and higher dimension
-                for i in range(1, len(vals_list)):
-                    common = np.intersect1d(common, vals_list[i])
-                return common
+            if not len(masks):
+                return func.SelectionMask.none(func.get_domain_size(obj, attrib.domain), attrib.domain)
             
-            elif mode == 'OR':
-                r = []
-                for dimension in vals_list:
-                    r += dimension
-                return np.unique(r)
+            common = masks[0]
+            for mask in masks[1:]:
+                common = common & mask if mode == 'AND' else common | mask
+            return common
 
         
         gui_prop_subtype = static_data.attribute_data_types[attrib_data_type].gui_prop_subtype
@@ -2156,21 +2174,44 @@ VecSingleCondition: {self.b_single_condition_vector}""")
                                 static_data.EDataTypeGuiPropType.STRING]:
             comparison_value = getattr(self, f'val_{attrib_data_type.lower()}')
             
-            filtered_indexes = func.get_filtered_indexes_by_condition(func.get_attribute_values(attrib, obj), 
-                                                                      condition, 
-                                                                      comparison_value, 
-                                                                      self.b_string_case_sensitive)
+            # Strings are compared on the table of unique strings only
+            if attrib_data_type == 'STRING':
+                categories, codes = func.get_string_attribute_encoded(attrib)
+                filtered = func.SelectionMask(func.get_string_condition_mask(categories, 
+                                                                             codes, 
+                                                                             condition, 
+                                                                             comparison_value, 
+                                                                             self.b_string_case_sensitive), attrib.domain)
+            else:
+                filtered = func.SelectionMask(func.get_filtered_mask_by_condition(func.get_attribute_values_cached(attrib), 
+                                                                                  condition, 
+                                                                                  comparison_value, 
+                                                                                  self.b_string_case_sensitive), attrib.domain)
 
             
-        # case 2: vectors/colors
+        # case 2: matrices, each enabled cell compared with single condition
+        elif static_data.attribute_data_types[attrib_data_type].large_capacity_vector:
+            vals_to_cmp = []
+            src_data = func.get_attribute_values_cached(attrib)
+            cells = src_data.reshape(len(src_data), -1)
+            comparison_values = getattr(self, f"val_{attrib_data_type.lower()}")
+
+            for i in range(0, cells.shape[1]):
+                if self.val_matrix_cell_toggles[i]:
+                    etc.log(ConditionalSelection, f"Checking matrix cell [{i}], condition: {condition}, to value {comparison_values[i]}", etc.ELogLevel.VERBOSE)
+                    vals_to_cmp.append(func.SelectionMask(func.get_filtered_mask_by_condition(cells[:, i], condition, comparison_values[i]), attrib.domain))
+            
+            filtered = combine_dimension_masks(vals_to_cmp, self.vector_value_cmp_type_enum)
+
+        # case 3: vectors/colors
         elif gui_prop_subtype in [static_data.EDataTypeGuiPropType.VECTOR,
                                   static_data.EDataTypeGuiPropType.COLOR]:
             vals_to_cmp = []
-            filtered_indexes = []
-            src_data = np.array(func.get_attribute_values(attrib, obj))
+            src_data = func.get_attribute_values_cached(attrib)
             use_hsv = self.color_value_type_enum == 'HSVA' and gui_prop_subtype == static_data.EDataTypeGuiPropType.COLOR
             
             if use_hsv:
+                src_data = src_data.copy()
                 for i, subelement in enumerate(src_data):
                     etc.log(ConditionalSelection, "HSV mode enabled, converting all values to HSV", etc.ELogLevel.VERBOSE)
 
@@ -2182,17 +2223,18 @@ VecSingleCondition: {self.b_single_condition_vector}""")
                     condition = getattr(self, f'vec_0_condition_enum' if self.b_single_condition_vector else f'vec_{i}_condition_enum') 
                     comparison_value = getattr(self, f"val_{attrib_data_type.lower()}")[0] if self.b_single_value_vector else getattr(self, f"val_{attrib_data_type.lower()}")[i]
                     
-                    srgb_convert = attrib.data_type == 'BYTE_COLOR'
+                    # Values stored in sRGB are read linear, compare them in the same color space as in the UI
+                    srgb_convert = func.get_attribute_buffer_layout(attrib.data_type).buffer_srgb
                     etc.log(ConditionalSelection, f"Checking vector[{i}], condition: {condition}, to value {comparison_value}", etc.ELogLevel.VERBOSE)
-                    vals_to_cmp.append(func.get_filtered_indexes_by_condition([vec[i] for vec in src_data], condition, comparison_value, vector_convert_to_srgb=srgb_convert))
+                    vals_to_cmp.append(func.SelectionMask(func.get_filtered_mask_by_condition(src_data[:, i], condition, comparison_value, vector_convert_to_srgb=srgb_convert), attrib.domain))
             
-            filtered_indexes = compare_each_vector_dimension_indexes(vals_to_cmp, self.vector_value_cmp_type_enum)
+            filtered = combine_dimension_masks(vals_to_cmp, self.vector_value_cmp_type_enum)
 
         
         debug_print()
 
         
-        func.set_selection_or_visibility_of_mesh_domain(obj, attrib.domain, filtered_indexes, not self.b_deselect)
+        func.set_selection_or_visibility_of_mesh_domain(obj, attrib.domain, filtered, not self.b_deselect)
 
         bpy.ops.object.mode_set(mode=current_mode)
         return {"FINISHED"}
@@ -2232,6 +2274,31 @@ VecSingleCondition: {self.b_single_condition_vector}""")
             grid.prop(self, f"val_{dt.lower()}", text=text, toggle=True)
             if e_datatype == static_data.EAttributeDataType.STRING:
                 layout.prop(self, "b_string_case_sensitive", text="Not Case Sensitive" if not self.b_string_case_sensitive else "Case Sensitive", toggle=True)
+
+        # For matrices, a grid of cell toggles and values
+        elif static_data.attribute_data_types[dt].large_capacity_vector:
+            width = static_data.attribute_data_types[dt].large_capacity_vector_size_width
+            height = static_data.attribute_data_types[dt].large_capacity_vector_size_height
+            v_subelements = static_data.attribute_data_types[dt].vector_subelements_names
+
+            layout.prop(self, "attribute_comparison_condition_enum", text="Condition")
+
+            col = layout.column(align=True)
+            for y in range(0, height):
+                row = col.row(align=True)
+                for x in range(0, width):
+                    i = y * width + x
+                    cell = row.row(align=True)
+                    cell.prop(self, "val_matrix_cell_toggles", index=i, text=v_subelements[i], toggle=True)
+                    subcell = cell.row(align=True)
+                    subcell.enabled = self.val_matrix_cell_toggles[i]
+                    subcell.prop(self, f"val_{dt.lower()}", index=i, text="")
+            
+            row = layout.row(align=True)
+            subrow = row.row(align=True)
+            subrow.prop(self, 'b_deselect', text=f"Select {func.get_friendly_domain_name(domain, True)}" if not self.b_deselect else f"Deselect {func.get_friendly_domain_name(domain, True)}", toggle=True, invert_checkbox=True)   
+            subrow.ui_units_x = 5
+            row.prop(self, 'vector_value_cmp_type_enum', text="")
         
         # For vectors of any type
         elif gui_prop_subtype in [static_data.EDataTypeGuiPropType.VECTOR, static_data.EDataTypeGuiPropType.COLOR]:
@@ -2430,55 +2497,43 @@ class ReadValueFromSelectedDomains(bpy.types.Operator):
             self.report({'ERROR'}, "Attribute data type or domain unsupported! Addon needs an update.")
             return {'CANCELLED'}
 
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # Attribute values and selection are edited on the BMesh in edit mode, no need to switch to object mode
+        if not func.is_edit_mode_bmesh_supported(obj.data, obj.data.attributes[active_attribute_name].data_type, active_attribute_name, obj.data.attributes[active_attribute_name].domain):
+            bpy.ops.object.mode_set(mode='OBJECT')
 
         attribute = obj.data.attributes[active_attribute_name]
         prop_group = context.object.data.MAME_PropValues
         domain = obj.data.attributes[active_attribute_name].domain
         dt = attribute.data_type
 
-        domain_indexes = func.get_mesh_selected_domain_indexes(obj, domain, prop_group.face_corner_spill)
+        selection = func.get_mesh_selection_mask(obj, domain, prop_group.face_corner_spill)
 
-        if not len(domain_indexes):
+        if not selection.any():
             self.report({'ERROR'}, f"No selected {func.get_friendly_domain_name(domain)}")
             bpy.ops.object.mode_set(mode='EDIT')
             return {'CANCELLED'}
 
+        values = func.get_attribute_values_cached(attribute)
+
         # Get the value to set in GUI
         if dt in ['STRING', 'BOOLEAN']:
             # get the value from first index of selection
-            if len(domain_indexes) > 1:
+            if selection.count() > 1:
                 self.report({'WARNING'}, f"Tip: select single {func.get_friendly_domain_name(domain)} instead to always get expected result for {func.get_friendly_data_type_name(dt)}s")
-            attribute_value = getattr(obj.data.attributes[active_attribute_name].data[domain_indexes[0]], func.get_attribute_value_propname(attribute))
+            attribute_value = values[int(selection.to_indexes()[0])]
+            if dt == 'BOOLEAN':
+                attribute_value = bool(attribute_value)
         else:
             # Get average for numeric
+            attribute_value = values[selection.mask].mean(axis=0, dtype=np.float64)
 
+            # Get int for ints
+            if np.issubdtype(values.dtype, np.integer):
+                attribute_value = np.round(attribute_value).astype(int)
 
-            # get default value to calc the avg
-            attribute_value = func.get_attribute_default_value(attribute)
-            if type(attribute_value) == list:
-                    attribute_value = tuple(attribute_value)
-
-            # get the total
-            for vi in domain_indexes:
-                val = getattr(obj.data.attributes[active_attribute_name].data[vi], func.get_attribute_value_propname(attribute))
-                
-                if type(val) in [bpy_types.bpy_prop_array, Vector]:
-                    val = tuple(val)
-                    attribute_value = tuple(vv+attribute_value[i] for i, vv in enumerate(val))
-                else:
-                    attribute_value += val
-
-            # and the avg
-            if type(attribute_value) == tuple:
-                attribute_value = tuple(tv/len(domain_indexes) for tv in attribute_value)
-            else:
-                attribute_value /= len(domain_indexes)
+            # Matrices are stored in GUI as flat 16 values
+            attribute_value = tuple(attribute_value.reshape(-1).tolist()) if attribute_value.ndim else attribute_value.item()
         
-        # Get int for ints
-        if dt in ['INT']:
-            attribute_value = int(round(attribute_value))
-
         # Set the attribute value in GUI
         setattr(prop_group, f'val_{dt.lower()}', attribute_value)
 
@@ -2551,6 +2606,14 @@ class RandomizeAttributeValue(bpy.types.Operator):
         quaternion_val_min: bpy.props.FloatVectorProperty(name="Min", size=4, default=(-1.0,-1.0,-1.0,-1.0), description="Minimum Quaternion Value")
         quaternion_val_max: bpy.props.FloatVectorProperty(name="Max", size=4, default=(1.0,1.0,1.0,1.0), description="Maximum Quaternion Value")
     
+    # Matrix values
+    if etc.get_blender_support(static_data.attribute_data_types['FLOAT4X4'].min_blender_ver, static_data.attribute_data_types['FLOAT4X4'].unsupported_from_blender_ver):
+        float4x4_val_min: bpy.props.FloatVectorProperty(name="Min", size=16, default=static_data.attribute_data_types['FLOAT4X4'].default_randomize_value_min, description="Minimum Matrix Cell Values")
+        float4x4_val_max: bpy.props.FloatVectorProperty(name="Max", size=16, default=static_data.attribute_data_types['FLOAT4X4'].default_randomize_value_max, description="Maximum Matrix Cell Values")
+    
+    # Toggles for randomizing the individual matrix cells, in row order
+    val_matrix_cell_toggles: bpy.props.BoolVectorProperty(name="Matrix Cells", size=16, default=[True] * 16)
+
     # Color values
     color_randomize_type: bpy.props.EnumProperty(
         name="Color Randomize Type",
@@ -2621,6 +2684,12 @@ class RandomizeAttributeValue(bpy.types.Operator):
                     self.report({"ERROR"}, "No random character types selected")
                     return False
                 
+        # Matrices check
+        elif static_data.attribute_data_types[dt].large_capacity_vector:
+            if not any(self.val_matrix_cell_toggles):
+                self.report({"ERROR"}, "No selected matrix cells to randomize")
+                return False
+
         # Vectors/colors check
         elif static_data.attribute_data_types[dt].gui_prop_subtype == static_data.EDataTypeGuiPropType.VECTOR:
             any_toggle_on = []
@@ -2644,7 +2713,9 @@ class RandomizeAttributeValue(bpy.types.Operator):
             self.report({'ERROR'}, "Attribute data type or domain unsupported! Addon needs an update.")
             return {'CANCELLED'}
 
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # Attribute values and selection are edited on the BMesh in edit mode, no need to switch to object mode
+        if not func.is_edit_mode_bmesh_supported(obj.data, obj.data.attributes[active_attribute_name].data_type, active_attribute_name, obj.data.attributes[active_attribute_name].domain):
+            bpy.ops.object.mode_set(mode='OBJECT')
 
         attribute = obj.data.attributes[active_attribute_name]
         prop_group = context.object.data.MAME_PropValues
@@ -2673,14 +2744,14 @@ class RandomizeAttributeValue(bpy.types.Operator):
 
         # Get domain ids for selection
         if self.b_on_selection:
-            on_domains = func.get_mesh_selected_domain_indexes(obj, domain, self.b_face_corner_spill)
-            if not len(on_domains):
+            on_domains = func.get_mesh_selection_mask(obj, domain, self.b_face_corner_spill)
+            if not on_domains.any():
                 self.report({"ERROR"}, "No selection in edit mode. (\"on selected\" mode was used)")
                 bpy.ops.object.mode_set(mode=current_mode)
                 return {'CANCELLED'}
 
         else:
-            on_domains = np.arange(0, len(attribute.data))
+            on_domains = func.SelectionMask.all(func.get_domain_size(obj, domain), domain)
 
         # Get values set in UI
         rnd_min = None
@@ -2695,19 +2766,19 @@ class RandomizeAttributeValue(bpy.types.Operator):
                     static_data.EAttributeDataType.FLOAT_VECTOR,
                     static_data.EAttributeDataType.BYTE_COLOR,
                     static_data.EAttributeDataType.QUATERNION,
+                    static_data.EAttributeDataType.FLOAT4X4,
                     static_data.EAttributeDataType.STRING]:
             rnd_min = getattr(self, f"{dt.lower()}_val_min")
             rnd_max = getattr(self, f"{dt.lower()}_val_max")
         
         
-        # Read current values
-        storage = func.get_attribute_values(attribute, obj)
-        etc.log(RandomizeAttributeValue, f"Current values:{np.array(storage)}", etc.ELogLevel.VERBOSE)
+        # Current values, read only if needed
+        values = func.AttributeArray(attribute)
 
         # Get random values list
         rnd_vals = func.get_random_attribute_of_data_type(context, 
                                                               dt, 
-                                                              len(on_domains),
+                                                              on_domains.count(),
                                                               no_list=False,
                                                               randomize_once=self.b_single_random_value,
                                                               range_min=rnd_min,
@@ -2723,13 +2794,16 @@ class RandomizeAttributeValue(bpy.types.Operator):
                                                               b_vec_1=self.val_vector_1_toggle,
                                                               b_vec_2=self.val_vector_2_toggle,
                                                               b_vec_3=self.val_vector_3_toggle,
-                                                              src_attribute=attribute,
+                                                              matrix_cell_toggles=self.val_matrix_cell_toggles,
+                                                              src_attribute=values,
+                                                              src_indexes=on_domains.mask,
                                                               obj=obj)
 
         etc.log(RandomizeAttributeValue, f"Randomized values:{rnd_vals}", etc.ELogLevel.VERBOSE)
 
         # Set the values
-        func.set_attribute_values(attribute, rnd_vals, on_domains)
+        values[on_domains.mask] = rnd_vals
+        values.commit()
         
         obj.data.update()
         bpy.ops.object.mode_set(mode=current_mode)
@@ -2754,6 +2828,29 @@ class RandomizeAttributeValue(bpy.types.Operator):
             col.prop(self, f"{dt.lower()}_val_min", text="Min")
             col.prop(self, f"{dt.lower()}_val_max", text="Max")
 
+        # matrices, min and max grids with a toggle for each cell
+        elif static_data.attribute_data_types[dt].large_capacity_vector:
+            width = static_data.attribute_data_types[dt].large_capacity_vector_size_width
+            height = static_data.attribute_data_types[dt].large_capacity_vector_size_height
+            v_subelements = static_data.attribute_data_types[dt].vector_subelements_names
+
+            for minmax in ['min', 'max']:
+                col = self.layout.column(align=True)
+                col.label(text=minmax.capitalize())
+                for y in range(0, height):
+                    row = col.row(align=True)
+                    for x in range(0, width):
+                        sub_row = row.row(align=True)
+                        sub_row.enabled = self.val_matrix_cell_toggles[y * width + x]
+                        sub_row.prop(self, f"{dt.lower()}_val_{minmax}", text="", index=y * width + x)
+            
+            col = self.layout.column(align=True)
+            col.label(text="Enable")
+            for y in range(0, height):
+                row = col.row(align=True)
+                for x in range(0, width):
+                    row.prop(self, "val_matrix_cell_toggles", index=y * width + x, text=v_subelements[y * width + x], toggle=True)
+
         # vectors & colors
         elif gui_prop_subtype in [static_data.EDataTypeGuiPropType.VECTOR, static_data.EDataTypeGuiPropType.COLOR]:
             
@@ -3708,19 +3805,16 @@ class AttributesToImage(bpy.types.Operator):
                 bpy.ops.object.bake(type='EMIT')
 
                 # Copy red channel to alpha channel to first image
-                pixelbuffer_RGB = np.zeros(len(image.pixels), dtype=np.float32)
                 image.update()
-                image.pixels.foreach_get(pixelbuffer_RGB)
-                np.delete(pixelbuffer_RGB, [a for a in range(3,len(pixelbuffer_RGB), 4)]) # remove exising alpha
-
                 alpha_image.update()
-                pixelbuffer_A = np.zeros(len(alpha_image.pixels), dtype=np.float32)
-                alpha_image.pixels.foreach_get(pixelbuffer_A)
-                pixelbuffer_A = np.take(pixelbuffer_A, [a for a in range(0,len(pixelbuffer_A), 4)]) # get r channel
-
-                np.put(pixelbuffer_RGB, [i for i in range(3, len(pixelbuffer_RGB), 4)], pixelbuffer_A) # insert new alpha
+                with func.scratch_buffer(np.float32, len(image.pixels)) as pixelbuffer_RGB, func.scratch_buffer(np.float32, len(alpha_image.pixels)) as pixelbuffer_A:
+                    image.pixels.foreach_get(pixelbuffer_RGB)
+                    alpha_image.pixels.foreach_get(pixelbuffer_A)
+                    
+                    # insert r channel as new alpha
+                    pixelbuffer_RGB[3::4] = pixelbuffer_A[0::4]
 
-                image.pixels.foreach_set(pixelbuffer_RGB)
+                    image.pixels.foreach_set(pixelbuffer_RGB)
                 image.update()
                 # cleanup
                 if not etc.get_preferences_attrib('bakematerial_donotdelete'):
@@ -578,10 +578,7 @@ class QuickSelectedInEditModeToSculptMask(bpy.types.Operator):
 
     def execute(self, context):
         obj = context.active_object
-        vals = np.zeros(len(obj.data.vertices), dtype=int)
-        
-        for i in func.get_mesh_selected_domain_indexes(obj, 'POINT'):
-            vals[i] = 1.0
+        vals = func.get_mesh_selection_mask(obj, 'POINT').mask.astype(int)
         func.set_mesh_data(obj, "TO_SCULPT_MODE_MASK", None, raw_data=vals, expand_sculpt_mask_mode='EXPAND', normalize_mask=True, invert_sculpt_mask=False)
         obj.data.update()
         return {'FINISHED'}
@@ -1136,8 +1133,12 @@ class SelectDomainButton(bpy.types.Operator):
         params['color_value_type_enum'] = 'RGBA'
         
         
+        # Enable comparing for each matrix cell
+        if static_data.attribute_data_types[dt].large_capacity_vector:
+            params['val_matrix_cell_toggles'] = [True] * static_data.attribute_data_types[dt].large_capacity_vector_size
+
         # Enable comparing for each vector dimension
-        if static_data.attribute_data_types[dt].gui_prop_subtype in [static_data.EDataTypeGuiPropType.VECTOR, 
+        elif static_data.attribute_data_types[dt].gui_prop_subtype in [static_data.EDataTypeGuiPropType.VECTOR, 
                                                                      static_data.EDataTypeGuiPropType.COLOR]:
             for i in range(0,len(static_data.attribute_data_types[dt].vector_subelements_names)):
                 params[f'val_vector_{i}_toggle'] = True
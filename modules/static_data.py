@@ -57,7 +57,7 @@ ObjectDataSource = namedtuple("MeshDataSource", [
 # Contains object data sources
 object_data_sources = {
     # Formattable string values:
-    #   face_map shape_key domain vertex_group material material_slot shape_key_to shape_key_from attribute
+    #   face_map shape_key domain vertex_group material material_slot shape_key_to shape_key_from attribute uvmap
     
     # ON ALL DOMAINS
     # --------------------------------------
@@ -164,6 +164,89 @@ object_data_sources = {
         ui_category = EObjectDataSourceUICategory.SHADING,
     ),
 
+    # MESH ISLANDS
+    # --------------------------------------
+
+    "VERTEX_ISLAND": ObjectDataSource(
+        enum_gui_friendly_name="Vertex Islands",
+        enum_gui_description="Create integer attribute with index of the island of vertices connected by edges",
+        attribute_auto_name="Vertex Island",
+        attribute_domain_on_default='POINT',
+        domains_supported=['POINT', 'EDGE', 'FACE', 'CORNER'],
+        data_type='INT',
+        min_blender_ver=None,
+        unsupported_from_blender_ver=None,
+        batch_convert_support=False,
+        valid_data_sources = ['MESH'],
+        icon= "STICKY_UVS_DISABLE",
+        quick_ui_exec_type = 'EXEC_DEFAULT',
+        ui_category = EObjectDataSourceUICategory.MISC_DATA,
+    ),
+
+    "FACE_ISLAND": ObjectDataSource(
+        enum_gui_friendly_name="Face Islands",
+        enum_gui_description="Create integer attribute with index of the island of faces connected by edges",
+        attribute_auto_name="Face Island",
+        attribute_domain_on_default='FACE',
+        domains_supported=['FACE', 'CORNER'],
+        data_type='INT',
+        min_blender_ver=None,
+        unsupported_from_blender_ver=None,
+        batch_convert_support=False,
+        valid_data_sources = ['MESH'],
+        icon= "FACESEL",
+        quick_ui_exec_type = 'EXEC_DEFAULT',
+        ui_category = EObjectDataSourceUICategory.MISC_DATA,
+    ),
+
+    "SEAM_ISLAND": ObjectDataSource(
+        enum_gui_friendly_name="Face Islands Delimited By Seams",
+        enum_gui_description="Create integer attribute with index of the island of faces connected by edges that are not marked as seams",
+        attribute_auto_name="Seam Island",
+        attribute_domain_on_default='FACE',
+        domains_supported=['FACE', 'CORNER'],
+        data_type='INT',
+        min_blender_ver=None,
+        unsupported_from_blender_ver=None,
+        batch_convert_support=False,
+        valid_data_sources = ['MESH'],
+        icon= "MOD_EDGESPLIT",
+        quick_ui_exec_type = 'EXEC_DEFAULT',
+        ui_category = EObjectDataSourceUICategory.MISC_DATA,
+    ),
+
+    "SHARP_ISLAND": ObjectDataSource(
+        enum_gui_friendly_name="Face Islands Delimited By Sharp Edges",
+        enum_gui_description="Create integer attribute with index of the island of faces connected by edges that are not marked as sharp",
+        attribute_auto_name="Sharp Island",
+        attribute_domain_on_default='FACE',
+        domains_supported=['FACE', 'CORNER'],
+        data_type='INT',
+        min_blender_ver=None,
+        unsupported_from_blender_ver=None,
+        batch_convert_support=False,
+        valid_data_sources = ['MESH'],
+        icon= "SHARPCURVE",
+        quick_ui_exec_type = 'EXEC_DEFAULT',
+        ui_category = EObjectDataSourceUICategory.MISC_DATA,
+    ),
+
+    "UV_ISLAND": ObjectDataSource(
+        enum_gui_friendly_name="UV Islands",
+        enum_gui_description="Create integer attribute with index of the UV island from selected UVMap",
+        attribute_auto_name="{uvmap} UV Island",
+        attribute_domain_on_default='FACE',
+        domains_supported=['FACE', 'CORNER'],
+        data_type='INT',
+        min_blender_ver=None,
+        unsupported_from_blender_ver=None,
+        batch_convert_support=True,
+        valid_data_sources = ['MESH'],
+        icon= "UV_ISLANDSEL",
+        quick_ui_exec_type = 'INVOKE_DEFAULT',
+        ui_category = EObjectDataSourceUICategory.UV,
+    ),
+
     # QUICK BOOLEANS
     # --------------------------------------
 
@@ -1476,6 +1559,7 @@ class EAttributeDataType(Enum):
     FLOAT2 = 8
     INT32_2D = 9
     QUATERNION = 10
+    FLOAT4X4 = 11
 
 # Defines the type of GUI input to show 
 class EDataTypeGuiPropType(Enum):
@@ -1543,6 +1627,12 @@ AttributeDataType = namedtuple("AttributeDataType", [
     "large_capacity_vector_size",               # Number of elements in the vector. It may not be columnx*rows from values below
     "large_capacity_vector_size_height",        # Number of columns, for a 4x3 matrix it would be 4
     "large_capacity_vector_size_width",         # Number of rows, for a 4x3 matrix it would be 3
+    "buffer_dtype",                             # The numpy dtype name of a foreach_get/foreach_set buffer, None if foreach is not supported (strings)
+    "buffer_components",                        # Number of buffer elements stored per single domain
+    "buffer_shape",                             # Shape of a single value, () for scalars, (3,) for 3D vectors, (4,4) for 4x4 matrices
+    "buffer_foreach_prop",                      # The attribute data property name to use with foreach_get/foreach_set and by value access
+    "buffer_srgb",                              # True if the values are stored in sRGB color space in blender, and linear in the buffer. Buffer values are converted with func.linear_to_srgb_array() to compare them with UI values
+    "bmesh_layer_type",                         # Name of the BMesh layer collection storing this data type, eg. bm.verts.layers.float. None if not accessible in edit mode
 ])
 
 # Defines all supported mesh data types
@@ -1567,6 +1657,12 @@ attribute_data_types = {
         large_capacity_vector_size=0,
         large_capacity_vector_size_height=0,
         large_capacity_vector_size_width=0,
+        buffer_dtype='float32',
+        buffer_components=1,
+        buffer_shape=(),
+        buffer_foreach_prop="value",
+        buffer_srgb=False,
+        bmesh_layer_type='float',
     ),
     "INT": AttributeDataType(
         friendly_name="Integer",
@@ -1588,6 +1684,12 @@ attribute_data_types = {
         large_capacity_vector_size=0,
         large_capacity_vector_size_height=0,
         large_capacity_vector_size_width=0,
+        buffer_dtype='int32',
+        buffer_components=1,
+        buffer_shape=(),
+        buffer_foreach_prop="value",
+        buffer_srgb=False,
+        bmesh_layer_type='int',
     ),
     "INT8": AttributeDataType(
         friendly_name="8-bit Integer",
@@ -1609,6 +1711,12 @@ attribute_data_types = {
         large_capacity_vector_size=0,
         large_capacity_vector_size_height=0,
         large_capacity_vector_size_width=0,
+        buffer_dtype='int8',
+        buffer_components=1,
+        buffer_shape=(),
+        buffer_foreach_prop="value",
+        buffer_srgb=False,
+        bmesh_layer_type=None,
     ),
     "FLOAT_VECTOR": AttributeDataType(
         friendly_name="Vector",
@@ -1630,6 +1738,12 @@ attribute_data_types = {
         large_capacity_vector_size=0,
         large_capacity_vector_size_height=0,
         large_capacity_vector_size_width=0,
+        buffer_dtype='float32',
+        buffer_components=3,
+        buffer_shape=(3,),
+        buffer_foreach_prop="vector",
+        buffer_srgb=False,
+        bmesh_layer_type='float_vector',
     ),
     "FLOAT_COLOR": AttributeDataType(
         friendly_name="Color",
@@ -1651,6 +1765,12 @@ attribute_data_types = {
         large_capacity_vector_size=0,
         large_capacity_vector_size_height=0,
         large_capacity_vector_size_width=0,
+        buffer_dtype='float32',
+        buffer_components=4,
+        buffer_shape=(4,),
+        buffer_foreach_prop="color",
+        buffer_srgb=False,
+        bmesh_layer_type='float_color',
     ),
     "BYTE_COLOR": AttributeDataType(
         friendly_name="Byte Color",
@@ -1672,6 +1792,12 @@ attribute_data_types = {
         large_capacity_vector_size=0,
         large_capacity_vector_size_height=0,
         large_capacity_vector_size_width=0,
+        buffer_dtype='float32',
+        buffer_components=4,
+        buffer_shape=(4,),
+        buffer_foreach_prop="color",
+        buffer_srgb=True,
+        bmesh_layer_type=None,
     ),
     "STRING": AttributeDataType(
         friendly_name="String",
@@ -1693,6 +1819,12 @@ attribute_data_types = {
         large_capacity_vector_size=0,
         large_capacity_vector_size_height=0,
         large_capacity_vector_size_width=0,
+        buffer_dtype=None,
+        buffer_components=1,
+        buffer_shape=(),
+        buffer_foreach_prop="value",
+        buffer_srgb=False,
+        bmesh_layer_type='string',
     ),
     "BOOLEAN": AttributeDataType(
         friendly_name="Boolean",
@@ -1714,6 +1846,12 @@ attribute_data_types = {
         large_capacity_vector_size=0,
         large_capacity_vector_size_height=0,
         large_capacity_vector_size_width=0,
+        buffer_dtype='bool',
+        buffer_components=1,
+        buffer_shape=(),
+        buffer_foreach_prop="value",
+        buffer_srgb=False,
+        bmesh_layer_type='bool',
     ),
     "FLOAT2": AttributeDataType(
         friendly_name="Vector 2D",
@@ -1735,6 +1873,12 @@ attribute_data_types = {
         large_capacity_vector_size=0,
         large_capacity_vector_size_height=0,
         large_capacity_vector_size_width=0,
+        buffer_dtype='float32',
+        buffer_components=2,
+        buffer_shape=(2,),
+        buffer_foreach_prop="vector",
+        buffer_srgb=False,
+        bmesh_layer_type=None,
     ),
     "INT32_2D": AttributeDataType(
         friendly_name='2D Integer Vector',
@@ -1756,6 +1900,12 @@ attribute_data_types = {
         large_capacity_vector_size=0,
         large_capacity_vector_size_height=0,
         large_capacity_vector_size_width=0,
+        buffer_dtype='int32',
+        buffer_components=2,
+        buffer_shape=(2,),
+        buffer_foreach_prop="value",
+        buffer_srgb=False,
+        bmesh_layer_type=None,
     ),
     "QUATERNION": AttributeDataType(
         friendly_name='Quaternion',
@@ -1777,12 +1927,18 @@ attribute_data_types = {
         large_capacity_vector_size=0,
         large_capacity_vector_size_height=0,
         large_capacity_vector_size_width=0,
+        buffer_dtype='float32',
+        buffer_components=4,
+        buffer_shape=(4,),
+        buffer_foreach_prop="value",
+        buffer_srgb=False,
+        bmesh_layer_type=None,
     ),
     "FLOAT4X4": AttributeDataType(
         friendly_name='4x4 Matrix',
         min_blender_ver=(4,2,0),
         unsupported_from_blender_ver=None,
-        supported_attribute_invert_modes=["INVERSE_OF_A_MATRIX"], 
+        supported_attribute_invert_modes=[], 
         supported_comparison_modes=['EQ','NEQ','EQORGR','EQORLS','GR','LS'],
         vector_subelements_names=['X1','Y1','Z1','W1','X2','Y2','Z2','W2','X3','Y3','Z3','W3','X4','Y4','Z4','W4'],
         gui_prop_subtype=EDataTypeGuiPropType.VECTOR,
@@ -1798,6 +1954,12 @@ attribute_data_types = {
         large_capacity_vector_size=16,
         large_capacity_vector_size_height=4,
         large_capacity_vector_size_width=4,
+        buffer_dtype='float32',
+        buffer_components=16,
+        buffer_shape=(4,4),
+        buffer_foreach_prop="value",
+        buffer_srgb=False,
+        bmesh_layer_type=None,
     ),
 }
 
@@ -1866,6 +2028,54 @@ attribute_domains = {
     ),
 }
 
+# Defines a property of mesh domain elements, eg. vertices[0].co, that can be read and written with foreach_get/foreach_set
+MeshDomainProperty = namedtuple("MeshDomainProperty", [
+    "buffer_dtype",                             # The numpy dtype name of a foreach_get/foreach_set buffer
+    "buffer_components",                        # Number of buffer elements stored per single domain
+])
+
+# Defines all foreach compatible properties of mesh domain elements, per domain. Properties not listed here are read by value
+mesh_domain_properties = {
+    "POINT": {
+        "co": MeshDomainProperty('float32', 3),
+        "normal": MeshDomainProperty('float32', 3),
+        "select": MeshDomainProperty('bool', 1),
+        "hide": MeshDomainProperty('bool', 1),
+        "bevel_weight": MeshDomainProperty('float32', 1),
+    },
+    "EDGE": {
+        "vertices": MeshDomainProperty('int32', 2),
+        "select": MeshDomainProperty('bool', 1),
+        "hide": MeshDomainProperty('bool', 1),
+        "use_seam": MeshDomainProperty('bool', 1),
+        "use_edge_sharp": MeshDomainProperty('bool', 1),
+        "use_freestyle_mark": MeshDomainProperty('bool', 1),
+        "is_loose": MeshDomainProperty('bool', 1),
+        "bevel_weight": MeshDomainProperty('float32', 1),
+        "crease": MeshDomainProperty('float32', 1),
+    },
+    "FACE": {
+        "center": MeshDomainProperty('float32', 3),
+        "normal": MeshDomainProperty('float32', 3),
+        "area": MeshDomainProperty('float32', 1),
+        "select": MeshDomainProperty('bool', 1),
+        "hide": MeshDomainProperty('bool', 1),
+        "use_smooth": MeshDomainProperty('bool', 1),
+        "use_freestyle_mark": MeshDomainProperty('bool', 1),
+        "material_index": MeshDomainProperty('int32', 1),
+        "loop_start": MeshDomainProperty('int32', 1),
+        "loop_total": MeshDomainProperty('int32', 1),
+    },
+    "CORNER": {
+        "normal": MeshDomainProperty('float32', 3),
+        "tangent": MeshDomainProperty('float32', 3),
+        "bitangent": MeshDomainProperty('float32', 3),
+        "bitangent_sign": MeshDomainProperty('float32', 1),
+        "vertex_index": MeshDomainProperty('int32', 1),
+        "edge_index": MeshDomainProperty('int32', 1),
+    },
+}
+
 # Defines convert attribute modes
 ConvertAttributeMode = namedtuple("ConvertAttributeMode", [
     "friendly_name",